@@ -420,6 +420,7 @@ class RunTestsSerializer(serializers.Serializer):
     )
     overriding_datasource = PrimaryKeyField(required=False, queryset=DataSource.objects.all())
     workers_num = serializers.IntegerField(min_value=1, default=1)
+    incremental = serializers.BooleanField(required=False)
     schedule_at = serializers.DateTimeField(required=False, allow_null=True)
     schedule_interval = serializers.IntegerField(required=False, allow_null=True)
 
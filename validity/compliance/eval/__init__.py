@@ -1,2 +1,3 @@
-from .eval import ExplanationalEval
+from .compiled import CompiledEval, compile_expression
+from .eval import ExplanationalEval, parse_expression
 from .eval_defaults import DEFAULT_NAMES, DEFAULT_OPERATORS, REPR_DEFAULTS, repr_
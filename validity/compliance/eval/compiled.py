@@ -0,0 +1,295 @@
+import ast
+import copy
+import types
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
+
+import simpleeval
+
+from validity.utils.misc import reraise
+from ..exceptions import EvalError
+from .eval import ExplanationalEval, parse_expression
+
+
+HELPER_PREFIX = "__v_"
+
+
+class UnsupportedExpression(Exception):
+    pass
+
+
+class ExpressionValidator(ast.NodeVisitor):
+    """
+    Statically checks that expression uses only the features supported by simpleeval
+    """
+
+    allowed_nodes = (
+        ast.Expression,
+        ast.Name,
+        ast.Constant,
+        ast.UnaryOp,
+        ast.BinOp,
+        ast.BoolOp,
+        ast.Compare,
+        ast.IfExp,
+        ast.Call,
+        ast.keyword,
+        ast.Subscript,
+        ast.Attribute,
+        ast.Slice,
+        ast.JoinedStr,
+        ast.FormattedValue,
+        ast.Dict,
+        ast.Tuple,
+        ast.List,
+        ast.Set,
+        ast.ListComp,
+        ast.GeneratorExp,
+        ast.DictComp,
+        ast.SetComp,
+        ast.comprehension,
+        ast.Load,
+        ast.Store,
+        ast.operator,
+        ast.unaryop,
+        ast.boolop,
+        ast.cmpop,
+    )
+
+    def generic_visit(self, node):
+        if not isinstance(node, self.allowed_nodes):
+            raise UnsupportedExpression(type(node).__name__)
+        super().generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id.startswith("__"):
+            raise UnsupportedExpression(node.id)
+
+    def visit_Constant(self, node):
+        if hasattr(node.value, "__len__") and len(node.value) > simpleeval.MAX_STRING_LENGTH:
+            raise UnsupportedExpression("Too long literal")
+
+    def visit_Attribute(self, node):
+        if node.attr.startswith(tuple(simpleeval.DISALLOW_PREFIXES)) or node.attr in simpleeval.DISALLOW_METHODS:
+            raise UnsupportedExpression(node.attr)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, (ast.Name, ast.Attribute)):
+            raise UnsupportedExpression("Call of an arbitrary expression")
+        if any(isinstance(arg, ast.Starred) for arg in node.args) or any(kw.arg is None for kw in node.keywords):
+            raise UnsupportedExpression("Star arguments")
+        self.generic_visit(node)
+
+    def visit_List(self, node):
+        for elt in node.elts:
+            self.visit(elt.value if isinstance(elt, ast.Starred) else elt)
+
+    def visit_comprehension(self, node):
+        if node.is_async:
+            raise UnsupportedExpression("Async comprehension")
+        self._check_target(node.target)
+        self.visit(node.iter)
+        for if_ in node.ifs:
+            self.visit(if_)
+
+    def _check_target(self, target):
+        if isinstance(target, ast.Name):
+            return self.visit_Name(target)
+        if not isinstance(target, (ast.Tuple, ast.List)):
+            raise UnsupportedExpression("Comprehension target")
+        for elt in target.elts:
+            self._check_target(elt)
+
+
+class ExpressionTransformer(ast.NodeTransformer):
+    """
+    Replaces operators, attribute access, function calls and comprehension iterables
+    with the calls of the helpers which implement simpleeval semantics and restrictions
+    """
+
+    @staticmethod
+    def _helper_call(helper: str, *args: ast.expr) -> ast.Call:
+        return ast.Call(func=ast.Name(id=HELPER_PREFIX + helper, ctx=ast.Load()), args=list(args), keywords=[])
+
+    @staticmethod
+    def _lambda(body: ast.expr) -> ast.Lambda:
+        arguments = ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[])
+        return ast.Lambda(args=arguments, body=body)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        return self._helper_call(f"op_{type(node.op).__name__}", node.left, node.right)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        return self._helper_call(f"op_{type(node.op).__name__}", node.operand)
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return self._helper_call(f"op_{type(node.ops[0]).__name__}", node.left, node.comparators[0])
+        args = [node.left]
+        for operation, comparator in zip(node.ops, node.comparators):
+            args.append(ast.Name(id=f"{HELPER_PREFIX}op_{type(operation).__name__}", ctx=ast.Load()))
+            args.append(self._lambda(comparator))
+        return self._helper_call("compare", *args)
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        return self._helper_call("getattr", node.value, ast.Constant(node.attr))
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Name):
+            node.func = self._helper_call("function", ast.Constant(node.func.id))
+        return node
+
+    def visit_GeneratorExp(self, node):
+        # simpleeval evaluates generator expressions eagerly
+        self.generic_visit(node)
+        return ast.ListComp(elt=node.elt, generators=node.generators)
+
+    def visit_comprehension(self, node):
+        self.generic_visit(node)
+        node.iter = self._helper_call("limit", node.iter)
+        return node
+
+    def visit_JoinedStr(self, node):
+        self.generic_visit(node)
+        return self._helper_call("joinedstr", *node.values)
+
+    def visit_FormattedValue(self, node):
+        self.generic_visit(node)
+        return self._helper_call("format", node.value, node.format_spec or ast.Constant(None))
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression: str) -> types.CodeType | None:
+    """
+    Compiles expression into restricted bytecode.
+    Returns None if expression uses features which cannot be compiled, such expression must be evaluated by simpleeval
+    """
+    try:
+        node = parse_expression(expression)
+    except SyntaxError:
+        return None
+    if not isinstance(node, ast.Expr):
+        return None
+    # parsed expressions are shared via cache, the tree must not be transformed in-place
+    tree = ast.Expression(body=copy.deepcopy(node.value))
+    try:
+        ExpressionValidator().visit(tree)
+    except UnsupportedExpression:
+        return None
+    tree = ast.fix_missing_locations(ExpressionTransformer().visit(tree))
+    return compile(tree, "<expression>", "eval")
+
+
+class CompiledEval(ExplanationalEval):
+    """
+    Evaluator which compiles the expression into restricted bytecode instead of walking the AST node by node.
+    It never produces any explanation, hence suitable for verbosity=0 only.
+    Falls back to ExplanationalEval if expression cannot be compiled
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs["verbosity"] = 0
+        super().__init__(*args, **kwargs)
+
+    def _get_globals(self) -> dict[str, Any]:
+        eval_globals = self.functions | self.names
+        for op_type, op_func in self.operators.items():
+            eval_globals[f"{HELPER_PREFIX}op_{op_type.__name__}"] = op_func
+        for helper in ("getattr", "function", "compare", "limit", "joinedstr", "format"):
+            eval_globals[HELPER_PREFIX + helper] = getattr(self, f"_helper_{helper}")
+        eval_globals["__builtins__"] = {}
+        return eval_globals
+
+    def eval(self, expr, previously_parsed=None):
+        self.explanation = []
+        code = compile_expression(expr)
+        if code is None:
+            return super().eval(expr, previously_parsed)
+        self.expr = expr
+        self._max_count = 0
+        eval_globals = self._get_globals()
+        with reraise(Exception, EvalError):
+            try:
+                return eval(code, eval_globals)  # noqa: S307
+            except NameError as e:
+                if not self._is_undefined_name(e, eval_globals):
+                    raise
+                raise simpleeval.NameNotDefined(e.name, expr) from None
+
+    @staticmethod
+    def _is_undefined_name(error: NameError, eval_globals: dict[str, Any]) -> bool:
+        """
+        Checks that the name is missing in the expression itself, not inside some function called by the expression
+        """
+        tb = error.__traceback__
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        return error.name not in eval_globals and tb.tb_frame.f_code.co_filename == "<expression>"
+
+    def _helper_getattr(self, obj: Any, attr: str) -> Any:
+        if attr.startswith(tuple(simpleeval.DISALLOW_PREFIXES)) or attr in simpleeval.DISALLOW_METHODS:
+            raise simpleeval.FeatureNotAvailable(f"Sorry, access to this attribute is not available. ({attr})")
+        try:
+            item = getattr(obj, attr)
+        except (AttributeError, TypeError):
+            try:
+                item = obj[attr]
+            except (KeyError, TypeError):
+                raise simpleeval.AttributeDoesNotExist(attr, self.expr) from None
+        if isinstance(item, types.ModuleType):
+            raise simpleeval.FeatureNotAvailable("Sorry, modules are not allowed in attribute access")
+        if callable(item) and item in simpleeval.DISALLOW_FUNCTIONS:
+            raise simpleeval.FeatureNotAvailable("This function is forbidden")
+        return item
+
+    def _helper_function(self, name: str) -> Any:
+        try:
+            func = self.functions[name]
+        except KeyError:
+            raise simpleeval.FunctionNotDefined(name, self.expr) from None
+        if func in simpleeval.DISALLOW_FUNCTIONS:
+            raise simpleeval.FeatureNotAvailable("This function is forbidden")
+        return func
+
+    @staticmethod
+    def _helper_compare(left: Any, *ops_and_comparators: Any) -> Any:
+        right = left
+        to_return = True
+        for i in range(0, len(ops_and_comparators), 2):
+            if not to_return:
+                break
+            operation, get_comparator = ops_and_comparators[i : i + 2]
+            left, right = right, get_comparator()
+            to_return = operation(left, right)
+        return to_return
+
+    def _helper_limit(self, iterable: Iterable) -> Iterator:
+        for item in iterable:
+            self._max_count += 1
+            if self._max_count > simpleeval.MAX_COMPREHENSION_LENGTH:
+                raise simpleeval.IterableTooLong("Comprehension generates too many elements")
+            yield item
+
+    @staticmethod
+    def _helper_joinedstr(*values: Any) -> str:
+        length = 0
+        evaluated_values = []
+        for value in values:
+            value = str(value)
+            length += len(value)
+            if length > simpleeval.MAX_STRING_LENGTH:
+                raise simpleeval.IterableTooLong("Sorry, I will not evaluate something this long.")
+            evaluated_values.append(value)
+        return "".join(evaluated_values)
+
+    @staticmethod
+    def _helper_format(value: Any, format_spec: str | None) -> Any:
+        if format_spec:
+            return ("{:" + format_spec + "}").format(value)
+        return value
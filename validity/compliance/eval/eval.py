@@ -1,5 +1,6 @@
 import ast
 import re
+from functools import lru_cache
 from typing import Literal
 
 import deepdiff
@@ -10,6 +11,14 @@ from ..exceptions import EvalError
 from . import eval_defaults
 
 
+@lru_cache(maxsize=4096)
+def parse_expression(expression: str) -> ast.AST:
+    """
+    Per-process cache of parsed expressions, allows to avoid parsing the same test for each device
+    """
+    return simpleeval.SimpleEval.parse(expression)
+
+
 class EvalWithCompoundTypes(simpleeval.EvalWithCompoundTypes):
     """
     This class provides support for SetComp
@@ -83,7 +92,7 @@ class ExplanationalEval(EvalWithCompoundTypes):
                 self._deepdiff.append((diff_name, deepdiff.DeepDiff(left, right).to_dict()))
         return to_return
 
-    def eval(self, expr):
+    def eval(self, expr, previously_parsed=None):
         self.explanation = []
         with reraise(Exception, EvalError):
-            return super().eval(expr)
+            return super().eval(expr, previously_parsed or parse_expression(expr))
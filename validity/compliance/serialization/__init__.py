@@ -1,4 +1,5 @@
 from .backend import SerializationBackend
+from .cache import DiskSerializationCache, DjangoSerializationCache, SerializationCache
 from .routeros import serialize_ros
 from .serializable import Serializable
 from .textfsm import serialize_textfsm
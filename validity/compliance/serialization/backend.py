@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING, Callable
 
 from validity.utils.misc import reraise
 from ..exceptions import SerializationError
+from .cache import MISSING, SerializationCache
 
 
 if TYPE_CHECKING:
@@ -9,10 +10,25 @@ if TYPE_CHECKING:
 
 
 class SerializationBackend:
-    def __init__(self, extraction_methods: dict[str, Callable[[str, str, dict], dict | list]]) -> None:
+    def __init__(
+        self,
+        extraction_methods: dict[str, Callable[[str, str, dict], dict | list]],
+        cache: SerializationCache | None = None,
+    ) -> None:
         self.extraction_methods = extraction_methods
+        self.cache = cache
 
-    def __call__(self, serializer: "Serializer", plain_data: str):
+    def _serialize(self, serializer: "Serializer", plain_data: str):
         extraction_function = self.extraction_methods[serializer.extraction_method]
         with reraise(Exception, SerializationError):
             return extraction_function(plain_data, serializer.effective_template, serializer.parameters)
+
+    def __call__(self, serializer: "Serializer", plain_data: str, data_hash: str | None = None):
+        if self.cache is None or not data_hash or serializer.pk is None:
+            return self._serialize(serializer, plain_data)
+        cache_key = self.cache.get_key(serializer, data_hash)
+        if (result := self.cache.get(cache_key)) is not MISSING:
+            return result
+        result = self._serialize(serializer, plain_data)
+        self.cache.set(cache_key, result)
+        return result
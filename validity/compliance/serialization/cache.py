@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.core.cache import BaseCache
+from django.core.exceptions import ImproperlyConfigured
+
+
+if TYPE_CHECKING:
+    from validity.models import Serializer
+
+
+logger = logging.getLogger(__name__)
+
+
+MISSING = object()
+
+
+class SerializationCache(ABC):
+    """
+    Content-addressed cache of serialized Data Files.
+    Key consists of serializer pk, hash of serializer template/parameters and Data File hash
+    """
+
+    def __init__(self, max_item_size: int) -> None:
+        self.max_item_size = max_item_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def template_hash(serializer: "Serializer") -> str:
+        content = json.dumps(
+            [serializer.extraction_method, serializer.effective_template, serializer.parameters],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get_key(self, serializer: "Serializer", data_hash: str) -> str:
+        return f"{serializer.pk}:{self.template_hash(serializer)}:{data_hash}"
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        value = self._get(key, default)
+        if value is default:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        pickled_value = pickle.dumps(value)
+        if len(pickled_value) > self.max_item_size:
+            return
+        self._set(key, pickled_value)
+
+    @abstractmethod
+    def _get(self, key: str, default: Any) -> Any: ...
+
+    @abstractmethod
+    def _set(self, key: str, pickled_value: bytes) -> None: ...
+
+    @abstractmethod
+    def invalidate(self, serializer_pk: int) -> None:
+        """
+        Drops all the cached values produced by particular serializer
+        """
+
+
+class DjangoSerializationCache(SerializationCache):
+    """
+    Stores serialized values inside Django cache (Redis in case of NetBox)
+    """
+
+    key_prefix = "validity:serialized"
+
+    def __init__(self, cache: BaseCache, timeout: int, max_item_size: int) -> None:
+        super().__init__(max_item_size)
+        self.cache = cache
+        self.timeout = timeout
+
+    def _full_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def _get(self, key: str, default: Any) -> Any:
+        pickled_value = self.cache.get(self._full_key(key))
+        if pickled_value is None:
+            return default
+        return pickle.loads(pickled_value)
+
+    def _set(self, key: str, pickled_value: bytes) -> None:
+        self.cache.set(self._full_key(key), pickled_value, timeout=self.timeout)
+
+    def invalidate(self, serializer_pk: int) -> None:
+        # stale values are unreachable anyway because template hash is a part of the key
+        # but they can be dropped explicitly if the cache supports it (e.g. django-redis)
+        if delete_pattern := getattr(self.cache, "delete_pattern", None):
+            delete_pattern(self._full_key(f"{serializer_pk}:*"))
+
+
+class DiskSerializationCache(SerializationCache):
+    """
+    Stores serialized values as files inside local directory.
+    Least recently used files are evicted as soon as the directory exceeds max_size.
+    The values are unpickled when read, so the directory must be private to the process owner
+    """
+
+    dir_mode = 0o700
+
+    def __init__(self, directory: str, max_size: int, max_item_size: int, cleanup_interval: int = 100) -> None:
+        super().__init__(max_item_size)
+        if not directory:
+            raise ImproperlyConfigured("Serialization cache directory must be set explicitly")
+        self.directory = Path(directory)
+        self._check_directory(self.directory)
+        self.max_size = max_size
+        self.cleanup_interval = cleanup_interval
+        self._sets_count = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _check_directory(cls, directory: Path) -> None:
+        directory.mkdir(mode=cls.dir_mode, parents=True, exist_ok=True)
+        stat = directory.stat()
+        if stat.st_uid != os.getuid():
+            raise ImproperlyConfigured(f"Serialization cache directory {directory} is not owned by the current user")
+        if stat.st_mode & 0o077:
+            raise ImproperlyConfigured(
+                f"Serialization cache directory {directory} must not be accessible by other users (mode 0o700)"
+            )
+
+    def _path(self, key: str) -> Path:
+        serializer_pk, content_key = key.split(":", maxsplit=1)
+        return self.directory / serializer_pk / content_key.replace(":", "-")
+
+    def _get(self, key: str, default: Any) -> Any:
+        path = self._path(key)
+        try:
+            value = pickle.loads(path.read_bytes())
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return default
+        except Exception as e:
+            logger.warning("Cannot read serialization cache file %s, %s: %s", path, type(e).__name__, e)
+            return default
+
+    def _set(self, key: str, pickled_value: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(mode=self.dir_mode, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp_file:
+            tmp_file.write(pickled_value)
+        os.replace(tmp_file.name, path)
+        with self._lock:
+            self._sets_count += 1
+            if self._sets_count < self.cleanup_interval:
+                return
+            self._sets_count = 0
+        self.evict()
+
+    def evict(self) -> None:
+        files = []
+        total_size = 0
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+        if total_size <= self.max_size:
+            return
+        files.sort()
+        for _, size, path in files:
+            path.unlink(missing_ok=True)
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def invalidate(self, serializer_pk: int) -> None:
+        shutil.rmtree(self.directory / str(serializer_pk), ignore_errors=True)
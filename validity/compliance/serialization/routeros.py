@@ -2,9 +2,9 @@ import io
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import Generator, Literal
+from typing import Iterator, Literal
 
-from validity.utils.misc import log_exceptions, reraise
+from validity.utils.misc import log_exceptions
 from ..exceptions import SerializationError
 
 
@@ -15,25 +15,43 @@ class LineParsingError(SerializationError):
     pass
 
 
-def non_quoted_characters(line: str) -> Generator[tuple[int, str], None, None]:
+# backslash with the following backslashes, spaces and line breaks
+_BACKSLASH_SEQ = re.compile(r"\\[\\\n ]*")
+# backslash sequence which splits one line into several ones
+_LINE_BREAK = re.compile(r"\\\n +")
+_BOOLEANS = {"yes": True, "no": False}
+
+
+def _drop_line_break(match: re.Match) -> str:
+    seq = match.group()
+    # trailing backslash sequence is dropped as well
+    if match.end() == len(match.string) or _LINE_BREAK.fullmatch(seq):
+        return ""
+    return seq
+
+
+def non_quoted_split(line: str) -> Iterator[str]:
     """
-    Generator returns pairs (char_position, char) for each char in line not placed inside the quotes
-    Quoted substring will be returned as 1 single character with char_position equal to first character
+    Splits the line by spaces which are not placed inside the quotes.
+    Quote preceded by backslash neither opens nor closes the quoted substring.
+    Text after the unclosed quote is ignored
     """
-
-    quote_open = False
-    quote_start = -1
-    for i, char in enumerate(line):
-        if char == '"' and (not i or line[i - 1] != "\\"):
-            quote_open = not quote_open
-            if quote_open:
-                quote_start = i
-            else:
-                yield i, line[quote_start : i + 1]
+    line += " "
+    sub_start = pos = 0
+    while (space := line.find(" ", pos)) != -1:
+        quote = line.find('"', pos, space)
+        if quote == -1:
+            yield line[sub_start:space]
+            sub_start = pos = space + 1
             continue
-        if quote_open:
+        pos = quote + 1
+        if quote and line[quote - 1] == "\\":
             continue
-        yield i, char
+        while (quote := line.find('"', pos)) != -1 and line[quote - 1] == "\\":
+            pos = quote + 1
+        if quote == -1:
+            return
+        pos = quote + 1
 
 
 @dataclass
@@ -53,31 +71,19 @@ class ParsedLine:
 
     @staticmethod
     def _replace_line_breaks(line: str) -> str:
-        drop_match = re.compile(r"\\\n +")
-        new_line = []
-        backslash_seq = []
-        for char in line:
-            if char == "\\" or char in {"\n", " "} and backslash_seq:
-                backslash_seq.append(char)
-                continue
-            if not drop_match.fullmatch("".join(backslash_seq)):
-                new_line.extend(backslash_seq)
-            backslash_seq = []
-            new_line.append(char)
-        return "".join(new_line)
+        if "\\" not in line:
+            return line
+        return _BACKSLASH_SEQ.sub(_drop_line_break, line)
 
     @staticmethod
     def _transform_value(key: str, value: str) -> str | int | bool:
-        if value and len(value) > 2 and value[0] == '"' and value[-1] == '"':
+        if len(value) > 2 and value[0] == '"' and value[-1] == '"':
             value = value[1:-1]
         if key in {"name", "comment"}:
             return value
         if value.isdigit():
             return int(value)
-        booleans = {"yes": True, "no": False}
-        if value in booleans:
-            return booleans[value]
-        return value
+        return _BOOLEANS.get(value, value)
 
     @classmethod
     def from_plain_text(cls, line: str) -> "ParsedLine":
@@ -88,25 +94,36 @@ class ParsedLine:
         if line.startswith("["):
             find, line = cls._extract_find(line)
         properties = {}
-        sub_start = 0
         implicit_name = False
-        line = cls._replace_line_breaks(line).strip()
-        for char_num, char in non_quoted_characters(line + " "):
-            if char == " ":
-                kvline = line[sub_start:char_num].strip(" \n")
-                if kvline and "=" not in kvline:
-                    kvline = "name=" + kvline
-                    implicit_name = True
-                with reraise(ValueError, LineParsingError, f'"{kvline}" cannot be split into key/value'):
-                    key, value = kvline.split("=", maxsplit=1)
-                properties[key] = cls._transform_value(key, value)
-                sub_start = char_num + 1
+        for kvline in non_quoted_split(cls._replace_line_breaks(line).strip()):
+            kvline = kvline.strip(" \n")
+            if "=" not in kvline:
+                if not kvline:  # e.g. double space between the properties
+                    raise LineParsingError('"" cannot be split into key/value')
+                kvline = "name=" + kvline
+                implicit_name = True
+            key, value = kvline.split("=", maxsplit=1)
+            properties[key] = cls._transform_value(key, value)
         return cls(method=method, find_by=find, properties=properties, implicit_name=implicit_name)
 
 
+def _get_context(result: dict, context_path: list[str]) -> dict:
+    context = result
+    for key in context_path:
+        try:
+            context = context[key]
+        except KeyError:
+            context[key] = context = {}
+    return context
+
+
 def parse_config(plain_config: str) -> dict:
+    """
+    Parses the config line by line. Context dict is resolved once per section
+    """
     result = {}
     context_path = []
+    context = None
     prevlines = []
     cfgfile = io.StringIO(plain_config, newline=None)
     for line_num, line in enumerate(cfgfile, start=1):
@@ -114,35 +131,30 @@ def parse_config(plain_config: str) -> dict:
             continue
         if line.startswith("/"):
             context_path = line[1:-1].split()
+            context = None
             continue
         if line.endswith("\\\n"):
             prevlines.append(line)
             continue
         if prevlines:
-            line = "".join(prevlines) + line
+            prevlines.append(line)
+            line = "".join(prevlines)
             prevlines = []
         try:
             parsed_line = ParsedLine.from_plain_text(line)
         except LineParsingError as e:
             e.args = (e.args[0] + f", config line {line_num}",) + e.args[1:]
             raise
-        current_context = result
-        for key in context_path:
-            try:
-                current_context = current_context[key]
-            except KeyError:
-                current_context[key] = {}
-                current_context = current_context[key]
+        if context is None:
+            context = _get_context(result, context_path)
         if parsed_line.find_by or parsed_line.method == "add" or parsed_line.implicit_name:
-            if "values" not in current_context:
-                current_context["values"] = []
-            current_context["values"].append(parsed_line.properties)
+            if "values" not in context:
+                context["values"] = []
+            context["values"].append(parsed_line.properties)
             if parsed_line.find_by:
-                current_context["values"][-1]["find_by"] = [
-                    {"key": parsed_line.find_by[0], "value": parsed_line.find_by[1]}
-                ]
+                parsed_line.properties["find_by"] = [{"key": parsed_line.find_by[0], "value": parsed_line.find_by[1]}]
         else:
-            current_context["properties"] = parsed_line.properties
+            context["properties"] = parsed_line.properties
     return result
 
 
@@ -23,5 +23,5 @@ class Serializable:
         if self.serializer is None:
             raise NoComponentError("Serializer")
         if (file_data := self.data_file.data_as_string) is not None:
-            return self.serializer.serialize(file_data)
+            return self.serializer.serialize(file_data, data_hash=self.data_file.hash)
         raise BadDataFileContentsError(f"Cannot decode data file {self.data_file.path}")
@@ -1,5 +1,7 @@
 import io
 import logging
+import threading
+from functools import lru_cache
 
 import textfsm
 
@@ -10,12 +12,19 @@ from .common import postprocess_jq
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> tuple[textfsm.TextFSM, threading.Lock]:
+    """
+    Returns compiled state machine for the template. The machine is stateful, so it must be used under the lock.
+    Use compile_template.cache_info() to get cache hits/misses
+    """
+    return textfsm.TextFSM(io.StringIO(template)), threading.Lock()
+
+
 @log_exceptions(logger, "info", log_traceback=True)
 @postprocess_jq
 def serialize_textfsm(plain_data: str, template: str, parameters: dict) -> list[dict]:
-    dict_results = []
-    template_file = io.StringIO(template)
-    fsm = textfsm.TextFSM(template_file)
-    for fsm_result in fsm.ParseText(plain_data):
-        dict_results.append({k: v for k, v in zip(fsm.header, fsm_result)})
-    return dict_results
+    fsm, lock = compile_template(template)
+    with lock:
+        fsm.Reset()
+        return [dict(zip(fsm.header, fsm_result)) for fsm_result in fsm.ParseText(plain_data)]
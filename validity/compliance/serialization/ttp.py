@@ -1,4 +1,6 @@
 import logging
+import threading
+from functools import lru_cache
 
 from ttp import ttp
 
@@ -9,9 +11,28 @@ from .common import postprocess_jq
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> tuple[ttp, threading.Lock]:
+    """
+    Returns parser with pre-built template. The parser keeps inputs, results and the variables saved by
+    "record" between the parsings, so it must be used under the lock and reset after each parsing.
+    Use compile_template.cache_info() to get cache hits/misses
+    """
+    return ttp(template=template), threading.Lock()
+
+
 @log_exceptions(logger, "info", log_traceback=True)
 @postprocess_jq
 def serialize_ttp(plain_data: str, template: str, parameters: dict):
-    parser = ttp(data=plain_data, template=template)
-    parser.parse()
-    return parser.result()[0][0]
+    parser, lock = compile_template(template)
+    with lock:
+        try:
+            if plain_data:  # the same as ttp(data=plain_data, ...) does
+                parser.add_input(plain_data)
+            parser.parse(one=True)
+            return parser.result()[0][0]
+        finally:
+            parser.clear_input()
+            parser.clear_result()
+            # template vars are restored by ttp for each input, but global ones are kept by the parser forever
+            parser._ttp_["global_vars"].clear()
@@ -1,9 +1,10 @@
 import logging
+from typing import Any, Collection
+from xml.parsers import expat
 from xml.parsers.expat import ExpatError
 
 import xmltodict
 
-from validity.utils.json import transform_json
 from validity.utils.misc import log_exceptions, reraise
 from ..exceptions import SerializationError
 from .common import postprocess_jq
@@ -12,15 +13,113 @@ from .common import postprocess_jq
 logger = logging.getLogger(__name__)
 
 
+_WHOLE_SUBTREE = object()
+
+
+class StreamingXMLBuilder:
+    """
+    Builds the same structure as xmltodict.parse() does right from the parser events.
+    Optionally skips during parsing:
+        - the attributes. The element which had any attributes still becomes a dict
+          (the same as if "@" keys were removed from xmltodict.parse() result)
+        - the elements outside of element_paths. Path is a "/"-separated list of element names starting from the root,
+          the whole subtree of the element is built
+    """
+
+    attr_prefix = "@"
+    cdata_key = "#text"
+
+    def __init__(self, drop_attributes: bool = False, element_paths: Collection[str] = ()) -> None:
+        self.drop_attributes = drop_attributes
+        self.path_tree = self._build_path_tree(element_paths) if element_paths else _WHOLE_SUBTREE
+        self._stack = []
+        self._item = None
+        self._data = []
+        self._path_node = self.path_tree
+        self._skip_depth = 0
+
+    @staticmethod
+    def _build_path_tree(element_paths: Collection[str]) -> dict:
+        tree = {}
+        for path in element_paths:
+            node = tree
+            *parents, last = path.strip("/").split("/")
+            for name in parents:
+                node = node.setdefault(name, {})
+                if node is _WHOLE_SUBTREE:
+                    break
+            else:
+                node[last] = _WHOLE_SUBTREE
+        return tree
+
+    @staticmethod
+    def _push(item: dict | None, key: str, data: Any) -> dict:
+        if item is None:
+            item = {}
+        if key not in item:
+            item[key] = data
+        elif isinstance(value := item[key], list):
+            value.append(data)
+        else:
+            item[key] = [value, data]
+        return item
+
+    def start_element(self, name: str, attrs: list[str]) -> None:
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        path_node = self._path_node
+        if path_node is not _WHOLE_SUBTREE and (path_node := path_node.get(name)) is None:
+            self._skip_depth = 1
+            return
+        self._stack.append((self._item, self._data, self._path_node))
+        self._path_node = path_node
+        if not attrs:
+            self._item = None
+        elif self.drop_attributes:
+            self._item = {}
+        else:
+            self._item = {self.attr_prefix + key: value for key, value in zip(attrs[0::2], attrs[1::2])}
+        self._data = []
+
+    def end_element(self, name: str) -> None:
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        data = "".join(self._data).strip() or None if self._data else None
+        item = self._item
+        self._item, self._data, self._path_node = self._stack.pop()
+        if item is None:
+            self._item = self._push(self._item, name, data)
+            return
+        if data:
+            self._push(item, self.cdata_key, data)
+        self._item = self._push(self._item, name, item)
+
+    def characters(self, data: str) -> None:
+        if not self._skip_depth:
+            self._data.append(data)
+
+    def parse(self, xml: str) -> dict:
+        parser = expat.ParserCreate("utf-8")
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.characters
+        # entities are not expanded, the same as in xmltodict
+        parser.DefaultHandler = lambda _: None
+        parser.ExternalEntityRefHandler = lambda *_: 1
+        parser.Parse(xml.encode("utf-8"), True)
+        return self._item if self._item is not None else {}
+
+
 @log_exceptions(logger, "info", log_traceback=True)
 @postprocess_jq
 def serialize_xml(plain_data: str, template: str, parameters: dict):
+    drop_attributes = parameters.get("drop_attributes", False)
+    element_paths = parameters.get("element_paths")
     with reraise(ExpatError, SerializationError, "Got invalid XML", orig_error_param=None):
-        result = xmltodict.parse(plain_data)
-    if parameters.get("drop_attributes"):
-        result = transform_json(
-            result,
-            match_fn=lambda key, _: isinstance(key, str) and key.startswith("@"),
-            transform_fn=lambda key, value: None,
-        )
-    return result
+        if drop_attributes or element_paths:
+            return StreamingXMLBuilder(drop_attributes, element_paths or ()).parse(plain_data)
+        return xmltodict.parse(plain_data)
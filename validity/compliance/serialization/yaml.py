@@ -1,3 +1,6 @@
+import json
+import re
+
 import yaml
 
 from validity.utils.misc import reraise
@@ -5,7 +8,33 @@ from ..exceptions import SerializationError
 from .common import postprocess_jq
 
 
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_JSON_START = re.compile(r"\s*[\[{]")
+
+
+def _reject_constant(constant: str):
+    # NaN/Infinity are not valid JSON, YAML treats them as strings
+    raise ValueError(constant)
+
+
+def load_json(plain_data: str):
+    """
+    Parses JSON document via the json module which is much faster than any YAML loader.
+    Returns None if the data does not look like JSON or can't be parsed as JSON,
+    then it has to be parsed as YAML (e.g. flow-style YAML like "{a: 1}")
+    """
+    if not _JSON_START.match(plain_data):
+        return None
+    try:
+        return json.loads(plain_data, parse_constant=_reject_constant)
+    except (ValueError, RecursionError):
+        return None
+
+
 @postprocess_jq
 def serialize_yaml(plain_data: str, template: str, parameters: dict) -> dict:
+    if (result := load_json(plain_data)) is not None:
+        return result
     with reraise(yaml.YAMLError, SerializationError, "Got invalid JSON/YAML", orig_error_param=None):
-        return yaml.safe_load(plain_data)
+        return yaml.load(plain_data, Loader=SafeLoader)
@@ -1,16 +1,19 @@
+import copy
 from contextlib import suppress
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Iterable, Optional
+from typing import TYPE_CHECKING, Collection, Iterable, Optional
 
 from django.utils.translation import gettext_lazy as _
 
 from validity.compliance.serialization import Serializable
-from validity.utils.misc import reraise
+from validity.utils.misc import batched, reraise
 from .exceptions import NoComponentError, SerializationError, StateKeyError
 
 
 if TYPE_CHECKING:
-    from validity.models import Command
+    from core.models import DataFile
+
+    from validity.models import Command, VDataSource, VDevice
 
 
 @dataclass(frozen=True)
@@ -94,3 +97,65 @@ class State(dict):
 
     def get_full_item(self, key, default=None):
         return super().get(key, default)
+
+
+@dataclass
+class BulkStateBuilder:
+    """
+    Builds State for a bunch of devices at once.
+    Commands are resolved once per poller, Data Files are fetched with one query per data source chunk
+    """
+
+    batch_size: int = 1000
+
+    def _device_commands(self, device: "VDevice", poller_commands: dict[int, list["Command"]]) -> list["Command"]:
+        poller = getattr(device, "poller", None)
+        data_source = getattr(device, "data_source", None)
+        if poller is None or data_source is None:
+            return []
+        if poller.pk not in poller_commands:
+            poller_commands[poller.pk] = list(poller.commands.select_related("serializer"))
+        commands = []
+        for command in poller_commands[poller.pk]:
+            device_command = copy.copy(command)
+            device_command.path = data_source.get_command_path(device, device_command)
+            commands.append(device_command)
+        return commands
+
+    def _fetch_data_files(
+        self, paths: dict[int, set[str]], data_sources: dict[int, "VDataSource"]
+    ) -> dict[tuple[int, str], "DataFile"]:
+        data_files = {}
+        for ds_pk, ds_paths in paths.items():
+            for path_batch in batched(ds_paths, self.batch_size):
+                for data_file in data_sources[ds_pk].datafiles.filter(path__in=path_batch):
+                    data_files[ds_pk, data_file.path] = data_file
+        return data_files
+
+    def __call__(self, devices: Collection["VDevice"]) -> None:
+        """
+        Sets up .state_sources for each of the devices, .state is built from them lazily on first access.
+        Devices must have .serializer, .poller and .data_source attributes already set up
+        """
+        poller_commands = {}
+        data_sources = {}
+        paths = {}
+        device_plans = []
+        for device in devices:
+            data_source = getattr(device, "data_source", None)
+            commands = self._device_commands(device, poller_commands)
+            config_path = None
+            if data_source is not None:
+                config_path = data_source.get_config_path(device)
+                data_sources[data_source.pk] = data_source
+                ds_paths = paths.setdefault(data_source.pk, set())
+                ds_paths.add(config_path)
+                ds_paths.update(command.path for command in commands)
+            device_plans.append((device, data_source, commands, config_path))
+        data_files = self._fetch_data_files(paths, data_sources)
+        for device, data_source, commands, config_path in device_plans:
+            ds_pk = data_source.pk if data_source is not None else None
+            for command in commands:
+                command.data_file = data_files.get((ds_pk, command.path))
+            config_item = Serializable(device.serializer, data_file=data_files.get((ds_pk, config_path)))
+            device.__dict__["state_sources"] = (commands, config_item)
@@ -2,7 +2,7 @@ from contextlib import contextmanager
 from itertools import chain, groupby
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Generator
+from typing import Annotated, Generator, Iterable, Iterator
 
 import yaml
 from django import forms
@@ -11,8 +11,12 @@ from django.utils.translation import gettext_lazy as _
 from netbox.config import ConfigItem
 from netbox.data_backends import DataBackend
 
+from validity import di
 from validity.models import VDevice
-from .pollers.result import DescriptiveError, PollingInfo
+from .pollers import CircuitBreaker, SessionPool
+from .pollers.exceptions import PollingError
+from .pollers.result import CommandResult, DescriptiveError, PollingInfo, PollingStatsCollector
+from .pollers.session_pool import SessionPoolStats
 
 
 class PollingBackend(DataBackend):
@@ -38,6 +42,7 @@ class PollingBackend(DataBackend):
         .order_by("poller_id")
     )
     metainfo_file = Path("polling_info.yaml")
+    slowest_devices_count = 10
 
     @property
     def datasource_id(self):
@@ -45,6 +50,18 @@ class PollingBackend(DataBackend):
         assert ds_id, 'Data Source parameters must contain "datasource_id"'
         return ds_id
 
+    @property
+    @di.inject
+    def circuit_breaker(
+        self, breaker: Annotated[CircuitBreaker | None, "polling_circuit_breaker"]
+    ) -> CircuitBreaker | None:
+        return breaker
+
+    @property
+    @di.inject
+    def session_pool(self, pool: Annotated[SessionPool | None, "polling_session_pool"]) -> SessionPool | None:
+        return pool
+
     def bound_devices_qs(self, device_filter: Q):
         return (
             self.devices_qs.filter(data_source_id=self.datasource_id)
@@ -52,11 +69,9 @@ class PollingBackend(DataBackend):
             .set_attribute("prefer_ipv4", ConfigItem("PREFER_IPV4")())
         )
 
-    def write_metainfo(self, dir_name: str, polling_info: PollingInfo) -> None:
-        # NetBox does not provide an opportunity for a backend to return any info/errors to the user
-        # Hence, it will be written into "polling_info.yaml" file
-        path = dir_name / self.metainfo_file
-        path.write_text(yaml.safe_dump(polling_info.model_dump(exclude_defaults=True), sort_keys=False))
+    @staticmethod
+    def metainfo_contents(polling_info: PollingInfo) -> str:
+        return yaml.safe_dump(polling_info.model_dump(exclude_defaults=True), sort_keys=False)
 
     def start_polling(self, devices) -> tuple[list[Generator], set[DescriptiveError]]:
         result_generators = []
@@ -71,17 +86,62 @@ class PollingBackend(DataBackend):
                 result_generators.append(poller.get_backend().poll(device_group))
         return result_generators, no_poller_errors
 
+    @staticmethod
+    def skipped_results(devices: Iterable[VDevice]) -> Iterator[CommandResult]:
+        error = PollingError("Polling skipped: device failed several pollings in a row")
+        for device in devices:
+            if device.poller is not None:
+                yield from (CommandResult(device, command, error=error) for command in device.poller.commands.all())
+
+    @staticmethod
+    def session_pool_stats(session_pool: SessionPool | None, stats_before: SessionPoolStats | None) -> dict | None:
+        # the pool lives longer than one polling, so only the difference is reported
+        if session_pool is None:
+            return None
+        return (session_pool.get_stats() - stats_before).as_dict()
+
+    def poll(self, device_filter: Q | None = None) -> Iterator[tuple[str, bytes]]:
+        """
+        Polls the devices and yields (file path, file contents) pairs as soon as the results come.
+        Polling metainfo file is the last one
+        """
+        devices = list(self.bound_devices_qs(device_filter or Q()))
+        skipped_devices = []
+        if (circuit_breaker := self.circuit_breaker) is not None:
+            devices, skipped_devices = circuit_breaker.split(devices)
+        session_pool = self.session_pool
+        pool_stats = session_pool.get_stats() if session_pool is not None else None
+        result_generators, errors = self.start_polling(devices)
+        stats = PollingStatsCollector(slowest_devices=self.slowest_devices_count)
+        failed = {}
+        for cmd_result in chain.from_iterable(result_generators):
+            if cmd_result.errored:
+                errors.add(cmd_result.descriptive_error)
+            failed[cmd_result.device.pk] = cmd_result.errored and cmd_result.error.device_wide
+            stats.add(cmd_result)
+            yield cmd_result.path, cmd_result.contents.encode("utf-8")
+        for cmd_result in self.skipped_results(skipped_devices):
+            yield cmd_result.path, cmd_result.contents.encode("utf-8")
+        if circuit_breaker is not None:
+            circuit_breaker.update(failed)
+        polling_info = PollingInfo(
+            devices_polled=len(devices),
+            errors=errors,
+            partial_sync=bool(device_filter),
+            skipped_devices=sorted(str(device) for device in skipped_devices),
+            stats=stats.build(session_pool=self.session_pool_stats(session_pool, pool_stats)),
+        )
+        # NetBox does not provide an opportunity for a backend to return any info/errors to the user
+        # Hence, it is written into "polling_info.yaml" file
+        yield str(self.metainfo_file), self.metainfo_contents(polling_info).encode("utf-8")
+
     @contextmanager
     def fetch(self, device_filter: Q | None = None):
         with TemporaryDirectory() as dir_name:
-            devices = self.bound_devices_qs(device_filter or Q())
-            result_generators, errors = self.start_polling(devices)
-            for cmd_result in chain.from_iterable(result_generators):
-                if cmd_result.errored:
-                    errors.add(cmd_result.descriptive_error)
-                cmd_result.write_on_disk(dir_name)
-            polling_info = PollingInfo(devices_polled=devices.count(), errors=errors, partial_sync=bool(device_filter))
-            self.write_metainfo(dir_name, polling_info)
+            for path, contents in self.poll(device_filter):
+                file_path = Path(dir_name) / path
+                file_path.parent.mkdir(exist_ok=True)
+                file_path.write_bytes(contents)
             yield dir_name
 
 
@@ -3,10 +3,14 @@ from typing import Annotated
 
 from dimi.scopes import Context, Singleton
 from django.conf import LazySettings, settings
+from django.core.cache import caches
 
 from validity import di
 from validity.compliance.serialization import (
+    DiskSerializationCache,
+    DjangoSerializationCache,
     SerializationBackend,
+    SerializationCache,
     serialize_ros,
     serialize_textfsm,
     serialize_ttp,
@@ -16,8 +20,22 @@ from validity.compliance.serialization import (
 from validity.data_backup import BackupBackend, GitBackuper, S3Backuper
 from validity.integrations.git import DulwichGitClient
 from validity.integrations.s3 import BotoS3Client
-from validity.pollers import NetmikoPoller, RequestsPoller, ScrapliNetconfPoller
-from validity.settings import PollerInfo, ValiditySettings
+from validity.pollers import (
+    AsyncRequestsPoller,
+    AsyncScrapliNetconfPoller,
+    CircuitBreaker,
+    NetmikoPoller,
+    RequestsPoller,
+    ScrapliNetconfPoller,
+    SessionPool,
+)
+from validity.settings import (
+    CircuitBreakerSettings,
+    PollerInfo,
+    SerializationCacheSettings,
+    SessionPoolSettings,
+    ValiditySettings,
+)
 from validity.utils.logger import Logger
 from validity.utils.misc import null_request
 
@@ -60,8 +78,28 @@ def backup_backend(vsettings: Annotated[ValiditySettings, ...], logger: Annotate
     )
 
 
+@di.dependency(scope=Singleton)
+def serialization_cache(
+    cache_settings: Annotated[SerializationCacheSettings, "validity_settings.serialization_cache"],
+) -> SerializationCache | None:
+    if cache_settings.backend == "django":
+        return DjangoSerializationCache(
+            cache=caches[cache_settings.django_cache],
+            timeout=cache_settings.timeout,
+            max_item_size=cache_settings.max_item_size,
+        )
+    if cache_settings.backend == "disk":
+        return DiskSerializationCache(
+            directory=cache_settings.directory,
+            max_size=cache_settings.max_size,
+            max_item_size=cache_settings.max_item_size,
+        )
+
+
 @di.dependency(scope=Singleton, add_return_alias=True)
-def serialization_backend() -> SerializationBackend:
+def serialization_backend(
+    cache: Annotated[SerializationCache | None, serialization_cache],
+) -> SerializationBackend:
     return SerializationBackend(
         extraction_methods={
             "YAML": serialize_yaml,
@@ -69,7 +107,8 @@ def serialization_backend() -> SerializationBackend:
             "TTP": serialize_ttp,
             "TEXTFSM": serialize_textfsm,
             "XML": serialize_xml,
-        }
+        },
+        cache=cache,
     )
 
 
@@ -87,11 +126,46 @@ def pollers_info(custom_pollers: Annotated[list[PollerInfo], "validity_settings.
             color="orange",
             command_types=["netconf"],
         ),
+        PollerInfo(
+            klass=AsyncRequestsPoller,
+            name="requests_async",
+            verbose_name="requests (async)",
+            color="cyan",
+            command_types=["json_api"],
+        ),
+        PollerInfo(
+            klass=AsyncScrapliNetconfPoller,
+            name="scrapli_netconf_async",
+            verbose_name="scrapli_netconf (async)",
+            color="purple",
+            command_types=["netconf"],
+        ),
     ] + custom_pollers
 
 
+@di.dependency(scope=Singleton)
+def polling_session_pool(
+    pool_settings: Annotated[SessionPoolSettings, "validity_settings.polling_session_pool"],
+) -> SessionPool | None:
+    if pool_settings.enabled:
+        return SessionPool(max_size=pool_settings.max_size, idle_timeout=pool_settings.idle_timeout)
+
+
+@di.dependency(scope=Singleton)
+def polling_circuit_breaker(
+    breaker_settings: Annotated[CircuitBreakerSettings, "validity_settings.polling_circuit_breaker"],
+) -> CircuitBreaker | None:
+    if breaker_settings.enabled:
+        return CircuitBreaker(
+            cache=caches[breaker_settings.django_cache],
+            failure_threshold=breaker_settings.failure_threshold,
+            probe_interval=breaker_settings.probe_interval,
+        )
+
+
 import validity.pollers.factory  # noqa
 from validity.scripts import ApplyWorker, CombineWorker, Launcher, SplitWorker, Task, LauncherFactory, perform_backup  # noqa
+from validity.scripts.runtests.work_queue import WorkQueue  # noqa
 
 
 @di.dependency
@@ -99,6 +173,11 @@ def launcher_factory(settings: Annotated[LazySettings, django_settings]) -> Laun
     return LauncherFactory(settings.RQ_PARAMS)
 
 
+@di.dependency(scope=Singleton)
+def runtests_work_queue(factory: Annotated[LauncherFactory, launcher_factory]) -> WorkQueue:
+    return WorkQueue(factory.get_connection())
+
+
 @di.dependency(scope=Singleton)
 def runtests_launcher(
     vsettings: Annotated[ValiditySettings, validity_settings],
@@ -2,6 +2,7 @@ import base64
 import os
 import pickle
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, ClassVar, Protocol, runtime_checkable
 
 from cryptography.fernet import Fernet
@@ -22,6 +23,15 @@ class EncryptedValueProtocol(Protocol):
     def serialize(self) -> str: ...
 
 
+@lru_cache(maxsize=4096)
+def derive_key(secret_key: bytes, salt: bytes) -> bytes:
+    """
+    PBKDF2 is slow by design, derived keys are cached per process to decrypt the values with the same salt faster
+    """
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=480000, backend=default_backend())
+    return base64.urlsafe_b64encode(kdf.derive(secret_key))
+
+
 @dataclass
 class EncryptedString:
     cipher: bytes
@@ -30,10 +40,6 @@ class EncryptedString:
 
     secret_key: ClassVar[bytes] = settings.SECRET_KEY.encode()
 
-    def __post_init__(self):
-        if self._fernet is None:
-            self._fernet = self.get_fernet(base64.urlsafe_b64decode(self.salt))
-
     def __len__(self) -> int:
         return len(self.cipher)
 
@@ -49,11 +55,17 @@ class EncryptedString:
     def get_fernet(cls, salt: bytes) -> Fernet:
         if isinstance(salt, str):
             salt = salt.encode()
-        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=480000, backend=default_backend())
-        return Fernet(base64.urlsafe_b64encode(kdf.derive(cls.secret_key)))
+        return Fernet(derive_key(cls.secret_key, salt))
+
+    @property
+    def fernet(self) -> Fernet:
+        # Fernet is constructed lazily as key derivation is expensive
+        if self._fernet is None:
+            self._fernet = self.get_fernet(base64.urlsafe_b64decode(self.salt))
+        return self._fernet
 
     def decrypt(self) -> str:
-        return self._fernet.decrypt(self.cipher).decode()
+        return self.fernet.decrypt(self.cipher).decode()
 
     def serialize(self) -> str:
         return f"${self.salt.decode()}${self.cipher.decode()}$"
@@ -70,7 +82,7 @@ class EncryptedObject(EncryptedString):
         return super().from_plain_text(pickle.dumps(obj), salt)
 
     def decrypt(self) -> Any:
-        return pickle.loads(self._fernet.decrypt(self.cipher))
+        return pickle.loads(self.fernet.decrypt(self.cipher))
 
 
 class NotEncryptedObject:
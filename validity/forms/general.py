@@ -235,6 +235,11 @@ class RunTestsForm(ScriptForm):
         label=_("Number of Workers"),
         help_text=_("Speed up tests execution by splitting the work among multiple RQ workers"),
     )
+    incremental = BooleanField(
+        required=False,
+        label=_("Incremental Run"),
+        help_text=_("Reuse previous results of the tests whose input data has not changed since then"),
+    )
     _commit = None  # remove this Field from ScriptForm
 
     fieldsets = (
@@ -246,6 +251,7 @@ class RunTestsForm(ScriptForm):
             "explanation_verbosity",
             "workers_num",
             "overriding_datasource",
+            "incremental",
             name=_("Main Parameters"),
         ),
         FieldSet("_schedule_at", "_interval", name=_("Postponed Execution")),
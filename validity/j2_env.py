@@ -1,5 +1,9 @@
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
 from django.utils.text import slugify
-from jinja2 import BaseLoader, ChainableUndefined
+from jinja2 import BaseLoader, ChainableUndefined, Template
 from jinja2 import Environment as Jinja2Environment
 
 
@@ -13,3 +17,56 @@ class Environment(Jinja2Environment):
         kwargs.setdefault("undefined", ChainableUndefined)
         super().__init__(*args, **kwargs)
         self.filters["slugify"] = slug
+
+
+class TemplateCache:
+    """
+    Process-wide size-bounded LRU cache of compiled templates keyed by template text
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates: OrderedDict[str, Template] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @cached_property
+    def environment(self) -> Environment:
+        return Environment()
+
+    def get_template(self, source: str) -> Template:
+        with self._lock:
+            if (template := self._templates.get(source)) is not None:
+                self._templates.move_to_end(source)
+                self.hits += 1
+                return template
+            self.misses += 1
+        template = self.environment.from_string(source)
+        with self._lock:
+            self._templates[source] = template
+            if len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        return template
+
+    def render(self, source: str, **context) -> str:
+        return self.get_template(source).render(**context)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._templates), "maxsize": self.maxsize}
+
+
+template_cache = TemplateCache()
+
+
+def render(source: str, **context) -> str:
+    """
+    Renders template text using compiled templates cache
+    """
+    return template_cache.render(source, **context)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from validity.models import ComplianceSelector
+
+
+class Command(BaseCommand):
+    help = "Rebuilds materialized membership index of Compliance Selectors"
+
+    def add_arguments(self, parser):
+        parser.add_argument("selectors", nargs="*", help="Names of the selectors to rebuild (all by default)")
+
+    def handle(self, *args, **options):
+        selectors = ComplianceSelector.objects.prefetch_filters()
+        if options["selectors"]:
+            selectors = selectors.filter(name__in=options["selectors"])
+        for selector in selectors:
+            selector.refresh_membership()
+            self.stdout.write(f"{selector}: {selector.memberships.count()} device(s)")
@@ -1,9 +1,11 @@
 from functools import partialmethod
 from itertools import chain
+from typing import Collection
 
 from core.models import Job
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import transaction
 from django.db.models import (
     BigIntegerField,
     BooleanField,
@@ -15,6 +17,7 @@ from django.db.models import (
     ManyToManyField,
     Prefetch,
     Q,
+    QuerySet,
     Value,
     When,
 )
@@ -145,6 +148,48 @@ class ComplianceReportQS(ValiditySettingsMixin, RestrictedQuerySet):
 
 
 class VDeviceQS(CustomPrefetchMixin, SetAttributesMixin, RestrictedQuerySet):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._state_builder = None
+        self._pair_resolver = None
+
+    def _clone(self, *args, **kwargs):
+        c = super()._clone(*args, **kwargs)
+        c._state_builder = self._state_builder
+        c._pair_resolver = self._pair_resolver
+        return c
+
+    def _fetch_all(self):
+        already_fetched = self._result_cache is not None
+        super()._fetch_all()
+        if already_fetched:
+            return
+        devices = [item for item in self._result_cache if isinstance(item, self.model)]
+        if self._pair_resolver is not None:
+            self._pair_resolver(devices)
+        if self._state_builder is not None:
+            self._state_builder(devices)
+
+    def prefetch_state(self, batch_size: int = 1000):
+        """
+        Fetches commands and Data Files which form .state for all the fetched devices at once.
+        Serializer, poller and data source must be prefetched as well
+        """
+        from validity.compliance.state import BulkStateBuilder
+
+        self._state_builder = BulkStateBuilder(batch_size=batch_size)
+        return self
+
+    def prefetch_dynamic_pairs(self, batch_size: int = 500):
+        """
+        Resolves .dynamic_pair for all the fetched devices at once.
+        Selector must be set, data source and poller should be prefetched as well
+        """
+        from validity.compliance.dynamic_pairs import BulkDynamicPairResolver
+
+        self._pair_resolver = BulkDynamicPairResolver(batch_size=batch_size)
+        return self
+
     def set_selector(self, selector):
         return self.set_attribute("selector", selector)
 
@@ -291,3 +336,29 @@ class ComplianceSelectorQS(RestrictedQuerySet):
             if isinstance(field, ManyToManyField) and field.name.endswith("_filter")
         )
         return self.prefetch_related(*filter_fields)
+
+    def refresh_membership(self, device_ids: Collection[int] | None = None) -> None:
+        for selector in self.prefetch_filters():
+            selector.refresh_membership(device_ids)
+
+
+class SelectorMembershipQS(QuerySet):
+    def refresh(self, selector, device_ids: Collection[int] | None = None) -> None:
+        """
+        Synchronizes membership of the devices (all of them if device_ids is None) with selector filters
+        """
+        device_qs = self.model._meta.get_field("device").related_model.objects.all()
+        memberships = self.filter(selector=selector)
+        if device_ids is not None:
+            device_qs = device_qs.filter(pk__in=device_ids)
+            memberships = memberships.filter(device_id__in=device_ids)
+        with transaction.atomic():
+            actual_ids = set(device_qs.filter(selector.filter).values_list("pk", flat=True))
+            current_ids = set(memberships.values_list("device_id", flat=True))
+            if stale_ids := current_ids - actual_ids:
+                memberships.filter(device_id__in=stale_ids).delete()
+            self.bulk_create(
+                (self.model(selector=selector, device_id=device_id) for device_id in actual_ids - current_ids),
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
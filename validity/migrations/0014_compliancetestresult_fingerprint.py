@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('validity', '0013_compliancetest_enabled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='compliancetestresult',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='Fingerprint'),
+        ),
+    ]
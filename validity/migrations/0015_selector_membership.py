@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('validity', '0014_compliancetestresult_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complianceselector',
+            name='membership_indexed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.CreateModel(
+            name='SelectorMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dcim.device')),
+                ('selector', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='validity.complianceselector')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('selector', 'device'), name='validity_selectormembership_unique')],
+            },
+        ),
+    ]
@@ -4,7 +4,7 @@ from .device import VDevice
 from .nameset import NameSet
 from .polling import Command, Poller
 from .report import ComplianceReport
-from .selector import ComplianceSelector
+from .selector import ComplianceSelector, SelectorMembership
 from .serializer import Serializer
 from .test import ComplianceTest
 from .test_result import ComplianceTestResult
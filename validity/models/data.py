@@ -1,6 +1,8 @@
+import hashlib
 import logging
 from contextlib import contextmanager
 from itertools import chain
+from pathlib import PurePosixPath
 
 from core.choices import DataSourceStatusChoices
 from core.exceptions import SyncError
@@ -10,7 +12,7 @@ from django.db.models import Q
 from django.urls import reverse
 from django.utils import timezone
 
-from validity.j2_env import Environment
+from validity import j2_env
 from validity.managers import VDataFileQS, VDataSourceQS
 from validity.utils.misc import batched
 
@@ -51,8 +53,7 @@ class VDataSource(DataSource):
     @property
     def web_url(self) -> str:
         template_text = self.cf.get("web_url") or ""
-        template = Environment().from_string(template_text)
-        return template.render(**self.parameters or {})
+        return j2_env.render(template_text, **self.parameters or {})
 
     @property
     def config_path_template(self) -> str:
@@ -63,10 +64,10 @@ class VDataSource(DataSource):
         return self.cf.get("device_command_path") or ""
 
     def get_config_path(self, device) -> str:
-        return Environment().from_string(self.config_path_template).render(device=device)
+        return j2_env.render(self.config_path_template, device=device)
 
     def get_command_path(self, device, command) -> str:
-        return Environment().from_string(self.command_path_template).render(device=device, command=command)
+        return j2_env.render(self.command_path_template, device=device, command=command)
 
     @contextmanager
     def _sync_status(self):
@@ -115,10 +116,63 @@ class VDataSource(DataSource):
             logger.debug("%s new files were created and %s existing files were updated during sync", created, updated)
             return all_new_paths
 
+    def _upsert_files(self, files: dict[str, bytes], batch_size: int) -> tuple[int, int]:
+        """
+        Creates new and updates changed Data Files, files with unchanged hash are skipped
+        """
+        now = timezone.now()
+        current_hashes = dict(self.datafiles.filter(path__in=files.keys()).values_list("path", "hash"))
+        changed_files = []
+        for path, data in files.items():
+            data_hash = hashlib.sha256(data).hexdigest()
+            if current_hashes.get(path) != data_hash:
+                changed_files.append(
+                    DataFile(source=self, path=path, last_updated=now, size=len(data), hash=data_hash, data=data)
+                )
+        DataFile.objects.bulk_create(
+            changed_files,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=("source", "path"),
+            update_fields=("last_updated", "size", "hash", "data"),
+        )
+        created = len(files.keys() - current_hashes.keys())
+        return created, len(changed_files) - created
+
+    def polling_sync(self, device_filter: Q | None = None, batch_size: int = 1000) -> set[str]:
+        """
+        Polls the devices and writes the results straight into Data Files without temporary directory.
+        Stale files are deleted in case of full sync (without device_filter)
+        """
+        backend = self.get_backend()
+        with self._sync_status():
+            all_paths = set()
+            created = updated = 0
+            polled_files = (
+                (path, data) for path, data in backend.poll(device_filter) if not self._ignore(PurePosixPath(path).name)
+            )
+            for file_batch in batched(polled_files, batch_size):
+                files = dict(file_batch)
+                all_paths |= files.keys()
+                batch_created, batch_updated = self._upsert_files(files, batch_size)
+                created += batch_created
+                updated += batch_updated
+            deleted = 0
+            if device_filter is None:
+                deleted, _ = self.datafiles.exclude(path__in=all_paths).delete()
+            logger.debug(
+                "%s new files were created, %s existing files were updated and %s files were deleted during sync",
+                created,
+                updated,
+                deleted,
+            )
+            return all_paths
+
     def sync(self, device_filter: Q | None = None):
-        if not device_filter or self.type != "device_polling":
-            return super().sync()
-        self.partial_sync(device_filter)
+        if self.type == "device_polling":
+            self.polling_sync(device_filter)
+            return
+        super().sync()
 
     @contextmanager
     def _backup_allowed(self, is_allowed: bool):
@@ -11,6 +11,7 @@ from .data import VDataSource
 
 
 if TYPE_CHECKING:
+    from .polling import Command
     from .selector import ComplianceSelector
 
 
@@ -41,9 +42,12 @@ class VDevice(Device):
         return self.state.config
 
     @cached_property
-    def state(self):
+    def state_sources(self) -> tuple[list["Command"], Serializable]:
+        """
+        Commands (with Data Files) and config Serializable which form device state. Nothing is serialized here
+        """
         try:
-            commands = (
+            commands = list(
                 self.poller.commands.select_related("serializer")
                 .set_file_paths(self, self.data_source)
                 .custom_postfetch(
@@ -53,7 +57,12 @@ class VDevice(Device):
         except AttributeError:
             # if device has no poller or data_source
             commands = []
-        return State.from_commands(commands).with_config(self._config_item())
+        return commands, self._config_item()
+
+    @cached_property
+    def state(self):
+        commands, config_item = self.state_sources
+        return State.from_commands(commands).with_config(config_item)
 
     @cached_property
     def dynamic_pair(self) -> Optional["VDevice"]:
@@ -1,7 +1,7 @@
 import operator
 import re
 from functools import reduce
-from typing import Generator
+from typing import Collection, Generator
 
 from dcim.choices import DeviceStatusChoices
 from dcim.models import Device, DeviceRole, DeviceType, Location, Manufacturer, Platform, Site
@@ -13,7 +13,7 @@ from tenancy.models import Tenant
 
 from validity.choices import BoolOperationChoices, DynamicPairsChoices
 from validity.compliance.dynamic_pairs import DynamicPairNameFilter, dpf_factory
-from validity.managers import ComplianceSelectorQS
+from validity.managers import ComplianceSelectorQS, SelectorMembershipQS
 from validity.utils.misc import reraise
 from .base import BaseModel
 from .device import VDevice
@@ -43,6 +43,7 @@ class ComplianceSelector(BaseModel):
         _("Dynamic Pairs"), max_length=20, choices=DynamicPairsChoices.choices, default="NO"
     )
     dp_tag_prefix = models.CharField(_("Dynamic Pair Tag Prefix"), max_length=255, blank=True)
+    membership_indexed = models.BooleanField(default=False, editable=False)
 
     objects = ComplianceSelectorQS.as_manager()
 
@@ -117,10 +118,48 @@ class ComplianceSelector(BaseModel):
         op = operator.or_ if self.filter_operation == BoolOperationChoices.OR else operator.and_
         return reduce(op, self.q_objects(), models.Q())
 
+    @property
+    def device_filter(self) -> models.Q:
+        """
+        Filter of the devices matching the selector.
+        Uses materialized membership index if it has been built, otherwise evaluates selector filters
+        """
+        if self.membership_indexed:
+            return models.Q(pk__in=SelectorMembership.objects.filter(selector=self).values("device_id"))
+        return self.filter
+
     @property
     def devices(self) -> models.QuerySet:
-        return VDevice.objects.filter(self.filter).set_selector(self)
+        return VDevice.objects.filter(self.device_filter).set_selector(self)
+
+    def refresh_membership(self, device_ids: Collection[int] | None = None) -> None:
+        """
+        Re-evaluates selector filters and updates membership index for the specified devices or for all of them
+        """
+        SelectorMembership.objects.refresh(self, device_ids)
+        if device_ids is None and not self.membership_indexed:
+            type(self).objects.filter(pk=self.pk).update(membership_indexed=True)
+            self.membership_indexed = True
 
     def dynamic_pair_filter(self, device: Device) -> models.Q | None:
         if dp_filter := dpf_factory(self, device).filter:
             return dp_filter & ~models.Q(pk=device.pk)
+
+
+class SelectorMembership(models.Model):
+    """
+    Materialized (selector, device) pairs. Allows to get selector devices without evaluating selector filters
+    """
+
+    selector = models.ForeignKey(ComplianceSelector, on_delete=models.CASCADE, related_name="memberships")
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name="+")
+
+    objects = SelectorMembershipQS.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=("selector", "device"), name="validity_selectormembership_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.selector}::{self.device}"
@@ -81,5 +81,5 @@ class Serializer(SubformMixin, DataSourceMixin, BaseModel):
     def effective_template(self) -> str:
         return self.effective_text_field()
 
-    def serialize(self, data: str) -> dict:
-        return self._backend(self, data)
+    def serialize(self, data: str, data_hash: str | None = None) -> dict:
+        return self._backend(self, data, data_hash)
@@ -6,7 +6,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from validity.choices import SeverityChoices
-from validity.compliance.eval import ExplanationalEval
+from validity.compliance.eval import CompiledEval, ExplanationalEval
 from validity.managers import ComplianceTestQS
 from validity.utils.misc import partialcls
 from .base import BaseModel, DataSourceMixin
@@ -27,6 +27,7 @@ class ComplianceTest(DataSourceMixin, BaseModel):
     clone_fields = ("expression", "selectors", "severity", "data_source", "data_file")
     text_db_field_name = "expression"
     evaluator_cls = partialcls(ExplanationalEval, load_defaults=True)
+    fast_evaluator_cls = partialcls(CompiledEval, load_defaults=True)
 
     objects = ComplianceTestQS.as_manager()
 
@@ -63,6 +64,7 @@ class ComplianceTest(DataSourceMixin, BaseModel):
         names = {"device": device, "_poller": device.poller, "_data_source": device.data_source}
         if extra_names:
             names |= extra_names
-        evaluator = self.evaluator_cls(names=names, functions=functions, verbosity=verbosity)
+        evaluator_cls = self.evaluator_cls if verbosity else self.fast_evaluator_cls
+        evaluator = evaluator_cls(names=names, functions=functions, verbosity=verbosity)
         passed = bool(evaluator.eval(self.effective_expression))
         return passed, evaluator.explanation
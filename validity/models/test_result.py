@@ -31,6 +31,7 @@ class ComplianceTestResult(BaseReadOnlyModel):
         blank=True,
         related_name="results",
     )
+    fingerprint = models.CharField(_("Fingerprint"), max_length=64, blank=True, default="", editable=False)
 
     objects = ComplianceTestResultQS.as_manager()
 
@@ -1,4 +1,6 @@
-from .base import BasePoller, CustomPoller
+from .base import AsyncPoller, BasePoller, CustomPoller
+from .circuit_breaker import CircuitBreaker
 from .cli import NetmikoPoller
-from .http import RequestsPoller
-from .netconf import ScrapliNetconfPoller
+from .http import AsyncRequestsPoller, RequestsPoller
+from .netconf import AsyncScrapliNetconfPoller, ScrapliNetconfPoller
+from .session_pool import SessionPool, SessionPoolMixin
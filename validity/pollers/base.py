@@ -1,7 +1,11 @@
+import asyncio
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Callable, Collection, Iterable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Collection, Iterable, Iterator
 
 from validity.utils.misc import reraise
 from .exceptions import PollingError
@@ -42,11 +46,13 @@ class ThreadPoller(BasePoller):
         """
         Handles device-wide errors
         """
+        started = time.perf_counter()
         try:
             with reraise(Exception, PollingError):
                 return list(self.poll_one_device(device))
         except PollingError as err:
-            return [CommandResult(device, c, error=err) for c in self.commands]
+            elapsed = time.perf_counter() - started
+            return [CommandResult(device, c, error=err, connect_time=elapsed) for c in self.commands]
 
     @abstractmethod
     def poll_one_device(self, device: "VDevice") -> Iterator[CommandResult]:
@@ -65,6 +71,73 @@ class ThreadPoller(BasePoller):
         return poll_gen
 
 
+class AsyncPoller(BasePoller):
+    """
+    Polls devices concurrently inside asyncio event loop running in a separate thread.
+    The number of simultaneous device sessions is limited by max_sessions.
+    Credentials are resolved in the calling thread before the loop starts, because ORM can't be used inside the loop
+    """
+
+    _done = object()
+
+    def __init__(self, credentials: dict, commands: Collection["Command"], max_sessions: int = 1000) -> None:
+        super().__init__(credentials, commands)
+        self.max_sessions = max_sessions
+
+    async def _poll_one_device(
+        self, device: "VDevice", credentials: dict | PollingError, semaphore: asyncio.Semaphore
+    ) -> Collection[CommandResult]:
+        """
+        Handles device-wide errors
+        """
+        if isinstance(credentials, PollingError):
+            return [CommandResult(device, c, error=credentials) for c in self.commands]
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                with reraise(Exception, PollingError):
+                    return [result async for result in self.poll_one_device(device, credentials)]
+            except PollingError as err:
+                elapsed = time.perf_counter() - started
+                return [CommandResult(device, c, error=err, connect_time=elapsed) for c in self.commands]
+
+    @abstractmethod
+    def poll_one_device(self, device: "VDevice", credentials: dict) -> AsyncIterator[CommandResult]:
+        pass
+
+    def _get_credentials(self, device: "VDevice") -> dict | PollingError:
+        try:
+            with reraise(Exception, PollingError):
+                return self.get_credentials(device)
+        except PollingError as err:
+            return err
+
+    async def _poll(self, devices: Collection[tuple["VDevice", dict | PollingError]], results: queue.Queue) -> None:
+        try:
+            semaphore = asyncio.Semaphore(self.max_sessions)
+            tasks = [self._poll_one_device(device, credentials, semaphore) for device, credentials in devices]
+            for task in asyncio.as_completed(tasks):
+                for result in await task:
+                    results.put(result)
+        except Exception as exc:
+            results.put(exc)
+        finally:
+            results.put(self._done)
+
+    def _iter_results(self, results: queue.Queue) -> Iterator[CommandResult]:
+        while (result := results.get()) is not self._done:
+            if isinstance(result, Exception):
+                raise result
+            yield result
+
+    def poll(self, devices: Iterable["VDevice"]) -> Iterator[CommandResult]:
+        results = queue.Queue()
+        devices = [(device, self._get_credentials(device)) for device in devices]
+        loop_thread = threading.Thread(target=asyncio.run, args=(self._poll(devices, results),), daemon=True)
+        loop_thread.start()  # polling starts right away, the same as for ThreadPoller
+        return self._iter_results(results)
+
+
 class DriverMixin:
     driver_factory: Callable  # Network driver class, e.g. netmiko.ConnectHandler
     driver_connect_method: str = ""
@@ -95,15 +168,83 @@ class ConsecutivePoller(DriverMixin, ThreadPoller):
     def poll_one_command(self, driver: Any, command: "Command") -> str:
         pass
 
+    def get_command_result(
+        self, driver: Any, device: "VDevice", command: "Command", connect_time: float = 0
+    ) -> CommandResult:
+        """
+        Handles command-wide errors
+        """
+        started = time.perf_counter()
+        try:
+            with reraise(Exception, PollingError, device_wide=False):
+                output = self.poll_one_command(driver, command)
+                result = CommandResult(device=device, command=command, result=output)
+        except PollingError as err:
+            result = CommandResult(device=device, command=command, error=err)
+        result.duration = time.perf_counter() - started
+        result.connect_time = connect_time
+        return result
+
     def poll_one_device(self, device: "VDevice") -> Iterator[CommandResult]:
+        started = time.perf_counter()
         with self.connection(device) as driver:
+            connect_time = time.perf_counter() - started
+            for command in self.commands:
+                yield self.get_command_result(driver, device, command, connect_time)
+
+
+class AsyncDriverMixin:
+    driver_factory: Callable  # Async network driver class, e.g. scrapli_netconf.driver.AsyncNetconfDriver
+    driver_connect_method: str = ""
+    driver_disconnect_method: str = ""
+
+    async def connect(self, credentials: dict[str, Any]):
+        driver = type(self).driver_factory(**credentials)
+        if self.driver_connect_method:
+            await getattr(driver, self.driver_connect_method)()
+        return driver
+
+    async def disconnect(self, driver):
+        if self.driver_disconnect_method:
+            await getattr(driver, self.driver_disconnect_method)()
+
+    @asynccontextmanager
+    async def connection(self, credentials: dict[str, Any]):
+        driver = await self.connect(credentials)
+        try:
+            yield driver
+        finally:
+            await self.disconnect(driver)
+
+
+class AsyncConsecutivePoller(AsyncDriverMixin, AsyncPoller):
+    @abstractmethod
+    async def poll_one_command(self, driver: Any, command: "Command") -> str:
+        pass
+
+    async def get_command_result(
+        self, driver: Any, device: "VDevice", command: "Command", connect_time: float = 0
+    ) -> CommandResult:
+        """
+        Handles command-wide errors
+        """
+        started = time.perf_counter()
+        try:
+            with reraise(Exception, PollingError, device_wide=False):
+                output = await self.poll_one_command(driver, command)
+                result = CommandResult(device=device, command=command, result=output)
+        except PollingError as err:
+            result = CommandResult(device=device, command=command, error=err)
+        result.duration = time.perf_counter() - started
+        result.connect_time = connect_time
+        return result
+
+    async def poll_one_device(self, device: "VDevice", credentials: dict) -> AsyncIterator[CommandResult]:
+        started = time.perf_counter()
+        async with self.connection(credentials) as driver:
+            connect_time = time.perf_counter() - started
             for command in self.commands:
-                try:
-                    with reraise(Exception, PollingError, device_wide=False):
-                        output = self.poll_one_command(driver, command)
-                        yield CommandResult(device=device, command=command, result=output)
-                except PollingError as err:
-                    yield CommandResult(device=device, command=command, error=err)
+                yield await self.get_command_result(driver, device, command, connect_time)
 
 
 class CustomPoller(ConsecutivePoller):
@@ -115,4 +256,5 @@ class CustomPoller(ConsecutivePoller):
     - poll_one_command() - method for sending one particular command to device and retrieving the result
     - driver_connect_method - optional driver method name to initiate the connection
     - driver_disconnect_method - optional driver method name to gracefully terminate the connection
+    Inherit SessionPoolMixin as well (and optionally override is_alive()) to reuse the sessions between the pollings
     """
@@ -0,0 +1,76 @@
+import time
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from django.core.cache import BaseCache
+
+
+if TYPE_CHECKING:
+    from validity.models import VDevice
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive device-wide polling failures of each device inside the shared cache.
+    After failure_threshold failures in a row the circuit of the device opens and the pollings skip the device.
+    Once per probe_interval one polling tries the device again (half-open state): success closes the circuit,
+    failure keeps it open for one more probe_interval
+    """
+
+    key_prefix = "validity_circuit:"
+
+    def __init__(
+        self,
+        cache: BaseCache,
+        failure_threshold: int = 3,
+        probe_interval: int = 3600,
+        state_ttl: int = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cache = cache
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.state_ttl = state_ttl
+        self.clock = clock
+
+    def get_key(self, device_pk: int) -> str:
+        return f"{self.key_prefix}{device_pk}"
+
+    def split(self, devices: Iterable["VDevice"]) -> tuple[list["VDevice"], list["VDevice"]]:
+        """
+        Splits the devices into the ones to poll and the ones to skip (with open circuit)
+        """
+        devices = list(devices)
+        states = self.cache.get_many([self.get_key(device.pk) for device in devices])
+        now = self.clock()
+        to_poll, to_skip, probes = [], [], {}
+        for device in devices:
+            key = self.get_key(device.pk)
+            state = states.get(key)
+            if state is None or state["failures"] < self.failure_threshold:
+                to_poll.append(device)
+            elif now - state["opened_at"] >= self.probe_interval:
+                to_poll.append(device)
+                # the other pollings keep skipping the device until the next probe_interval
+                probes[key] = state | {"opened_at": now}
+            else:
+                to_skip.append(device)
+        if probes:
+            self.cache.set_many(probes, self.state_ttl)
+        return to_poll, to_skip
+
+    def update(self, failed: dict[int, bool]) -> None:
+        """
+        Records polling outcomes, "failed" maps device pk to True if the device had a device-wide error
+        """
+        if succeeded_keys := [self.get_key(pk) for pk, is_failed in failed.items() if not is_failed]:
+            self.cache.delete_many(succeeded_keys)
+        failed_keys = [self.get_key(pk) for pk, is_failed in failed.items() if is_failed]
+        if not failed_keys:
+            return
+        states = self.cache.get_many(failed_keys)
+        now = self.clock()
+        new_states = {}
+        for key in failed_keys:
+            failures = states.get(key, {"failures": 0})["failures"] + 1
+            new_states[key] = {"failures": failures, "opened_at": now if failures >= self.failure_threshold else None}
+        self.cache.set_many(new_states, self.state_ttl)
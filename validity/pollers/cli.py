@@ -3,16 +3,20 @@ from typing import TYPE_CHECKING
 from netmiko import BaseConnection, ConnectHandler
 
 from .base import ConsecutivePoller
+from .session_pool import SessionPoolMixin
 
 
 if TYPE_CHECKING:
     from validity.models import Command
 
 
-class NetmikoPoller(ConsecutivePoller):
+class NetmikoPoller(SessionPoolMixin, ConsecutivePoller):
     host_param_name = "host"
     driver_disconnect_method = "disconnect"
     driver_factory = ConnectHandler
 
+    def is_alive(self, driver: BaseConnection) -> bool:
+        return driver.is_alive()
+
     def poll_one_command(self, driver: BaseConnection, command: "Command") -> str:
         return driver.send_command(command.parameters["cli_command"])
@@ -5,7 +5,8 @@ from dimi import Singleton
 from validity import di
 from validity.settings import PollerInfo
 from validity.utils.misc import partialcls
-from .base import BasePoller, ThreadPoller
+from .base import AsyncPoller, BasePoller, ThreadPoller
+from .session_pool import SessionPool, SessionPoolMixin
 
 
 if TYPE_CHECKING:
@@ -33,13 +34,22 @@ class PollerFactory:
         self,
         poller_map: Annotated[dict[str, type[BasePoller]], "PollerChoices.classes"],
         max_threads: Annotated[int, "validity_settings.polling_threads"],
+        max_sessions: Annotated[int, "validity_settings.polling_async_sessions"],
+        session_pool: Annotated[SessionPool | None, "polling_session_pool"],
     ) -> None:
         self.poller_map = poller_map
         self.max_threads = max_threads
+        self.max_sessions = max_sessions
+        self.session_pool = session_pool
 
     def __call__(self, connection_type: str, credentials: dict, commands: Sequence["Command"]) -> BasePoller:
         if poller_cls := self.poller_map.get(connection_type):
             if issubclass(poller_cls, ThreadPoller):
                 poller_cls = partialcls(poller_cls, thread_workers=self.max_threads)
-            return poller_cls(credentials=credentials, commands=commands)
+            elif issubclass(poller_cls, AsyncPoller):
+                poller_cls = partialcls(poller_cls, max_sessions=self.max_sessions)
+            poller = poller_cls(credentials=credentials, commands=commands)
+            if isinstance(poller, SessionPoolMixin):
+                poller.session_pool = self.session_pool
+            return poller
         raise KeyError("No poller exists for this connection type", connection_type)
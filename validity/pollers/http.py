@@ -1,11 +1,17 @@
-from typing import TYPE_CHECKING
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Collection, Iterator
 
+import httpx
 import requests
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
 
-from validity.j2_env import Environment
+from validity import j2_env
 from validity.utils.json import transform_json
-from .base import ConsecutivePoller
+from .base import AsyncConsecutivePoller, ConsecutivePoller
+from .result import CommandResult
 
 
 if TYPE_CHECKING:
@@ -18,40 +24,131 @@ class RequestParams(BaseModel, extra="allow"):
     )
     verify: bool | str = False
     auth: tuple[str, ...] | None = None
+    pool_size: int = Field(10, ge=1, exclude=True)
+    concurrent_commands: int = Field(1, ge=1, exclude=True)
 
     def rendered_url(self, device: "VDevice", command: "Command") -> str:
-        return Environment().from_string(self.url).render(device=device, command=command)
+        return j2_env.render(self.url, device=device, command=command)
 
 
 class HttpDriver:
+    """
+    Sends the requests to one device through requests.Session,
+    so the connections (and TLS sessions) are reused between the commands
+    """
+
     def __init__(self, device: "VDevice", **poller_credentials) -> None:
         self.device = device
         self.request_params = RequestParams.model_validate(poller_credentials)
+        self.session: requests.Session | None = None
+
+    def open(self) -> None:
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.request_params.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
+            self.session = None
 
     def render_body(self, orig_body: dict, command: "Command"):
         return transform_json(
             orig_body,
             match_fn=lambda _, value: isinstance(value, str),
-            transform_fn=lambda key, value: (
-                key,
-                Environment().from_string(value).render(device=self.device, command=command),
-            ),
+            transform_fn=lambda key, value: (key, j2_env.render(value, device=self.device, command=command)),
         )
 
-    def request(self, command: "Command", *, requests=requests) -> str:
+    def request_kwargs(self, command: "Command") -> dict[str, Any]:
         request_kwargs = self.request_params.model_dump()
         request_kwargs["url"] = self.request_params.rendered_url(self.device, command)
         request_kwargs["method"] = command.parameters["method"]
         if body := self.render_body(command.parameters["body"], command):
             request_kwargs["json"] = body
-        return requests.request(**request_kwargs).content.decode()
+        return request_kwargs
+
+    def request(self, command: "Command", *, requests=None) -> str:
+        if requests is None:
+            if self.session is None:
+                self.open()
+            requests = self.session
+        return requests.request(**self.request_kwargs(command)).content.decode()
+
+
+class AsyncHttpDriver:
+    """
+    Sends the requests to one device via httpx.AsyncClient.
+    Requests are rendered in advance by prepare_credentials() in the calling thread,
+    because URL/body templates may query the DB, which is not allowed inside the event loop
+    """
+
+    client_params = ("verify", "cert")
+
+    def __init__(self, request_kwargs: dict[Any, dict[str, Any]], client_kwargs: dict[str, Any]) -> None:
+        self.request_kwargs = request_kwargs
+        self.client_kwargs = client_kwargs
+        self.client: httpx.AsyncClient | None = None
+
+    @classmethod
+    def prepare_credentials(cls, device: "VDevice", commands: Collection["Command"], **poller_credentials) -> dict:
+        """
+        Renders the request for each command. "verify" and "cert" params are passed to the client,
+        the others are passed to client.request()
+        """
+        http_driver = HttpDriver(device, **poller_credentials)
+        client_kwargs = {"limits": httpx.Limits(max_connections=http_driver.request_params.pool_size)}
+        request_kwargs = {}
+        for command in commands:
+            command_kwargs = request_kwargs[command.pk] = http_driver.request_kwargs(command)
+            for param in cls.client_params:
+                if param in command_kwargs:
+                    client_kwargs[param] = command_kwargs.pop(param)
+        return {"request_kwargs": request_kwargs, "client_kwargs": client_kwargs}
+
+    async def open(self) -> None:
+        self.client = httpx.AsyncClient(**self.client_kwargs)
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def arequest(self, command: "Command") -> str:
+        response = await self.client.request(**self.request_kwargs[command.pk])
+        return response.content.decode()
 
 
 class RequestsPoller(ConsecutivePoller):
     driver_factory = HttpDriver
+    driver_connect_method = "open"
+    driver_disconnect_method = "close"
 
     def get_credentials(self, device: "VDevice"):
         return self.credentials | {"device": device}
 
     def poll_one_command(self, driver: HttpDriver, command: "Command") -> str:
         return driver.request(command)
+
+    def poll_one_device(self, device: "VDevice") -> Iterator[CommandResult]:
+        started = time.perf_counter()
+        with self.connection(device) as driver:
+            get_result = partial(self.get_command_result, driver, device, connect_time=time.perf_counter() - started)
+            workers = min(driver.request_params.concurrent_commands, len(self.commands))
+            if workers <= 1:
+                yield from map(get_result, self.commands)
+                return
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                yield from executor.map(get_result, self.commands)
+
+
+class AsyncRequestsPoller(AsyncConsecutivePoller):
+    driver_factory = AsyncHttpDriver
+    driver_connect_method = "open"
+    driver_disconnect_method = "close"
+
+    def get_credentials(self, device: "VDevice"):
+        return AsyncHttpDriver.prepare_credentials(device, self.commands, **self.credentials)
+
+    async def poll_one_command(self, driver: AsyncHttpDriver, command: "Command") -> str:
+        return await driver.arequest(command)
@@ -1,12 +1,12 @@
 from typing import TYPE_CHECKING
 
-from scrapli_netconf.driver import NetconfDriver
+from scrapli_netconf.driver import AsyncNetconfDriver, NetconfDriver
 
-from .base import ConsecutivePoller
+from .base import AsyncConsecutivePoller, ConsecutivePoller
 
 
 if TYPE_CHECKING:
-    from validity.models import Command
+    from validity.models import Command, VDevice
 
 
 class ScrapliNetconfPoller(ConsecutivePoller):
@@ -18,3 +18,18 @@ class ScrapliNetconfPoller(ConsecutivePoller):
     def poll_one_command(self, driver: NetconfDriver, command: "Command") -> str:
         response = driver.rpc(command.parameters["rpc"])
         return response.result
+
+
+class AsyncScrapliNetconfPoller(AsyncConsecutivePoller):
+    driver_factory = AsyncNetconfDriver
+    driver_connect_method = "open"
+    driver_disconnect_method = "close"
+    host_param_name = "host"
+    default_transport = "asyncssh"
+
+    def get_credentials(self, device: "VDevice"):
+        return {"transport": self.default_transport} | super().get_credentials(device)
+
+    async def poll_one_command(self, driver: AsyncNetconfDriver, command: "Command") -> str:
+        response = await driver.rpc(command.parameters["rpc"])
+        return response.result
@@ -1,6 +1,8 @@
 import datetime
+import heapq
+import math
+from collections import defaultdict
 from dataclasses import dataclass
-from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
 from django.utils import timezone
@@ -20,6 +22,8 @@ class CommandResult:
     command: "Command"
     result: str = ""
     error: PollingError | None = None
+    duration: float = 0  # seconds spent on the command itself
+    connect_time: float = 0  # seconds spent on connecting to the device, the same for all the results of the device
 
     error_header: ClassVar[str] = "POLLING ERROR\n"
 
@@ -28,8 +32,10 @@ class CommandResult:
 
     foldername = property(lambda self: slugify(str(self.device)))
     filename = property(lambda self: self.command.label + ".txt")
+    path = property(lambda self: f"{self.foldername}/{self.filename}")
     errored = property(lambda self: self.error is not None)
     contents = property(lambda self: self.error_header + str(self.error) if self.errored else self.result)
+    output_size = property(lambda self: len(self.result.encode("utf-8")))
 
     @property
     def descriptive_error(self):
@@ -37,13 +43,6 @@ class CommandResult:
         command = "" if self.error.device_wide else self.command.label
         return DescriptiveError(device=str(self.device), command=command, error=self.error.message)
 
-    def write_on_disk(self, base_dir: str) -> None:
-        device_folder = Path(base_dir) / self.foldername
-        if not device_folder.is_dir():
-            device_folder.mkdir()
-        full_path = device_folder / self.filename
-        full_path.write_text(self.contents, encoding="utf-8")
-
 
 class DescriptiveError(BaseModel, frozen=True):
     """
@@ -55,11 +54,125 @@ class DescriptiveError(BaseModel, frozen=True):
     error: str
 
 
+class Percentiles(BaseModel):
+    p50: int | float
+    p95: int | float
+    max: int | float
+
+    @classmethod
+    def from_values(cls, values: list[int | float]) -> "Percentiles":
+        values = sorted(round(value, 3) for value in values)
+
+        def nearest_rank(percent: int) -> int | float:
+            return values[max(math.ceil(len(values) * percent / 100) - 1, 0)]
+
+        return cls(p50=nearest_rank(50), p95=nearest_rank(95), max=values[-1])
+
+
+class PollerStats(BaseModel):
+    devices: int
+    connect_time: Percentiles
+    device_time: Percentiles
+
+
+class CommandStats(BaseModel):
+    count: int
+    duration: Percentiles
+    output_size: Percentiles | None = None
+
+
+class DeviceTiming(BaseModel):
+    device: str
+    poller: str
+    duration: float
+
+
+class PollingStats(BaseModel):
+    """
+    Timings (in seconds) and output sizes (in bytes) of the polling
+    """
+
+    pollers: dict[str, PollerStats] = {}
+    commands: dict[str, CommandStats] = {}
+    slowest_devices: list[DeviceTiming] = []
+    session_pool: dict[str, int] | None = None  # SessionPoolStats of this polling
+
+
+class PollingStatsCollector:
+    """
+    Accumulates timings of the command results to build PollingStats in the end of the polling
+    """
+
+    def __init__(self, slowest_devices: int = 10) -> None:
+        self.slowest_devices = slowest_devices
+        self._devices: dict[int, dict] = {}
+        self._durations = defaultdict(list)
+        self._sizes = defaultdict(list)
+
+    def add(self, result: CommandResult) -> None:
+        device = self._devices.setdefault(
+            result.device.pk, {"device": str(result.device), "poller": str(result.device.poller), "command_time": 0}
+        )
+        device["connect_time"] = result.connect_time
+        device["command_time"] += result.duration
+        self._durations[result.command.label].append(result.duration)
+        if not result.errored:
+            self._sizes[result.command.label].append(result.output_size)
+
+    @staticmethod
+    def _device_time(device: dict) -> float:
+        return device["connect_time"] + device["command_time"]
+
+    def _poller_stats(self) -> dict[str, PollerStats]:
+        by_poller = defaultdict(list)
+        for device in self._devices.values():
+            by_poller[device["poller"]].append(device)
+        return {
+            poller: PollerStats(
+                devices=len(devices),
+                connect_time=Percentiles.from_values([device["connect_time"] for device in devices]),
+                device_time=Percentiles.from_values([self._device_time(device) for device in devices]),
+            )
+            for poller, devices in sorted(by_poller.items())
+        }
+
+    def _command_stats(self) -> dict[str, CommandStats]:
+        return {
+            label: CommandStats(
+                count=len(durations),
+                duration=Percentiles.from_values(durations),
+                output_size=Percentiles.from_values(self._sizes[label]) if self._sizes[label] else None,
+            )
+            for label, durations in sorted(self._durations.items())
+        }
+
+    def _slowest_devices(self) -> list[DeviceTiming]:
+        timings = (
+            DeviceTiming(
+                device=device["device"],
+                poller=device["poller"],
+                duration=round(self._device_time(device), 3),
+            )
+            for device in self._devices.values()
+        )
+        return heapq.nlargest(self.slowest_devices, timings, key=lambda timing: timing.duration)
+
+    def build(self, session_pool: dict[str, int] | None = None) -> PollingStats:
+        return PollingStats(
+            pollers=self._poller_stats(),
+            commands=self._command_stats(),
+            slowest_devices=self._slowest_devices(),
+            session_pool=session_pool,
+        )
+
+
 class PollingInfo(BaseModel):
     polled_at: datetime.datetime = Field(default_factory=timezone.now)
     devices_polled: int
     errors: list[DescriptiveError]
     partial_sync: bool = False
+    skipped_devices: list[str] = []
+    stats: PollingStats | None = None
 
     @field_serializer("errors")
     def sort_errors(self, errors, _info):
@@ -73,3 +186,8 @@ class PollingInfo(BaseModel):
     @property
     def error_count(self) -> int:
         return len(self.errors)
+
+    @computed_field
+    @property
+    def skipped_count(self) -> int:
+        return len(self.skipped_devices)
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
+from dataclasses import asdict, dataclass, fields, replace
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
+
+if TYPE_CHECKING:
+    from validity.models import Command, VDevice
+
+
+@dataclass
+class SessionPoolStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    reconnects: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+    def __sub__(self, other: "SessionPoolStats") -> "SessionPoolStats":
+        return type(self)(**{f.name: getattr(self, f.name) - getattr(other, f.name) for f in fields(self)})
+
+
+@dataclass
+class _IdleSession:
+    driver: Any
+    close: Callable[[Any], None]
+    released_at: float
+
+
+class SessionPool:
+    """
+    Keeps idle driver sessions open between the pollings inside one process.
+    A session is taken out of the pool while it is in use, so it is never shared between two threads.
+    Sessions idle for longer than idle_timeout are closed by the background timer
+    """
+
+    def __init__(self, max_size: int = 100, idle_timeout: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.stats = SessionPoolStats()
+        self._sessions: OrderedDict[Hashable, _IdleSession] = OrderedDict()
+        self._lock = threading.Lock()
+        self._reaper: threading.Timer | None = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @staticmethod
+    def get_key(namespace: str, credentials: dict[str, Any]) -> tuple[str, str]:
+        creds_hash = hashlib.sha256(json.dumps(credentials, sort_keys=True, default=str).encode()).hexdigest()
+        return namespace, creds_hash
+
+    @staticmethod
+    def _close(sessions: list[_IdleSession]) -> None:
+        for session in sessions:
+            with suppress(Exception):
+                session.close(session.driver)
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            setattr(self.stats, stat, getattr(self.stats, stat) + 1)
+
+    def _pop_expired(self) -> list[_IdleSession]:
+        expired = []
+        deadline = self.clock() - self.idle_timeout
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if session.released_at > deadline:
+                break
+            expired.append(self._sessions.pop(key))
+        self.stats.evictions += len(expired)
+        return expired
+
+    def _schedule_reaper(self) -> None:
+        # must be called under the lock
+        if self._reaper is not None or not self._sessions:
+            return
+        oldest = next(iter(self._sessions.values()))
+        delay = max(oldest.released_at + self.idle_timeout - self.clock(), 0)
+        self._reaper = threading.Timer(delay, self.reap)
+        self._reaper.daemon = True
+        self._reaper.start()
+
+    def reap(self) -> None:
+        """
+        Closes the expired sessions even if the pool is not used anymore
+        """
+        with self._lock:
+            self._reaper = None
+            to_close = self._pop_expired()
+            self._schedule_reaper()
+        self._close(to_close)
+
+    def get_stats(self) -> SessionPoolStats:
+        with self._lock:
+            return replace(self.stats)
+
+    def acquire(self, key: Hashable, connect: Callable[[], Any], is_alive: Callable[[Any], bool]) -> Any:
+        """
+        Returns alive idle session for the key or opens a new one
+        """
+        with self._lock:
+            to_close = self._pop_expired()
+            session = self._sessions.pop(key, None)
+        self._close(to_close)
+        if session is None:
+            self._count("misses")
+            return connect()
+        try:
+            alive = is_alive(session.driver)
+        except Exception:
+            alive = False
+        if alive:
+            self._count("hits")
+            return session.driver
+        self._count("reconnects")
+        self._close([session])
+        return connect()
+
+    def release(self, key: Hashable, driver: Any, close: Callable[[Any], None]) -> None:
+        """
+        Puts the session back to the pool, the least recently used sessions are evicted if the pool is full
+        """
+        with self._lock:
+            to_close = self._pop_expired()
+            if (previous := self._sessions.pop(key, None)) is not None:
+                to_close.append(previous)
+            while len(self._sessions) >= self.max_size:
+                to_close.append(self._sessions.popitem(last=False)[1])
+                self.stats.evictions += 1
+            self._sessions[key] = _IdleSession(driver, close, self.clock())
+            self._schedule_reaper()
+        self._close(to_close)
+
+    def clear(self) -> None:
+        with self._lock:
+            to_close = list(self._sessions.values())
+            self._sessions.clear()
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+        self._close(to_close)
+
+
+# one device session is used by one thread at a time
+_session_errors = threading.local()
+
+
+class SessionPoolMixin:
+    """
+    Allows ConsecutivePoller subclasses to reuse the sessions between the pollings.
+    Pool is set up by PollerFactory if "polling_session_pool" setting is enabled, otherwise it's None
+    and every polling opens a new session.
+    The session is not returned to the pool if any command has failed, it may be left in unknown state
+    """
+
+    session_pool: SessionPool | None = None
+
+    def is_alive(self, driver: Any) -> bool:
+        """
+        Checks if idle session can be reused
+        """
+        return True
+
+    def get_command_result(self, driver: Any, device: "VDevice", command: "Command", connect_time: float = 0):
+        result = super().get_command_result(driver, device, command, connect_time)
+        if result.errored:
+            _session_errors.failed = True
+        return result
+
+    @contextmanager
+    def connection(self, device: "VDevice"):
+        if self.session_pool is None:
+            with super().connection(device) as driver:
+                yield driver
+            return
+        creds = self.get_credentials(device)
+        key = self.session_pool.get_key(type(self).__qualname__, creds)
+        driver = self.session_pool.acquire(key, lambda: self.connect(creds), self.is_alive)
+        _session_errors.failed = False
+        try:
+            yield driver
+        except BaseException:
+            with suppress(Exception):
+                self.disconnect(driver)
+            raise
+        if _session_errors.failed:
+            with suppress(Exception):
+                self.disconnect(driver)
+            return
+        self.session_pool.release(key, driver, self.disconnect)
@@ -109,6 +109,7 @@ class FullScriptParams(ScriptParams):
 class SplitResult:
     log: list[Message]
     slices: list[dict[int, list[int]]]
+    use_work_queue: bool = False
 
 
 @dataclass(slots=True, frozen=True)
@@ -139,6 +140,7 @@ class RunTestsParams(ScriptParams):
     test_tags: list[int] = field(default_factory=list)
     explanation_verbosity: int = 2
     overriding_datasource: int | None = None
+    incremental: bool = False
 
     @property
     def selector_qs(self) -> QuerySet[ComplianceSelector]:
@@ -155,7 +157,7 @@ class RunTestsParams(ScriptParams):
         selectors = self.selector_qs
         if not selectors.exists():
             return Q(pk__in=[])
-        filtr = reduce(operator.or_, (selector.filter for selector in selectors.prefetch_filters()))
+        filtr = reduce(operator.or_, (selector.device_filter for selector in selectors.prefetch_filters()))
         if self.devices:
             filtr &= Q(pk__in=self.devices)
         return filtr
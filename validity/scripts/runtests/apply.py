@@ -1,18 +1,31 @@
+import copy
+import json
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from functools import cached_property, partial
 from itertools import chain
 from typing import Annotated, Any, Callable, Iterable, Iterator
 
 from dimi import Singleton
+from django.db import connections
 from django.db.models import Prefetch, QuerySet
 
 from validity import di
+from validity.compliance.dynamic_pairs import BulkDynamicPairResolver
 from validity.compliance.eval.eval_defaults import DEFAULT_NAMESET
 from validity.compliance.exceptions import EvalError, SerializationError
 from validity.models import ComplianceSelector, ComplianceTest, ComplianceTestResult, NameSet, VDataSource, VDevice
-from validity.utils.logger import Logger
+from validity.models.test_result import DeepDiffEncoder
+from validity.utils.logger import Logger, Message
+from validity.utils.misc import batched
 from ..data_models import ExecutionResult, FullRunTestsParams, TestResultRatio
 from ..parent_jobs import JobExtractor
+from .fingerprint import ResultFingerprint
+from .result_writer import BackgroundWriter, CopyResultWriter
+from .work_queue import WorkQueue
 
 
 class TestExecutor:
@@ -21,16 +34,24 @@ class TestExecutor:
     """
 
     def __init__(
-        self, logger: Logger, explanation_verbosity: int, report_id: int, extra_globals: dict[str, Any] | None = None
+        self,
+        logger: Logger,
+        explanation_verbosity: int,
+        report_id: int,
+        extra_globals: dict[str, Any] | None = None,
+        incremental: bool = False,
     ) -> None:
         self.explanation_verbosity = explanation_verbosity
         self.report_id = report_id
         self.log = logger
         self.results_count = 0
         self.results_passed = 0
+        self.results_reused = 0
         self._nameset_functions = {}
         self.global_namesets = NameSet.objects.filter(_global=True)
         self.extra_globals = extra_globals
+        self.fingerprint = ResultFingerprint(explanation_verbosity, self.global_namesets) if incremental else None
+        self.previous_results = {}
 
     def nameset_functions(self, namesets: Iterable[NameSet]) -> dict[str, Callable]:
         result = {}
@@ -55,13 +76,19 @@ class TestExecutor:
         device: VDevice,
     ) -> Iterator[ComplianceTestResult]:
         for test in tests_qs:
-            try:
-                device.state  # noqa: B018
-                passed, explanation = self.run_test(device, test)
-            except EvalError as exc:
-                self.log.failure(f"Failed to execute test **{test}** for device **{device}**, `{exc}`")
-                passed = False
-                explanation = [(str(exc), None)]
+            fingerprint = self.get_fingerprint(device, test)
+            previous_result = self.previous_results.get((test.pk, device.pk))
+            if fingerprint and previous_result is not None and previous_result.fingerprint == fingerprint:
+                passed, explanation = previous_result.passed, previous_result.explanation
+                self.results_reused += 1
+            else:
+                try:
+                    device.state  # noqa: B018
+                    passed, explanation = self.run_test(device, test)
+                except EvalError as exc:
+                    self.log.failure(f"Failed to execute test **{test}** for device **{device}**, `{exc}`")
+                    passed = False
+                    explanation = [(str(exc), None)]
             self.results_count += 1
             self.results_passed += int(passed)
             yield ComplianceTestResult(
@@ -71,9 +98,35 @@ class TestExecutor:
                 explanation=explanation,
                 report_id=self.report_id,
                 dynamic_pair=device.dynamic_pair,
+                fingerprint=fingerprint,
             )
 
+    def get_fingerprint(self, device: VDevice, test: ComplianceTest) -> str:
+        if self.fingerprint is None:
+            return ""
+        try:
+            return self.fingerprint(device, test)
+        except Exception as e:
+            self.log.warning(
+                f"Cannot compute fingerprint for test **{test}** and device **{device}**, `{type(e).__name__}: {e}`"
+            )
+            return ""
+
+    def load_previous_results(self, devices: Iterable[VDevice], tests: Iterable[ComplianceTest]) -> None:
+        """
+        Loads the latest results of the tests for the devices to compare their fingerprints later
+        """
+        results = (
+            ComplianceTestResult.objects.filter(device__in=[d.pk for d in devices], test__in=[t.pk for t in tests])
+            .exclude(report_id=self.report_id)
+            .only_latest()
+            .only("test_id", "device_id", "passed", "explanation", "fingerprint")
+        )
+        self.previous_results = {(result.test_id, result.device_id): result for result in results}
+
     def __call__(self, devices: QuerySet[VDevice], tests: QuerySet[ComplianceTest]) -> Iterator[ComplianceTestResult]:
+        if self.fingerprint is not None:
+            self.load_previous_results(devices, tests)
         for device in devices:
             try:
                 yield from self.run_tests_for_device(tests, device)
@@ -118,16 +171,128 @@ class DeviceTestIterator:
             test_qs = test_qs.filter(tags__pk__in=self.test_tags).distinct()
         return selectors.prefetch_related(Prefetch("tests", test_qs.prefetch_related("namesets")))
 
-    def _get_device_qs(self, selector: ComplianceSelector, device_ids: list[int]) -> QuerySet[VDevice]:
-        device_qs = selector.devices.select_related().prefetch_serializer().prefetch_poller()
+    def _prefetch_device_qs(self, device_qs: QuerySet[VDevice]) -> QuerySet[VDevice]:
+        device_qs = device_qs.select_related().prefetch_serializer().prefetch_poller()
         if self.overriding_datasource:
-            device_qs = device_qs.set_datasource(self.overriding_datasource)
-        else:
-            device_qs = device_qs.prefetch_datasource()
-        device_qs = device_qs.filter(pk__in=device_ids)
+            return device_qs.set_datasource(self.overriding_datasource)
+        return device_qs.prefetch_datasource()
+
+    def _get_device_qs(self, selector: ComplianceSelector, device_ids: list[int]) -> QuerySet[VDevice]:
+        device_qs = self._prefetch_device_qs(selector.devices)
+        device_qs = device_qs.filter(pk__in=device_ids).prefetch_state().prefetch_dynamic_pairs()
         return device_qs
 
 
+def group_by_device(selector_devices: dict[int, list[int]]) -> dict[int, list[int]]:
+    """
+    Converts {selector_id: [device_id, ...]} into {device_id: [selector_id, ...]}
+    """
+    device_selectors = defaultdict(list)
+    for selector_id, device_ids in selector_devices.items():
+        for device_id in device_ids:
+            device_selectors[device_id].append(selector_id)
+    return device_selectors
+
+
+class DeviceMajorTestIterator(DeviceTestIterator):
+    """
+    Generates the same pairs of (devices, tests) as DeviceTestIterator,
+    but loads and serializes each device only once even if it belongs to several selectors.
+    Device instances yielded for different selectors share the same state,
+    dynamic pair is still resolved for each (device, selector) pair
+    """
+
+    def __init__(
+        self,
+        selector_devices: dict[int, list[int]],
+        test_tags: list[int],
+        overriding_datasource_id: int | None,
+        device_batch_size: int = 500,
+    ):
+        super().__init__(selector_devices, test_tags, overriding_datasource_id)
+        self.device_batch_size = device_batch_size
+        self.pair_resolver = BulkDynamicPairResolver()
+        self._pairs = self._iter_pairs()
+
+    def __next__(self) -> tuple[list[VDevice], QuerySet[ComplianceTest]]:
+        return next(self._pairs)
+
+    def _iter_pairs(self) -> Iterator[tuple[list[VDevice], QuerySet[ComplianceTest]]]:
+        device_selectors = group_by_device(self.selector_devices)
+        self.selector_devices = {}
+        for device_ids in batched(device_selectors.keys(), self.device_batch_size):
+            selector_copies = defaultdict(list)
+            for device in self._get_devices(device_ids):
+                for selector_id in device_selectors[device.pk]:
+                    device_copy = copy.copy(device)
+                    device_copy.selector = self.all_selectors[selector_id]
+                    selector_copies[selector_id].append(device_copy)
+            self.pair_resolver(list(chain.from_iterable(selector_copies.values())))
+            for selector_id, devices in selector_copies.items():
+                yield devices, self.all_selectors[selector_id].tests.all()
+
+    def _get_devices(self, device_ids: list[int]) -> QuerySet[VDevice]:
+        return self._prefetch_device_qs(VDevice.objects.filter(pk__in=device_ids)).prefetch_state()
+
+
+@dataclass(slots=True)
+class ChunkResult:
+    results: list[dict[str, Any]]
+    passed: int
+    total: int
+    reused: int
+    log: list[Message]
+
+
+def run_tests_chunk(
+    test_executor_factory: Callable[[Logger, int, int], TestExecutor],
+    device_test_gen: type[DeviceTestIterator],
+    params: FullRunTestsParams,
+    script_id: str,
+    selector_devices: dict[int, list[int]],
+) -> ChunkResult:
+    """
+    Executes the tests for a chunk of devices inside a subprocess.
+    Test results are returned as plain field values, the parent process is responsible for saving them to DB.
+    Explanation may contain arbitrary objects (e.g. dict views) which can't be pickled,
+    so it's encoded the same way as it is encoded when saved to DB
+    """
+    logger = Logger()
+    with logger.script_id(script_id):
+        executor = test_executor_factory(
+            logger, params.explanation_verbosity, params.object_id, incremental=params.incremental
+        )
+        results = [
+            {
+                "test_id": result.test_id,
+                "device_id": result.device_id,
+                "passed": result.passed,
+                "explanation": json.loads(json.dumps(result.explanation, cls=DeepDiffEncoder)),
+                "report_id": result.report_id,
+                "dynamic_pair_id": result.dynamic_pair_id,
+                "fingerprint": result.fingerprint,
+            }
+            for devices, tests in device_test_gen(selector_devices, params.test_tags, params.overriding_datasource)
+            for result in executor(devices, tests)
+        ]
+        return ChunkResult(
+            results, executor.results_passed, executor.results_count, executor.results_reused, list(logger.messages)
+        )
+
+
+_chunk_runner: Callable[[dict[int, list[int]]], ChunkResult] | None = None
+
+
+def _init_chunk_runner(chunk_runner: Callable[[dict[int, list[int]]], ChunkResult]) -> None:
+    # runner is passed via pool initializer to be inherited by forked subprocesses without pickling
+    global _chunk_runner
+    _chunk_runner = chunk_runner
+
+
+def _run_chunk(selector_devices: dict[int, list[int]]) -> ChunkResult:
+    return _chunk_runner(selector_devices)
+
+
 @di.dependency(scope=Singleton)
 @dataclass(repr=False, kw_only=True)
 class ApplyWorker:
@@ -140,16 +305,34 @@ class ApplyWorker:
     )
     logger: Annotated[Logger, ...]
     device_test_gen: type[DeviceTestIterator] = DeviceTestIterator
+    device_major_test_gen: type[DeviceTestIterator] = DeviceMajorTestIterator
+    device_major: Annotated[bool, "validity_settings.apply_device_major"] = False
     result_batch_size: Annotated[int, "validity_settings.result_batch_size"]
+    result_writer: Annotated[str, "validity_settings.result_writer"] = "bulk_create"
+    background_writer: Annotated[bool, "validity_settings.background_result_writer"] = False
     job_extractor_factory: Callable[[], JobExtractor] = JobExtractor
     testresult_queryset: QuerySet[ComplianceTestResult] = field(default_factory=ComplianceTestResult.objects.all)
+    processes: Annotated[int, "validity_settings.apply_processes"]
+    chunk_size: Annotated[int, "validity_settings.apply_chunk_size"]
+    process_pool_factory: Callable[..., Executor] = partial(
+        ProcessPoolExecutor, mp_context=multiprocessing.get_context("fork")
+    )
+    work_queue: Annotated[WorkQueue | None, "runtests_work_queue"] = None
 
     def __call__(self, *, params: FullRunTestsParams, worker_id: int) -> ExecutionResult:
         with self.logger.script_id(f"Worker #{worker_id}"):
             try:
-                executor = self.test_executor_factory(self.logger, params.explanation_verbosity, params.object_id)
-                test_results = self.get_test_results(params, worker_id, executor)
-                self.save_results_to_db(test_results)
+                executor = self.test_executor_factory(
+                    self.logger, params.explanation_verbosity, params.object_id, incremental=params.incremental
+                )
+                split_result = self.job_extractor_factory().parent.job.result
+                with self.unit_runner(params, worker_id, executor) as run_unit:
+                    if split_result.use_work_queue:
+                        self.process_work_queue(params, worker_id, run_unit)
+                    else:
+                        self.save_results_to_db(run_unit(split_result.slices[worker_id]))
+                if params.incremental:
+                    self.logger.info(f"{executor.results_reused} result(s) reused from the previous reports")
                 return ExecutionResult(
                     TestResultRatio(executor.results_passed, executor.results_count), executor.log.messages
                 )
@@ -157,19 +340,94 @@ class ApplyWorker:
                 self.logger.log_exception(err)
                 return ExecutionResult(test_stat=TestResultRatio(0, 0), log=self.logger.messages, errored=True)
 
-    def get_test_results(
+    @contextmanager
+    def unit_runner(
         self, params: FullRunTestsParams, worker_id: int, executor: TestExecutor
+    ) -> Iterator[Callable[[dict[int, list[int]]], Iterator[ComplianceTestResult]]]:
+        """
+        Provides a function executing the tests for one work unit ({selector_id: [device_id, ...]}).
+        Process pool (if any) is started once and shared by all the units
+        """
+        if self.processes <= 1:
+            yield partial(self.get_test_results, params, executor)
+            return
+        run_chunk = partial(
+            run_tests_chunk, self.test_executor_factory, self.get_device_test_gen(), params, f"Worker #{worker_id}"
+        )
+        # forked subprocesses must not share DB connections with the parent
+        connections.close_all()
+        with self.process_pool_factory(self.processes, initializer=_init_chunk_runner, initargs=(run_chunk,)) as pool:
+            yield partial(self.get_test_results_from_pool, pool, executor)
+
+    def get_test_results(
+        self, params: FullRunTestsParams, executor: TestExecutor, selector_devices: dict[int, list[int]]
     ) -> Iterator[ComplianceTestResult]:
-        selector_devices = self.get_selector_devices(worker_id)
         test_results = (
             executor(devices, tests)
-            for devices, tests in self.device_test_gen(selector_devices, params.test_tags, params.overriding_datasource)
+            for devices, tests in self.get_device_test_gen()(
+                selector_devices, params.test_tags, params.overriding_datasource
+            )
         )
         return chain.from_iterable(test_results)
 
-    def get_selector_devices(self, worker_id: int) -> dict[int, list[int]]:
-        job_extractor = self.job_extractor_factory()
-        return job_extractor.parent.job.result.slices[worker_id]
+    def get_device_test_gen(self) -> type[DeviceTestIterator]:
+        return self.device_major_test_gen if self.device_major else self.device_test_gen
+
+    def split_into_chunks(self, selector_devices: dict[int, list[int]]) -> Iterator[dict[int, list[int]]]:
+        """
+        Splits work unit into the chunks for the process pool.
+        In device major mode all the selectors of a device get into the same chunk
+        """
+        if not self.device_major:
+            for selector_id, device_ids in selector_devices.items():
+                for device_chunk in batched(device_ids, self.chunk_size):
+                    yield {selector_id: device_chunk}
+            return
+        device_selectors = group_by_device(selector_devices)
+        for device_chunk in batched(device_selectors.keys(), self.chunk_size):
+            chunk = defaultdict(list)
+            for device_id in device_chunk:
+                for selector_id in device_selectors[device_id]:
+                    chunk[selector_id].append(device_id)
+            yield dict(chunk)
+
+    def get_test_results_from_pool(
+        self, pool: Executor, executor: TestExecutor, selector_devices: dict[int, list[int]]
+    ) -> Iterator[ComplianceTestResult]:
+        for chunk_result in pool.map(_run_chunk, list(self.split_into_chunks(selector_devices))):
+            executor.results_passed += chunk_result.passed
+            executor.results_count += chunk_result.total
+            executor.results_reused += chunk_result.reused
+            executor.log.messages.extend(chunk_result.log)
+            yield from (ComplianceTestResult(**result) for result in chunk_result.results)
+
+    def process_work_queue(
+        self,
+        params: FullRunTestsParams,
+        worker_id: int,
+        run_unit: Callable[[dict[int, list[int]]], Iterator[ComplianceTestResult]],
+    ) -> None:
+        """
+        Takes the units from the shared work queue one by one.
+        Results of a unit are written within one transaction and only then the unit is acknowledged,
+        so the unit of a crashed worker is either fully saved or re-queued without any results in DB
+        """
+        write = self.get_results_writer()
+        for selector_devices, ack in self.work_queue.consume(params.job_id, worker_id):
+            write(run_unit(selector_devices))
+            ack()
+
+    def get_results_writer(self) -> Callable[[Iterable[ComplianceTestResult]], Any]:
+        if self.result_writer == "copy":
+            copy_writer = CopyResultWriter(
+                self.testresult_queryset.model, using=self.testresult_queryset.db, batch_size=self.result_batch_size
+            )
+            if copy_writer.supported:
+                return copy_writer
+        return partial(self.testresult_queryset.bulk_create, batch_size=self.result_batch_size)
 
     def save_results_to_db(self, results: Iterable[ComplianceTestResult]) -> None:
-        self.testresult_queryset.bulk_create(results, batch_size=self.result_batch_size)
+        write = self.get_results_writer()
+        if self.background_writer:
+            write = BackgroundWriter(write, batch_size=self.result_batch_size)
+        write(results)
@@ -20,6 +20,7 @@ from ..exceptions import AbortScript
 from ..keeper import JobKeeper
 from ..launch import Launcher
 from ..parent_jobs import JobExtractor
+from .work_queue import WorkQueue
 
 
 def enqueue(report: "ComplianceReport", request: "RequestInfo"):
@@ -38,6 +39,7 @@ class CombineWorker:
         default_factory=ComplianceReport.objects.annotate_result_stats().count_devices_and_tests
     )
     testresult_queryset: QuerySet[ComplianceTestResult] = field(default_factory=ComplianceTestResult.objects.all)
+    work_queue: Annotated[WorkQueue | None, "runtests_work_queue"] = None
 
     def fire_report_webhook(self, report_id: int, request: RequestInfo) -> None:
         report = self.report_queryset.get(pk=report_id)
@@ -78,6 +80,20 @@ class CombineWorker:
         if error_logs:
             raise AbortScript("ApplyWorkerError", status=JobStatusChoices.STATUS_ERRORED, logs=error_logs)
 
+    def abort_if_work_pending(self, params: FullRunTestsParams, job_extractor: JobExtractor) -> None:
+        """
+        Work units taken by a crashed worker stay in the queue, the results are incomplete in this case
+        """
+        if not job_extractor.parent.parent.job.result.use_work_queue:
+            return
+        pending_units = self.work_queue.pending(params.job_id, params.workers_num)
+        self.work_queue.clear(params.job_id, params.workers_num)
+        if pending_units:
+            raise AbortScript(
+                f"{pending_units} work unit(s) have not been processed, test results are incomplete",
+                status=JobStatusChoices.STATUS_ERRORED,
+            )
+
     def get_job_keeper(self, job: Job) -> JobKeeper:
         def error_callback(keeper, error):
             keeper.logger.info("Database changes have been reverted")
@@ -92,6 +108,7 @@ class CombineWorker:
         with self.get_job_keeper(netbox_job) as keeper:
             job_extractor = self.job_extractor_factory()
             self.abort_if_apply_errors(job_extractor)
+            self.abort_if_work_pending(params, job_extractor)
             self.fire_report_webhook(params.object_id, params.request)
             self.schedule_next_job(params, netbox_job)
             keeper.logger.messages = self.compose_logs(keeper.logger, job_extractor, params.object_id)
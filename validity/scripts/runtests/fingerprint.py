@@ -0,0 +1,76 @@
+import hashlib
+import json
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Iterable
+
+from validity.compliance.serialization import SerializationCache
+
+
+if TYPE_CHECKING:
+    from core.models import DataFile
+
+    from validity.models import ComplianceTest, NameSet, Serializer, VDevice
+
+
+class ResultFingerprint:
+    """
+    Computes fingerprint of (device, test) pair.
+    Fingerprint covers the contents of the Data Files which form device (and its dynamic pair) state,
+    serializer templates, device modification time, test expression, nameset definitions and explanation verbosity.
+    Equal fingerprints mean that test result can be reused instead of evaluating the test once again
+    """
+
+    def __init__(self, explanation_verbosity: int, global_namesets: Iterable["NameSet"]) -> None:
+        self.explanation_verbosity = explanation_verbosity
+        self.global_namesets = global_namesets
+        self._device_hashes = {}
+        self._test_hashes = {}
+        self._serializer_hashes = {}
+
+    @staticmethod
+    def _hash(*parts: Any) -> str:
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def data_file_id(data_file: "DataFile | None") -> tuple[str, str] | None:
+        return (data_file.path, data_file.hash) if data_file is not None else None
+
+    def serializer_hash(self, serializer: "Serializer | None") -> tuple[int, str] | None:
+        if serializer is None:
+            return None
+        if serializer.pk not in self._serializer_hashes:
+            self._serializer_hashes[serializer.pk] = (serializer.pk, SerializationCache.template_hash(serializer))
+        return self._serializer_hashes[serializer.pk]
+
+    def device_hash(self, device: "VDevice") -> str:
+        """
+        Hash of the Data Files and serializers device state is built from. State itself is not serialized
+        """
+        if device.pk not in self._device_hashes:
+            commands, config_item = device.state_sources
+            sources = [("config", config_item), *((f"command:{command.label}", command) for command in commands)]
+            items = sorted(
+                (
+                    (name, self.data_file_id(source.data_file), self.serializer_hash(source.serializer))
+                    for name, source in sources
+                ),
+                key=lambda item: item[0],
+            )
+            self._device_hashes[device.pk] = self._hash(device.pk, device.last_updated, items)
+        return self._device_hashes[device.pk]
+
+    def test_hash(self, test: "ComplianceTest") -> str:
+        if test.pk not in self._test_hashes:
+            all_namesets = chain(test.namesets.all(), self.global_namesets)
+            namesets = sorted((nameset.name, nameset.effective_definitions) for nameset in all_namesets)
+            self._test_hashes[test.pk] = self._hash(test.pk, test.effective_expression, namesets)
+        return self._test_hashes[test.pk]
+
+    def __call__(self, device: "VDevice", test: "ComplianceTest") -> str:
+        dynamic_pair = device.dynamic_pair
+        return self._hash(
+            self.device_hash(device),
+            self.device_hash(dynamic_pair) if dynamic_pair is not None else None,
+            self.test_hash(test),
+            self.explanation_verbosity,
+        )
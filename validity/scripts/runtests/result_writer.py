@@ -0,0 +1,106 @@
+import queue
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Iterable
+
+from django.db import connections, transaction
+from django.db.models import Field, Model
+
+from validity.utils.misc import batched
+
+
+@dataclass
+class CopyResultWriter:
+    """
+    Writes model instances into DB table via PostgreSQL "COPY ... FROM STDIN".
+    Field values are prepared the same way as in .bulk_create() (auto_now_add timestamps, JSON encoders, FK ids),
+    but no INSERT statement is built for the rows. Primary keys are not set on the written instances
+    """
+
+    model: type[Model]
+    using: str = "default"
+    batch_size: int = 500
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def supported(self) -> bool:
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        return self.connection.vendor == "postgresql" and is_psycopg3
+
+    @cached_property
+    def fields(self) -> list[Field]:
+        return [field for field in self.model._meta.concrete_fields if not field.primary_key]
+
+    @cached_property
+    def copy_statement(self) -> str:
+        quote = self.connection.ops.quote_name
+        columns = ", ".join(quote(field.column) for field in self.fields)
+        return f"COPY {quote(self.model._meta.db_table)} ({columns}) FROM STDIN"
+
+    def get_row(self, obj: Model) -> tuple:
+        return tuple(field.get_db_prep_save(field.pre_save(obj, add=True), self.connection) for field in self.fields)
+
+    def __call__(self, objs: Iterable[Model]) -> int:
+        """
+        Writes the objects batch by batch within one transaction, returns the number of written rows.
+        Rows are streamed in batches because the objects may be lazily produced by the code querying the same DB
+        """
+        row_count = 0
+        with transaction.atomic(using=self.using, savepoint=False):
+            for obj_batch in batched(objs, self.batch_size):
+                rows = [self.get_row(obj) for obj in obj_batch]
+                with self.connection.cursor() as cursor, cursor.copy(self.copy_statement) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                row_count += len(rows)
+        return row_count
+
+
+_STOP = object()
+
+
+@dataclass
+class BackgroundWriter:
+    """
+    Writes the objects batch by batch in a separate thread (with its own DB connection)
+    while the caller keeps producing the next batches.
+    The queue between the threads is bounded, so the producer waits if the writer falls behind.
+    Exception raised by the writer is re-raised in the calling thread
+    """
+
+    write: Callable[[list[Model]], Any]
+    batch_size: int = 500
+    max_pending_batches: int = 2
+
+    def _consume(self, batch_queue: queue.Queue, errors: list[Exception]) -> None:
+        try:
+            while (batch := batch_queue.get()) is not _STOP:
+                self.write(batch)
+        except Exception as exc:
+            errors.append(exc)
+            # keep draining the queue to never block the producer
+            while batch_queue.get() is not _STOP:
+                pass
+        finally:
+            connections.close_all()
+
+    def __call__(self, objs: Iterable[Model]) -> None:
+        batch_queue = queue.Queue(maxsize=self.max_pending_batches)
+        errors = []
+        writer = threading.Thread(target=self._consume, args=(batch_queue, errors), name="ResultWriter", daemon=True)
+        writer.start()
+        try:
+            for batch in batched(objs, self.batch_size):
+                if errors:
+                    break
+                batch_queue.put(batch)
+        finally:
+            batch_queue.put(_STOP)
+            writer.join()
+        if errors:
+            raise errors[0]
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from functools import partial
 from itertools import chain, cycle, groupby, repeat
-from typing import Any, Callable, Collection, Iterable, Protocol
+from typing import Annotated, Any, Callable, Collection, Iterable, Protocol
 
 from core.models import Job
 from dimi import Singleton
@@ -9,12 +9,14 @@ from django.db.models import Q, QuerySet
 
 from validity import di
 from validity.models import BackupPoint, ComplianceSelector, VDataSource, VDevice
+from validity.settings import WorkStealingSettings
 from validity.utils.bulk import bulk_backup, datasource_sync
 from validity.utils.logger import Logger
 from validity.utils.misc import batched, md_link
 from ..data_models import FullRunTestsParams, SplitResult
 from ..exceptions import AbortScript
 from ..keeper import JobKeeper
+from .work_queue import WorkQueue
 
 
 class BackupFn(Protocol):
@@ -37,6 +39,10 @@ class SplitWorker:
     backup_queryset: QuerySet[BackupPoint] = field(
         default_factory=BackupPoint.objects.filter(backup_after_sync=True).all
     )
+    work_stealing: Annotated[WorkStealingSettings, "validity_settings.work_stealing"] = field(
+        default_factory=WorkStealingSettings
+    )
+    work_queue: Annotated[WorkQueue | None, "runtests_work_queue"] = None
 
     def datasources_to_sync(self, overriding_datasource: int | None, device_filter: Q) -> QuerySet[VDataSource]:
         if overriding_datasource:
@@ -100,13 +106,7 @@ class SplitWorker:
                 slice[selector].extend(devices)
         return slices
 
-    def distribute_work(
-        self, params: FullRunTestsParams, logger: Logger, device_filter: Q
-    ) -> list[dict[int, list[int]]]:
-        """
-        Split all the devices under test into N slices where N is the number of workers
-        Returns list of {selector_id: [device_id_1, device_id_2, ...]}
-        """
+    def count_devices_per_worker(self, params: FullRunTestsParams, logger: Logger, device_filter: Q) -> int:
         device_count = self.device_queryset.filter(device_filter).count()
         if not (devices_per_worker := device_count // params.workers_num):
             raise AbortScript(
@@ -119,7 +119,16 @@ class SplitWorker:
                 f"Distributing the work among {params.workers_num} workers. "
                 f"Each worker handles {devices_per_worker} device(s) in average"
             )
+        return devices_per_worker
 
+    def distribute_work(
+        self, params: FullRunTestsParams, logger: Logger, device_filter: Q
+    ) -> list[dict[int, list[int]]]:
+        """
+        Split all the devices under test into N slices where N is the number of workers
+        Returns list of {selector_id: [device_id_1, device_id_2, ...]}
+        """
+        devices_per_worker = self.count_devices_per_worker(params, logger, device_filter)
         slices = [*self._work_slices(params.selector_qs, params.devices, devices_per_worker)]
 
         # distribute leftovers among other slices
@@ -127,6 +136,18 @@ class SplitWorker:
             slices = self._eliminate_leftovers(slices, params.workers_num)
         return slices
 
+    def use_work_queue(self, params: FullRunTestsParams) -> bool:
+        return self.work_stealing.enabled and self.work_queue is not None and params.workers_num > 1
+
+    def enqueue_work(self, params: FullRunTestsParams, logger: Logger, device_filter: Q) -> None:
+        """
+        Puts the devices under test into the shared queue, apply workers will take them from there in small units
+        """
+        self.count_devices_per_worker(params, logger, device_filter)
+        units = self._work_slices(params.selector_qs, params.devices, self.work_stealing.unit_size)
+        unit_count = self.work_queue.push(params.job_id, units)
+        logger.info(f"{unit_count} work unit(s) of up to {self.work_stealing.unit_size} devices have been queued")
+
     def __call__(self, params: FullRunTestsParams) -> SplitResult:
         job = params.get_job()
         with self.jobkeeper_factory(job) as keeper:
@@ -135,5 +156,9 @@ class SplitWorker:
             if params.sync_datasources:
                 datasources = self.sync_datasources(params.overriding_datasource, device_filter, keeper.logger)
                 self.backup_datasources(datasources, keeper.logger)
-            slices = self.distribute_work(params, keeper.logger, device_filter)
-            return SplitResult(log=keeper.logger.messages, slices=slices)
+            slices = []
+            if use_work_queue := self.use_work_queue(params):
+                self.enqueue_work(params, keeper.logger, device_filter)
+            else:
+                slices = self.distribute_work(params, keeper.logger, device_filter)
+            return SplitResult(log=keeper.logger.messages, slices=slices, use_work_queue=use_work_queue)
@@ -0,0 +1,88 @@
+import json
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Iterable, Iterator
+
+from redis import Redis
+
+from validity.utils.misc import batched
+
+
+@dataclass
+class WorkQueue:
+    """
+    Redis list of work units shared between the apply workers of one RunTests job.
+    Each unit is {selector_id: [device_id_1, device_id_2, ...]}, workers take the units until the list is empty.
+    Taken unit stays in the worker's processing list until the worker saves its results,
+    so the units of the crashed worker are not lost: they are either re-queued by the restarted worker
+    or reported as pending
+    """
+
+    connection: Redis
+    key_prefix: str = "validity:runtests:work"
+    ttl: int = 24 * 60 * 60
+    push_batch_size: int = 500
+
+    def key(self, job_id: int) -> str:
+        return f"{self.key_prefix}:{job_id}"
+
+    def processing_key(self, job_id: int, worker_id: int) -> str:
+        return f"{self.key(job_id)}:processing:{worker_id}"
+
+    def push(self, job_id: int, units: Iterable[dict[int, list[int]]]) -> int:
+        """
+        Puts the work units into the queue, returns the number of units
+        """
+        key = self.key(job_id)
+        unit_count = 0
+        with self.connection.pipeline() as pipe:
+            pipe.delete(key)
+            for unit_batch in batched(units, self.push_batch_size):
+                pipe.rpush(key, *(json.dumps(list(unit.items())) for unit in unit_batch))
+                unit_count += len(unit_batch)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        return unit_count
+
+    def requeue(self, job_id: int, worker_id: int) -> int:
+        """
+        Puts the units left unfinished by the previous run of the worker back to the queue
+        """
+        requeued = 0
+        while self.connection.lmove(self.processing_key(job_id, worker_id), self.key(job_id), "RIGHT", "LEFT"):
+            requeued += 1
+        return requeued
+
+    def pop(self, job_id: int, worker_id: int) -> bytes | None:
+        processing_key = self.processing_key(job_id, worker_id)
+        raw_unit = self.connection.lmove(self.key(job_id), processing_key, "LEFT", "RIGHT")
+        if raw_unit is not None:
+            self.connection.expire(processing_key, self.ttl)
+        return raw_unit
+
+    def done(self, job_id: int, worker_id: int, raw_unit: bytes) -> None:
+        self.connection.lrem(self.processing_key(job_id, worker_id), 1, raw_unit)
+
+    def consume(self, job_id: int, worker_id: int) -> Iterator[tuple[dict[int, list[int]], Callable[[], None]]]:
+        """
+        Yields (unit, ack) pairs one by one. The unit stays in the processing list until ack() is called,
+        so ack() must be called only after the results of the unit are saved
+        """
+        self.requeue(job_id, worker_id)
+        while (raw_unit := self.pop(job_id, worker_id)) is not None:
+            yield dict(json.loads(raw_unit)), partial(self.done, job_id, worker_id, raw_unit)
+
+    def pending(self, job_id: int, workers_num: int) -> int:
+        """
+        Returns the number of units which are still queued or were not finished by any worker
+        """
+        with self.connection.pipeline() as pipe:
+            pipe.llen(self.key(job_id))
+            for worker_id in range(workers_num):
+                pipe.llen(self.processing_key(job_id, worker_id))
+            return sum(pipe.execute())
+
+    def clear(self, job_id: int, workers_num: int) -> None:
+        self.connection.delete(
+            self.key(job_id), *(self.processing_key(job_id, worker_id) for worker_id in range(workers_num))
+        )
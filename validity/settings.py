@@ -58,16 +58,60 @@ class IntegrationSettings(BaseModel):
 class CustomQueueSettings(BaseModel):
     runtests: str = "default"
     backup: str = "default"
+    selector_index: str = "default"
+
+
+class SerializationCacheSettings(BaseModel):
+    backend: Literal["none", "django", "disk"] = "none"
+    django_cache: str = "default"
+    timeout: int = Field(default=86400, ge=1)
+    directory: str = ""
+    max_size: int = Field(default=1024**3, ge=1)
+    max_item_size: int = Field(default=10 * 1024**2, ge=1)
+
+    @model_validator(mode="after")
+    def check_directory(self):
+        if self.backend == "disk" and not self.directory:
+            raise ValueError('"directory" must be set for "disk" backend')
+        return self
+
+
+class WorkStealingSettings(BaseModel):
+    enabled: bool = False
+    unit_size: int = Field(default=50, ge=1)
+
+
+class SessionPoolSettings(BaseModel):
+    enabled: bool = False
+    max_size: int = Field(default=100, ge=1)
+    idle_timeout: int = Field(default=300, ge=1)
+
+
+class CircuitBreakerSettings(BaseModel):
+    enabled: bool = False
+    django_cache: str = "default"
+    failure_threshold: int = Field(default=3, ge=1)
+    probe_interval: int = Field(default=3600, ge=1)
 
 
 class ValiditySettings(BaseModel):
     store_reports: int = Field(default=5, gt=0, lt=1001)
     result_batch_size: int = Field(default=500, ge=1)
+    result_writer: Literal["bulk_create", "copy"] = "bulk_create"
+    background_result_writer: bool = False
     polling_threads: int = Field(default=500, ge=1)
+    polling_async_sessions: int = Field(default=1000, ge=1)
+    polling_session_pool: SessionPoolSettings = SessionPoolSettings()
+    polling_circuit_breaker: CircuitBreakerSettings = CircuitBreakerSettings()
+    apply_processes: int = Field(default=1, ge=1)
+    apply_chunk_size: int = Field(default=100, ge=1)
+    apply_device_major: bool = False
+    work_stealing: WorkStealingSettings = WorkStealingSettings()
     custom_queues: CustomQueueSettings = CustomQueueSettings()
     script_timeouts: ScriptTimeouts = ScriptTimeouts()
     custom_pollers: list[PollerInfo] = []
     integrations: IntegrationSettings = IntegrationSettings()
+    serialization_cache: SerializationCacheSettings = SerializationCacheSettings()
     top_level_menu: bool = True
 
     @model_validator(mode="before")
@@ -78,6 +122,13 @@ class ValiditySettings(BaseModel):
             values["custom_queues"].setdefault("runtests", runtests_queue)
         return values
 
+    @model_validator(mode="after")
+    def check_background_writer(self):
+        # process pool is forked while the writer thread may hold DB connection or queue locks
+        if self.background_result_writer and self.apply_processes > 1:
+            raise ValueError("background_result_writer can't be used together with apply_processes > 1")
+        return self
+
 
 class ValiditySettingsMixin:
     @property
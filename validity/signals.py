@@ -1,8 +1,18 @@
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cached_property, partial
+from typing import Iterator
+
 from core.signals import post_sync
-from django.db.models.signals import pre_delete
+from dcim.models import Device, DeviceType
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from extras.models import TaggedItem
 
-from validity.models import BackupPoint, ComplianceReport
+from validity import di
+from validity.models import BackupPoint, ComplianceReport, ComplianceSelector, Serializer, VDevice
 from validity.utils.bulk import bulk_backup
 
 
@@ -16,3 +26,149 @@ def backup_datasource(sender, instance, **kwargs):
     if getattr(instance, "permit_backup", True):
         backup_points = BackupPoint.objects.filter(backup_after_sync=True, data_source=instance)
         bulk_backup(backup_points)
+
+
+@receiver([post_save, post_delete], sender=Serializer)
+def invalidate_serialization_cache(sender, instance, **kwargs):
+    if (cache := di["serialization_cache"]) is not None:
+        cache.invalidate(instance.pk)
+
+
+def indexed_selectors():
+    return ComplianceSelector.objects.filter(membership_indexed=True)
+
+
+def refresh_selector_index(selector_ids: list[int], device_ids: list[int]) -> None:
+    """
+    RQ job which brings membership index up to date after the changes are committed:
+        - selector_ids are fully re-evaluated
+        - device_ids are re-evaluated against the rest of the indexed selectors
+    """
+    ComplianceSelector.objects.filter(pk__in=selector_ids).refresh_membership()
+    if device_ids:
+        indexed_selectors().exclude(pk__in=selector_ids).refresh_membership(device_ids)
+
+
+@dataclass
+class PendingIndexRefresh:
+    selector_ids: set[int] = field(default_factory=set)
+    device_ids: set[int] = field(default_factory=set)
+
+    @cached_property
+    def has_indexed_selectors(self) -> bool:
+        # device changes are worth collecting only if some selector is indexed, checked once per transaction
+        return indexed_selectors().exists()
+
+    def enqueue(self) -> None:
+        if not self.selector_ids and not self.device_ids:
+            return
+        queue = di["launcher_factory"].get_queue(di["validity_settings"].custom_queues.selector_index)
+        queue.enqueue(
+            refresh_selector_index,
+            selector_ids=sorted(self.selector_ids),
+            device_ids=sorted(self.device_ids),
+        )
+
+
+_pending = threading.local()
+
+
+def _enqueue_pending_refresh() -> None:
+    if (pending := getattr(_pending, "refresh", None)) is not None:
+        del _pending.refresh
+        pending.enqueue()
+
+
+def _awaits_commit(connection) -> bool:
+    # on_commit callbacks are dropped by Django when the transaction (or savepoint) is rolled back
+    return any(callback[1] is _enqueue_pending_refresh for callback in connection.run_on_commit)
+
+
+@contextmanager
+def pending_index_refresh() -> Iterator[PendingIndexRefresh]:
+    """
+    Collects all the index changes made within the current transaction, one RQ job is enqueued on commit.
+    The on_commit callback is registered only once, when the first change of the transaction is collected.
+    The changes left by the rolled back transaction are discarded together with its callback
+    """
+    pending = getattr(_pending, "refresh", None)
+    if created := pending is None or not _awaits_commit(transaction.get_connection()):
+        pending = _pending.refresh = PendingIndexRefresh()
+    yield pending
+    if created:
+        transaction.on_commit(_enqueue_pending_refresh)
+
+
+@receiver(post_save, sender=ComplianceSelector)
+def refresh_selector_membership(sender, instance, raw=False, **kwargs):
+    if not raw:
+        with pending_index_refresh() as pending:
+            pending.selector_ids.add(instance.pk)
+
+
+filter_fields = [m2m for m2m in ComplianceSelector._meta.many_to_many if m2m.name.endswith("_filter")]
+
+
+def referencing_selector_ids(filter_field, filter_value) -> list[int]:
+    return list(indexed_selectors().filter(**{filter_field.name: filter_value}).values_list("pk", flat=True))
+
+
+def refresh_selector_membership_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            with pending_index_refresh() as pending:
+                pending.selector_ids.add(instance.pk)
+    elif action in {"post_add", "post_remove"}:
+        with pending_index_refresh() as pending:
+            pending.selector_ids.update(pk_set)
+    elif action == "pre_clear":
+        filter_field = next(m2m for m2m in filter_fields if m2m.remote_field.through is sender)
+        if selector_ids := referencing_selector_ids(filter_field, instance):
+            with pending_index_refresh() as pending:
+                pending.selector_ids.update(selector_ids)
+
+
+for filter_field in filter_fields:
+    m2m_changed.connect(refresh_selector_membership_m2m, sender=filter_field.remote_field.through)
+
+
+@receiver(post_save, sender=Device)
+@receiver(post_save, sender=VDevice)
+def refresh_device_membership(sender, instance, raw=False, **kwargs):
+    if not raw:
+        with pending_index_refresh() as pending:
+            if pending.has_indexed_selectors:
+                pending.device_ids.add(instance.pk)
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def refresh_device_membership_tags(sender, instance, action, reverse, **kwargs):
+    if action in {"post_add", "post_remove", "post_clear"} and isinstance(instance, Device):
+        with pending_index_refresh() as pending:
+            if pending.has_indexed_selectors:
+                pending.device_ids.add(instance.pk)
+
+
+@receiver(post_save, sender=DeviceType)
+def refresh_device_type_membership(sender, instance, raw=False, **kwargs):
+    # selectors may filter devices by manufacturer of the device type
+    if not raw:
+        with pending_index_refresh() as pending:
+            if pending.has_indexed_selectors:
+                pending.device_ids.update(Device.objects.filter(device_type=instance).values_list("pk", flat=True))
+
+
+def refresh_membership_on_filter_delete(sender, instance, filter_field, **kwargs):
+    # deletion of a filter value changes selector filters without any m2m_changed signal,
+    # referencing selectors are collected before the m2m rows are deleted
+    if selector_ids := referencing_selector_ids(filter_field, instance):
+        with pending_index_refresh() as pending:
+            pending.selector_ids.update(selector_ids)
+
+
+for filter_field in filter_fields:
+    pre_delete.connect(
+        partial(refresh_membership_on_filter_delete, filter_field=filter_field),
+        sender=filter_field.related_model,
+        weak=False,
+    )
@@ -149,8 +149,21 @@ class SerializerBaseForm(BaseSubform):
 
 class XMLSerializerForm(SerializerBaseForm):
     drop_attributes = forms.BooleanField(label=_("Drop XML Attributes"), initial=False, required=False)
+    element_paths = forms.JSONField(
+        label=_("Element Paths"),
+        required=False,
+        help_text=_('List of element paths to keep, e.g. ["rpc-reply/data/interfaces"]. Empty value keeps everything'),
+    )
     requires_template = False
 
+    def clean_element_paths(self):
+        element_paths = self.cleaned_data.get("element_paths")
+        if element_paths is None:
+            return element_paths
+        if not isinstance(element_paths, list) or not all(isinstance(path, str) and path for path in element_paths):
+            raise forms.ValidationError(_("Value must be a list of non-empty strings"))
+        return element_paths
+
 
 class TTPSerializerForm(SerializerBaseForm):
     requires_template = True
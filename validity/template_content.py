@@ -15,7 +15,9 @@ class PollingInfoExtension(PluginTemplateExtension):
         if not data_file:
             return _("No polling info yet.")
         polling_info = PollingInfo.model_validate(yaml.safe_load(data_file.data_as_string))
-        return yaml.safe_dump(polling_info.model_dump(exclude={"errors"}))
+        return yaml.safe_dump(
+            polling_info.model_dump(exclude={"errors", "skipped_devices"}, exclude_none=True), sort_keys=False
+        )
 
     def right_page(self):
         if self.context["object"].type != "device_polling":
@@ -26,6 +26,23 @@ from validity.utils.orm import CustomFieldBuilder
 pytest.register_assert_rewrite("base")
 
 
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", default=False, help="run the tests marked as benchmark")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing comparison, runs only with --benchmark option")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark, use --benchmark option to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture
 def tests_root():
     return Path(validity.__file__).parent.absolute() / "tests"
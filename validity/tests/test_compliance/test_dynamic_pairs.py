@@ -57,3 +57,26 @@ def test_tag_filter():
     device.tags.set([tags[0], tags[2]])
     filter_ = DynamicPairTagFilter(selector, device).filter
     assert repr(filter_) == repr(Q(tags__in=Tag.objects.filter(slug="tag-1")))
+
+
+@pytest.mark.parametrize(
+    "selector_kwargs",
+    [
+        pytest.param({"dynamic_pairs": "NAME", "name_filter": "sw([0-9]+)-[ab]"}, id="NAME"),
+        pytest.param({"dynamic_pairs": "TAG", "dp_tag_prefix": "pair-", "name_filter": ".*"}, id="TAG"),
+        pytest.param({"dynamic_pairs": "NO", "name_filter": ".*"}, id="NO"),
+    ],
+)
+@pytest.mark.django_db
+def test_bulk_resolver(selector_kwargs):
+    devices = [DeviceFactory(name=name) for name in ["sw1-a", "sw1-b", "sw2-a", "sw3-a", "sw3-b", "sw3-c"]]
+    tags = [TagFactory(name=name, slug=name) for name in ["pair-1", "pair-3", "other"]]
+    for device, device_tags in zip(devices, [[0], [0, 2], [2], [1], [1], []]):
+        device.tags.set([tags[i] for i in device_tags])
+    selector = SelectorFactory(**selector_kwargs)
+    device_qs = selector.devices.prefetch_datasource().prefetch_poller()
+    expected = {device.name: getattr(device.dynamic_pair, "name", None) for device in device_qs}
+    assert any(expected.values()) == (selector.dynamic_pairs != "NO")
+    bulk_devices = device_qs.all().prefetch_dynamic_pairs()
+    resolved = {device.name: getattr(device.dynamic_pair, "name", None) for device in bulk_devices}
+    assert resolved == expected
@@ -1,12 +1,20 @@
 import ast
 import json
 import operator
+import time
 from contextlib import nullcontext
 
 import pytest
 from deepdiff.serialization import json_dumps
 
-from validity.compliance.eval import ExplanationalEval, default_nameset, eval_defaults
+from validity.compliance.eval import (
+    CompiledEval,
+    ExplanationalEval,
+    compile_expression,
+    default_nameset,
+    eval_defaults,
+    parse_expression,
+)
 from validity.compliance.exceptions import EvalError
 
 
@@ -113,3 +121,126 @@ def test_dict_comp(expression, result):
 def test_set_comp(expression, result):
     ev = ExplanationalEval(functions={"range": range})
     assert ev.eval(expression) == result
+
+
+def test_parse_expression_cache():
+    expression = "a + 1 == 11 and a * 2 == 20"
+    parse_expression.cache_clear()
+    for a in range(10, 13):
+        ExplanationalEval(names={"a": a}).eval(expression)
+    assert parse_expression.cache_info().misses == 1
+    assert parse_expression.cache_info().hits == 2
+    parsed = parse_expression(expression)
+    assert ExplanationalEval(names={"a": 10}).eval(expression, previously_parsed=parsed) is True
+
+
+BENCHMARK_EXPRESSION = (
+    "device.name.startswith('dev') and all(i.mtu >= 1500 for i in device.interfaces) "
+    "and {i.name for i in device.interfaces} >= {'eth0'} and jq.first('.[0].mtu', device.interfaces) == 1500"
+)
+
+
+@pytest.mark.benchmark
+def test_parse_vs_eval_benchmark():
+    """
+    Time spent on parsing vs evaluation of one test expression against 1k devices
+    """
+    names = [{"device": DIFF_NAMES["device"] | {"name": f"dev{i}"}} for i in range(1000)]
+    parse_expression.cache_clear()
+
+    start = time.perf_counter()
+    cached_results = [ExplanationalEval(names=n, load_defaults=True).eval(BENCHMARK_EXPRESSION) for n in names]
+    cached_time = time.perf_counter() - start
+    assert (parse_expression.cache_info().hits, parse_expression.cache_info().misses) == (999, 1)
+
+    start = time.perf_counter()
+    for _ in names:
+        parse_expression.__wrapped__(BENCHMARK_EXPRESSION)
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    uncached_results = []
+    for n in names:
+        parse_expression.cache_clear()
+        uncached_results.append(ExplanationalEval(names=n, load_defaults=True).eval(BENCHMARK_EXPRESSION))
+    uncached_time = time.perf_counter() - start
+
+    assert cached_results == uncached_results == [True] * len(names)
+    assert cached_time < uncached_time
+    assert parse_time < uncached_time
+
+
+DIFF_NAMES = {
+    "device": {"name": "dev1", "interfaces": [{"name": "eth0", "mtu": 1500}, {"name": "eth1", "mtu": 9000}]},
+    "num": 7,
+}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "5 + 5 == 10",
+        EXPR_1,
+        EXPR_2,
+        JQ_EXPR,
+        "1 < num < 10",
+        "1 < num < 5 < undefined_name",
+        "device.name == 'dev1' and device['name'] == 'dev1'",
+        "[i.mtu for i in device.interfaces if i.mtu > 1500]",
+        "all(i.mtu >= 1500 for i in device.interfaces)",
+        "{i.name: i.mtu for i in device.interfaces}",
+        "{(a, b) for a, b in [(1, 2), (3, 4)]}",
+        "f'{device.name}-{num:03d}'",
+        "-num if not num % 2 else ~num",
+        "num ** 2 // 3 | 1 & 5",
+        "device.unknown_attr",
+        "device.__class__",
+        "num.real.__class__",
+        "undefined_func(1)",
+        "undefined_name",
+        "[*device.interfaces, 1][2]",
+        "(lambda: 1)()",
+        "some invalid syntax",
+        "def f(): pass",
+        "len([i for i in range(100_001)])",
+        "jq.first('.[0].mtu', device.interfaces) == 1500",
+    ],
+)
+def test_compiled_eval(expression):
+    def evaluate(evaluator_cls):
+        evaluator = evaluator_cls(names=DIFF_NAMES, load_defaults=True, verbosity=0)
+        try:
+            return evaluator.eval(expression), None
+        except EvalError as e:
+            return None, type(e.orig_error)
+
+    assert evaluate(CompiledEval) == evaluate(ExplanationalEval)
+
+
+def test_compiled_eval_inner_name_error():
+    def broken_helper():
+        return undefined_inside_helper  # noqa: F821
+
+    def evaluate(evaluator_cls):
+        evaluator = evaluator_cls(names=DIFF_NAMES, functions={"broken_helper": broken_helper}, verbosity=0)
+        with pytest.raises(EvalError) as exc_info:
+            evaluator.eval("broken_helper()")
+        return type(exc_info.value.orig_error), str(exc_info.value)
+
+    assert evaluate(CompiledEval) == evaluate(ExplanationalEval)
+    assert evaluate(CompiledEval)[0] is NameError
+
+
+@pytest.mark.parametrize(
+    "expression, compiled",
+    [
+        ("1 < num < 10 and device.name == 'dev1'", True),
+        ("[i.mtu for i in device.interfaces]", True),
+        ("f'{num}'", True),
+        ("device.__class__", False),
+        ("(lambda: 1)()", False),
+        ("def f(): pass", False),
+    ],
+)
+def test_compile_expression(expression, compiled):
+    assert (compile_expression(expression) is not None) == compiled
@@ -0,0 +1,208 @@
+import io
+import random
+import re
+import time
+
+import pytest
+
+from validity.compliance.serialization.routeros import LineParsingError, ParsedLine, parse_config
+from validity.utils.misc import reraise
+
+
+# Reference implementation: the original character-by-character parser
+
+
+def non_quoted_characters(line: str):
+    quote_open = False
+    quote_start = -1
+    for i, char in enumerate(line):
+        if char == '"' and (not i or line[i - 1] != "\\"):
+            quote_open = not quote_open
+            if quote_open:
+                quote_start = i
+            else:
+                yield i, line[quote_start : i + 1]
+            continue
+        if quote_open:
+            continue
+        yield i, char
+
+
+class ReferenceParsedLine(ParsedLine):
+    @staticmethod
+    def _replace_line_breaks(line: str) -> str:
+        drop_match = re.compile(r"\\\n +")
+        new_line = []
+        backslash_seq = []
+        for char in line:
+            if char == "\\" or char in {"\n", " "} and backslash_seq:
+                backslash_seq.append(char)
+                continue
+            if not drop_match.fullmatch("".join(backslash_seq)):
+                new_line.extend(backslash_seq)
+            backslash_seq = []
+            new_line.append(char)
+        return "".join(new_line)
+
+    @staticmethod
+    def _transform_value(key: str, value: str) -> str | int | bool:
+        if value and len(value) > 2 and value[0] == '"' and value[-1] == '"':
+            value = value[1:-1]
+        if key in {"name", "comment"}:
+            return value
+        if value.isdigit():
+            return int(value)
+        booleans = {"yes": True, "no": False}
+        if value in booleans:
+            return booleans[value]
+        return value
+
+    @classmethod
+    def from_plain_text(cls, line: str) -> "ParsedLine":
+        method, line = line.split(maxsplit=1)
+        if method not in {"add", "set"}:
+            raise LineParsingError("Unknown line")
+        find = ()
+        if line.startswith("["):
+            find, line = cls._extract_find(line)
+        properties = {}
+        sub_start = 0
+        implicit_name = False
+        line = cls._replace_line_breaks(line).strip()
+        for char_num, char in non_quoted_characters(line + " "):
+            if char == " ":
+                kvline = line[sub_start:char_num].strip(" \n")
+                if kvline and "=" not in kvline:
+                    kvline = "name=" + kvline
+                    implicit_name = True
+                with reraise(ValueError, LineParsingError, f'"{kvline}" cannot be split into key/value'):
+                    key, value = kvline.split("=", maxsplit=1)
+                properties[key] = cls._transform_value(key, value)
+                sub_start = char_num + 1
+        return cls(method=method, find_by=find, properties=properties, implicit_name=implicit_name)
+
+
+def reference_parse_config(plain_config: str) -> dict:
+    result = {}
+    context_path = []
+    prevlines = []
+    cfgfile = io.StringIO(plain_config, newline=None)
+    for line_num, line in enumerate(cfgfile, start=1):
+        if line.startswith(("#", ":")) or line == "\n":
+            continue
+        if line.startswith("/"):
+            context_path = line[1:-1].split()
+            continue
+        if line.endswith("\\\n"):
+            prevlines.append(line)
+            continue
+        if prevlines:
+            line = "".join(prevlines) + line
+            prevlines = []
+        try:
+            parsed_line = ReferenceParsedLine.from_plain_text(line)
+        except LineParsingError as e:
+            e.args = (e.args[0] + f", config line {line_num}",) + e.args[1:]
+            raise
+        current_context = result
+        for key in context_path:
+            try:
+                current_context = current_context[key]
+            except KeyError:
+                current_context[key] = {}
+                current_context = current_context[key]
+        if parsed_line.find_by or parsed_line.method == "add" or parsed_line.implicit_name:
+            if "values" not in current_context:
+                current_context["values"] = []
+            current_context["values"].append(parsed_line.properties)
+            if parsed_line.find_by:
+                current_context["values"][-1]["find_by"] = [
+                    {"key": parsed_line.find_by[0], "value": parsed_line.find_by[1]}
+                ]
+        else:
+            current_context["properties"] = parsed_line.properties
+    return result
+
+
+def parsing_outcome(parse_fn, config: str):
+    try:
+        return "ok", parse_fn(config)
+    except Exception as e:
+        # str() is not compared: the reference wraps empty key/value error into the original ValueError text
+        return "error", type(e), e.args
+
+
+def random_config(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(1, 15)):
+        if rng.random() < 0.15:
+            path = rng.choices(["ip", "address", "interface", "system", "properties"], k=rng.randint(0, 2))
+            lines.append("/" + " ".join(path))
+            continue
+        parts = [rng.choice(["add", "set", "add", "set", "remove", "# comment"])]
+        if rng.random() < 0.3:
+            find_value = rng.choice(["ether1", '"my x"', "5"])
+            parts.append(f"[ find {rng.choice(['name', 'default-name'])}={find_value} ]")
+        for _ in range(rng.randint(0, 5)):
+            value = rng.choice(
+                ["1", "yes", "no", "abc", '"a b c"', '""', '"x\\"y"', "a\\\n    b", '"long \\\n    value"', '"unclosed']
+            )
+            key = rng.choice(["name", "comment", "address", "disabled", "find_by"])
+            parts.append(f"{key}={value}" if rng.random() < 0.9 else value)
+        lines.append(rng.choice([" ", " ", " \\\n    ", "  "]).join(parts))
+    return "\n".join(lines) + rng.choice(["", "\n", "\\", "\r\n"])
+
+
+def random_text(rng: random.Random) -> str:
+    tokens = ["a", "=", " ", '"', "\\", "\n", "\\\n    ", "yes", "12", "[", "]", "find", "name", "add ", "set ", "/ip "]
+    return "".join(rng.choice(tokens) for _ in range(rng.randint(0, 60)))
+
+
+def test_differential():
+    rng = random.Random(0)
+    for i in range(5000):
+        config = random_config(rng) if i % 2 else random_text(rng)
+        assert parsing_outcome(parse_config, config) == parsing_outcome(reference_parse_config, config), config
+
+
+def synthetic_export(sections: int) -> str:
+    lines = ["# 2024-01-01 00:00:00 by RouterOS 7.12", "# software id = ABCD-1234"]
+    for i in range(sections):
+        lines += [
+            f"/interface vlan{i % 50}",
+            f'set [ find default-name=ether{i} ] comment="uplink to core {i}" disabled=no mtu=1500',
+            f'add interface=ether{i} name=vlan{i} vlan-id={i % 4094} comment="customer \\\n    vlan {i}"',
+            f"add address=10.{i % 250}.{i % 200}.1/24 interface=vlan{i} network=10.{i % 250}.{i % 200}.0",
+            "set max-neighbor-entries=8192 accept-redirects=yes",
+            f"add chain=forward action=accept src-address=10.0.{i % 250}.0/24 \\\n"
+            "    dst-address=192.168.0.0/16 protocol=tcp dst-port=22,80,443 log=no",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def test_empty_property():
+    with pytest.raises(LineParsingError) as exc_info:
+        parse_config("/interface\nset a=1  b=2")
+    assert str(exc_info.value) == '"" cannot be split into key/value, config line 2'
+
+
+def test_parse_synthetic_export():
+    config = synthetic_export(50)
+    assert parse_config(config) == reference_parse_config(config)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("sections", [1000, 10000])
+def test_parse_config_benchmark(sections):
+    """
+    Parsing time of large synthetic exports (6 config lines per section) compared to the reference implementation
+    """
+    config = synthetic_export(sections)
+    start = time.perf_counter()
+    result = parse_config(config)
+    parse_time = time.perf_counter() - start
+    start = time.perf_counter()
+    reference_result = reference_parse_config(config)
+    reference_time = time.perf_counter() - start
+    assert result == reference_result
+    assert parse_time < reference_time
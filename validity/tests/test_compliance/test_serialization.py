@@ -1,11 +1,27 @@
 import json
+import time
+from functools import partial
 from unittest.mock import Mock
 
 import pytest
+import xmltodict
 import yaml
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
 
-from validity.compliance.serialization import serialize
+from validity.compliance.exceptions import SerializationError
+from validity.compliance.serialization import (
+    DiskSerializationCache,
+    DjangoSerializationCache,
+    SerializationBackend,
+    serialize,
+)
+from validity.compliance.serialization import textfsm as textfsm_module
+from validity.compliance.serialization import ttp as ttp_module
 from validity.compliance.serialization.common import postprocess_jq
+from validity.compliance.serialization.xml import serialize_xml
+from validity.compliance.serialization.yaml import serialize_yaml
+from validity.utils.json import transform_json
 
 
 JSON_CONFIG = """
@@ -168,3 +184,285 @@ def test_postprocess_jq(serialized_data, jq_expression, expected_result):
     json_data = json.dumps(serialized_data)
     result = serialization_method(json_data, "", {"jq_expression": jq_expression})
     assert result == expected_result
+
+
+@pytest.fixture(params=["django", "disk"])
+def serialization_cache(request, tmp_path):
+    if request.param == "django":
+        # LocMemCache instances with the same name share the storage
+        cache = LocMemCache(request.node.nodeid, {})
+        return DjangoSerializationCache(cache, timeout=60, max_item_size=1000)
+    return DiskSerializationCache(str(tmp_path), max_size=10000, max_item_size=1000)
+
+
+def test_serialization_cache(serialization_cache):
+    extraction_method = Mock(return_value={"some": "value"})
+    backend = SerializationBackend(extraction_methods={"YAML": extraction_method}, cache=serialization_cache)
+    serializer = Mock(pk=1, extraction_method="YAML", effective_template="", parameters={})
+    assert backend(serializer, "data", "hash1") == {"some": "value"}
+    assert backend(serializer, "data", "hash1") == {"some": "value"}
+    extraction_method.assert_called_once()
+    backend(serializer, "data2", "hash2")
+    serializer.parameters = {"jq_expression": ".some"}
+    backend(serializer, "data", "hash1")
+    assert extraction_method.call_count == 3
+    assert (serialization_cache.hits, serialization_cache.misses) == (1, 3)
+
+
+def test_serialization_cache_invalidate(serialization_cache):
+    serializer = Mock(pk=1, extraction_method="YAML", effective_template="", parameters={})
+    key = serialization_cache.get_key(serializer, "hash1")
+    serialization_cache.set(key, [1, 2, 3])
+    serialization_cache.set(serialization_cache.get_key(serializer, "hash2"), "x" * 2000)
+    assert serialization_cache.get(key) == [1, 2, 3]
+    assert serialization_cache.get(serialization_cache.get_key(serializer, "hash2"), None) is None
+    serialization_cache.invalidate(serializer.pk)
+    if isinstance(serialization_cache, DiskSerializationCache):
+        assert serialization_cache.get(key, None) is None
+
+
+def test_disk_cache_directory(tmp_path):
+    directory = tmp_path / "cache"
+    DiskSerializationCache(str(directory), max_size=300, max_item_size=1000)
+    assert directory.stat().st_mode & 0o777 == 0o700
+    directory.chmod(0o777)
+    with pytest.raises(ImproperlyConfigured):
+        DiskSerializationCache(str(directory), max_size=300, max_item_size=1000)
+    with pytest.raises(ImproperlyConfigured):
+        DiskSerializationCache("", max_size=300, max_item_size=1000)
+
+
+def test_disk_cache_eviction(tmp_path):
+    cache = DiskSerializationCache(str(tmp_path), max_size=300, max_item_size=1000, cleanup_interval=1)
+    for i in range(10):
+        cache.set(f"1:template:hash{i}", "x" * 50)
+    assert cache.get("1:template:hash9") == "x" * 50
+    assert sum(f.stat().st_size for f in tmp_path.glob("*/*")) <= 300
+
+
+def show_ip_int_brief(device_num: int) -> str:
+    rows = (
+        f"GigabitEthernet0/{i:<18} 10.{device_num % 250}.{i}.1{'':<6} YES manual {('up', 'down')[i % 2]:<21} up"
+        for i in range(device_num % 40)
+    )
+    return "\n".join(["Interface                  IP-Address      OK? Method Status                Protocol", *rows])
+
+
+def show_run_interfaces(device_num: int) -> str:
+    return "\n".join(
+        f"interface GigabitEthernet6/{i}\n ip address 10.{device_num % 250}.{i}.3 255.255.255.0\n!"
+        for i in range(1 + device_num % 40)
+    )
+
+
+def serialize_outputs(module, serialize_method, template: str, outputs: list[str], recompile: bool):
+    start = time.perf_counter()
+    results = []
+    for output in outputs:
+        if recompile:
+            module.compile_template.cache_clear()
+        results.append(serialize_method(output, template, {}))
+    return results, time.perf_counter() - start
+
+
+@pytest.mark.parametrize(
+    "module, serialize_method, template, get_output",
+    [
+        pytest.param(
+            textfsm_module, textfsm_module.serialize_textfsm, TEXTFSM_TEMPLATE, show_ip_int_brief, id="TEXTFSM"
+        ),
+        pytest.param(ttp_module, ttp_module.serialize_ttp, TTP_TEMPLATE, show_run_interfaces, id="TTP"),
+    ],
+)
+def test_compiled_template_cache(module, serialize_method, template, get_output):
+    module.compile_template.cache_clear()
+    outputs = [get_output(i) for i in range(100)]
+    cached_results, _ = serialize_outputs(module, serialize_method, template, outputs, recompile=False)
+    cache_info = module.compile_template.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (99, 1)
+    uncached_results, _ = serialize_outputs(module, serialize_method, template, outputs, recompile=True)
+    assert cached_results == uncached_results
+
+
+def test_compiled_ttp_template_vars():
+    template = """
+<group name="system">
+hostname {{ hostname | record(hostname) }}
+</group>
+<group name="interfaces">
+interface {{ name }}
+ {{ device | set(hostname) }}
+</group>
+"""
+    ttp_module.compile_template.cache_clear()
+    first = ttp_module.serialize_ttp("hostname R1\ninterface ge-0/0/1\n", template, {})
+    second = ttp_module.serialize_ttp("interface ge-0/0/2\n", template, {})
+    assert first["interfaces"] == {"name": "ge-0/0/1", "device": "R1"}
+    assert second == {"interfaces": {"name": "ge-0/0/2", "device": "hostname"}}
+    assert ttp_module.compile_template.cache_info().hits == 1
+
+
+@pytest.mark.benchmark
+def test_compiled_template_cache_benchmark():
+    """
+    Parsing 1k command outputs with the compiled TTP template vs re-compiling the template for each output
+    """
+    ttp_module.compile_template.cache_clear()
+    outputs = [show_run_interfaces(i) for i in range(1000)]
+    serialize = partial(serialize_outputs, ttp_module, ttp_module.serialize_ttp, TTP_TEMPLATE, outputs)
+    cached_results, cached_time = serialize(recompile=False)
+    uncached_results, uncached_time = serialize(recompile=True)
+    assert cached_results == uncached_results
+    assert cached_time < uncached_time
+
+
+def drop_attributes_after_parsing(xml: str):
+    return transform_json(
+        xmltodict.parse(xml),
+        match_fn=lambda key, _: isinstance(key, str) and key.startswith("@"),
+        transform_fn=lambda key, value: None,
+    )
+
+
+def netconf_interfaces(count: int) -> str:
+    interfaces = "".join(
+        f'<interface xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0" nc:operation="merge">'
+        f'<name>ge-0/0/{i}</name><description lang="en">uplink {i}</description>'
+        f"<unit><name>0</name><family><inet><address><name>10.{i % 250}.0.1/24</name></address></inet></family></unit>"
+        "<disable/></interface>"
+        for i in range(count)
+    )
+    return (
+        '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="101">'
+        f'<data><configuration><interfaces>{interfaces}</interfaces><system><host-name a="b">r1</host-name></system>'
+        "</configuration></data></rpc-reply>"
+    )
+
+
+@pytest.mark.parametrize(
+    "xml",
+    [
+        '<a x="1"><b y="2">text</b><b>t2</b><c z="3"/></a>',
+        '<a xmlns="urn:x" xmlns:y="urn:y"><y:b y:attr="1"> spaced </y:b><!-- comment --><c/></a>',
+        '<a>head<b k="v">1</b>tail<![CDATA[<raw>]]></a>',
+        '<a><b k="v"/><b k="w"/><b>x &amp; y</b><b/></a>',
+        netconf_interfaces(3),
+        '<?xml version="1.0" encoding="ISO-8859-1"?><a><b k="v">café</b></a>',
+    ],
+)
+def test_xml_drop_attributes(xml):
+    assert serialize_xml(xml, "", {"drop_attributes": True}) == drop_attributes_after_parsing(xml)
+    assert serialize_xml(xml, "", {"element_paths": []}) == xmltodict.parse(xml)
+
+
+@pytest.mark.parametrize(
+    "parameters, expected",
+    [
+        (
+            {"element_paths": ["a/b/c"]},
+            {"a": {"b": [{"c": "1"}, {"@k": "v", "c": {"@k": "w", "#text": "3"}}]}},
+        ),
+        ({"element_paths": ["a/b/c"], "drop_attributes": True}, {"a": {"b": [{"c": "1"}, {"c": {"#text": "3"}}]}}),
+        (
+            {"element_paths": ["a/b", "a/b/d"]},
+            {"a": {"b": [{"c": "1", "d": "2"}, {"@k": "v", "c": {"@k": "w", "#text": "3"}}]}},
+        ),
+        ({"element_paths": ["/a/e/"]}, {"a": {"e": {"f": None}}}),
+        ({"element_paths": ["x"]}, {}),
+    ],
+)
+def test_xml_element_paths(parameters, expected):
+    xml = '<a><b><c>1</c><d>2</d></b><b k="v"><c k="w">3</c></b><e><f/></e></a>'
+    assert serialize_xml(xml, "", parameters) == expected
+
+
+def test_xml_declared_encoding():
+    # str input is always encoded into UTF-8 before parsing, declared encoding is ignored the same way as in xmltodict
+    xml = '<?xml version="1.0" encoding="ISO-8859-1"?><b>café</b>'
+    assert serialize_xml(xml, "", {"drop_attributes": True}) == xmltodict.parse(xml) == {"b": "café"}
+
+
+@pytest.mark.benchmark
+def test_xml_drop_attributes_benchmark():
+    """
+    Dropping attributes during parsing vs parsing + dropping them afterwards on a large netconf reply
+    """
+    xml = netconf_interfaces(20000)
+    start = time.perf_counter()
+    result = serialize_xml(xml, "", {"drop_attributes": True})
+    streaming_time = time.perf_counter() - start
+    start = time.perf_counter()
+    reference_result = drop_attributes_after_parsing(xml)
+    reference_time = time.perf_counter() - start
+    assert result == reference_result
+    assert streaming_time < reference_time
+    parameters = {"drop_attributes": True, "element_paths": ["rpc-reply/data/configuration/system"]}
+    subtree = serialize_xml(xml, "", parameters)
+    assert subtree == {"rpc-reply": {"data": {"configuration": {"system": {"host-name": {"#text": "r1"}}}}}}
+
+
+@pytest.mark.parametrize(
+    "plain_data, expected",
+    [
+        ('{"a": [1, 2.5, true, null, "x"]}', {"a": [1, 2.5, True, None, "x"]}),
+        ("  \n[1, 2]", [1, 2]),
+        ("{a: [1, 2], b: yes}", {"a": [1, 2], "b": True}),
+        ("[NaN]", ["NaN"]),
+        ("a: {b: c}", {"a": {"b": "c"}}),
+        ("", None),
+    ],
+)
+def test_serialize_yaml(plain_data, expected):
+    assert serialize_yaml(plain_data, "", {}) == expected
+
+
+@pytest.mark.parametrize("plain_data", ['{"a": 1', "[1, 2", "{a: [}", "a: b: c", "- a\nb: c"])
+def test_serialize_yaml_invalid(plain_data):
+    with pytest.raises(SerializationError, match="Got invalid JSON/YAML"):
+        serialize_yaml(plain_data, "", {})
+
+
+def json_document(size_mb: float) -> str:
+    interface = {
+        "name": "ge-0/0/0",
+        "description": "uplink to core",
+        "enabled": True,
+        "mtu": 9000,
+        "addresses": [{"ip": "10.0.0.1", "prefix_length": 24}, {"ip": "2001:db8::1", "prefix_length": 64}],
+        "counters": {"in_octets": 123456789, "out_octets": 987654321, "in_errors": 0, "load": 0.25},
+    }
+    interface_size = len(json.dumps(interface))
+    return json.dumps({"interfaces": [interface] * int(size_mb * 1024**2 // interface_size)}, indent=2)
+
+
+def throughput(fn, data: str) -> float:
+    start = time.perf_counter()
+    fn(data)
+    return len(data) / 1024**2 / (time.perf_counter() - start)
+
+
+def test_serialize_yaml_document():
+    document = json_document(0.05)
+    assert serialize_yaml(document, "", {}) == json.loads(document)
+    yaml_document = yaml.safe_dump(json.loads(document))
+    assert serialize_yaml(yaml_document, "", {}) == yaml.safe_load(yaml_document)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size_mb", [1, 10, 50])
+def test_serialize_yaml_benchmark(size_mb, record_property):
+    """
+    Throughput (MB/s) of JSON/YAML extraction method on large JSON documents compared to the pure-Python YAML loader
+    """
+    document = json_document(size_mb)
+    assert serialize_yaml(document, "", {}) == json.loads(document)
+    mb_per_second = throughput(lambda data: serialize_yaml(data, "", {}), document)
+    record_property("json_mb_per_second", round(mb_per_second, 1))
+    if size_mb == 1:
+        safe_load_mb_per_second = throughput(yaml.safe_load, document)
+        record_property("safe_load_mb_per_second", round(safe_load_mb_per_second, 1))
+        assert mb_per_second > safe_load_mb_per_second
+        yaml_document = yaml.safe_dump(json.loads(document))
+        assert serialize_yaml(yaml_document, "", {}) == yaml.safe_load(yaml_document)
+        yaml_mb_per_second = throughput(lambda data: serialize_yaml(data, "", {}), yaml_document)
+        record_property("yaml_mb_per_second", round(yaml_mb_per_second, 1))
@@ -47,7 +47,7 @@ class TestStateItem:
         with ctx:
             assert item.serialized == serialized
         if has_serializer and has_datafile:
-            serializer.serialize.assert_called_once_with(data_file.data_as_string)
+            serializer.serialize.assert_called_once_with(data_file.data_as_string, data_hash=data_file.hash)
 
 
 class TestState:
@@ -1,21 +1,14 @@
 from functools import partial
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import yaml
+from django.core.cache.backends.locmem import LocMemCache
 
 from validity.data_backends import PollingBackend
-from validity.pollers.result import PollingInfo
-
-
-def test_write_metainfo():
-    with TemporaryDirectory() as dir_name:
-        backend = PollingBackend("/")
-        polling_info = PollingInfo(devices_polled=5, errors=[])
-        backend.write_metainfo(dir_name, polling_info)
-        file = Path(dir_name) / "polling_info.yaml"
-        assert yaml.safe_load(file.read_text()) == polling_info.model_dump(exclude_defaults=True)
+from validity.pollers import CircuitBreaker, SessionPool
+from validity.pollers.exceptions import PollingError
+from validity.pollers.result import CommandResult, DescriptiveError
 
 
 def test_start_polling():
@@ -43,3 +36,72 @@ def test_start_polling():
     device_strings = {str(device): device for device in devices}
     for error in errors:
         assert device_strings[error.device].poller is None
+
+
+def test_poll(monkeypatch):
+    backend = PollingBackend("/")
+    device = MagicMock(pk=1, **{"__str__.return_value": "dev1", "poller.__str__.return_value": "poller1"})
+    result_params = {"device": device, "connect_time": 0.5, "duration": 1}
+    results = [
+        Mock(errored=False, path="dev1/cmd1.txt", contents="output", output_size=6, **result_params),
+        Mock(errored=True, path="dev1/cmd2.txt", contents="POLLING ERROR\nerr", **result_params),
+    ]
+    results[0].command.label, results[1].command.label = "cmd1", "cmd2"
+    results[1].descriptive_error = DescriptiveError(device="dev1", command="cmd2", error="err")
+    monkeypatch.setattr(backend, "bound_devices_qs", Mock(return_value=[device]))
+    monkeypatch.setattr(backend, "start_polling", Mock(side_effect=lambda _: ([iter(results)], set())))
+    files = dict(backend.poll())
+    assert list(files) == ["dev1/cmd1.txt", "dev1/cmd2.txt", "polling_info.yaml"]
+    assert files["dev1/cmd1.txt"] == b"output"
+    polling_info = yaml.safe_load(files["polling_info.yaml"])
+    assert polling_info["devices_polled"] == 1
+    assert polling_info["errors"] == [{"device": "dev1", "command": "cmd2", "error": "err"}]
+    assert polling_info["stats"]["pollers"]["poller1"]["device_time"]["max"] == 2.5
+    assert polling_info["stats"]["commands"]["cmd1"]["output_size"] == {"p50": 6, "p95": 6, "max": 6}
+    assert polling_info["stats"]["slowest_devices"] == [{"device": "dev1", "poller": "poller1", "duration": 2.5}]
+    with backend.fetch() as dir_name:
+        assert (Path(dir_name) / "dev1/cmd1.txt").read_text() == "output"
+        assert (Path(dir_name) / "polling_info.yaml").is_file()
+
+
+def test_poll_circuit_breaker(monkeypatch):
+    backend = PollingBackend("/")
+    breaker = CircuitBreaker(LocMemCache("circuit_breaker", {}), failure_threshold=1, probe_interval=100)
+    monkeypatch.setattr(PollingBackend, "circuit_breaker", breaker)
+    commands = [Mock(label="cmd1")]
+    devices = [
+        MagicMock(pk=i, **{"__str__.return_value": f"dev{i}", "poller.commands.all.return_value": commands})
+        for i in range(2)
+    ]
+    monkeypatch.setattr(backend, "bound_devices_qs", Mock(return_value=devices))
+
+    def start_polling(devices):
+        errors = {0: PollingError("conn timeout"), 1: PollingError("cmd error", device_wide=False)}
+        return [iter(CommandResult(device, commands[0], error=errors[device.pk]) for device in devices)], set()
+
+    monkeypatch.setattr(backend, "start_polling", Mock(side_effect=start_polling))
+    polling_info = yaml.safe_load(dict(backend.poll())["polling_info.yaml"])
+    assert "skipped_devices" not in polling_info
+    files = dict(backend.poll())
+    assert files["dev0/cmd1.txt"].startswith(b"POLLING ERROR\nPolling skipped")
+    polling_info = yaml.safe_load(files["polling_info.yaml"])
+    assert polling_info["skipped_devices"] == ["dev0"]
+    assert polling_info["devices_polled"] == 1
+    assert polling_info["errors"] == [{"device": "dev1", "command": "cmd1", "error": "cmd error"}]
+
+
+def test_poll_session_pool_stats(monkeypatch):
+    backend = PollingBackend("/")
+    pool = SessionPool()
+    pool.stats.hits = 5
+    monkeypatch.setattr(PollingBackend, "session_pool", pool)
+    monkeypatch.setattr(backend, "bound_devices_qs", Mock(return_value=[]))
+
+    def start_polling(devices):
+        pool.stats.hits += 2
+        pool.stats.misses += 1
+        return [], set()
+
+    monkeypatch.setattr(backend, "start_polling", Mock(side_effect=start_polling))
+    polling_info = yaml.safe_load(dict(backend.poll())["polling_info.yaml"])
+    assert polling_info["stats"]["session_pool"] == {"hits": 2, "misses": 1, "evictions": 0, "reconnects": 0}
@@ -1,6 +1,9 @@
+import time
+
 import pytest
 
 from validity.fields import EncryptedDict, EncryptedString
+from validity.fields.encrypted import derive_key
 
 
 @pytest.fixture
@@ -29,3 +32,46 @@ def test_do_not_encrypt(setup_private_key):
     enc_dict = EncryptedDict(val, do_not_encrypt=("p1", "p2"))
     assert enc_dict.encrypted["p1"] == "v1"
     assert enc_dict.encrypted["p3"].startswith("$")
+
+
+CREDENTIALS = {"username": "admin", "password": "secret", "secret": "enable"}
+
+
+def test_lazy_fernet(setup_private_key):
+    encrypted = EncryptedDict(CREDENTIALS).encrypted
+    derive_key.cache_clear()
+    enc_dict = EncryptedDict(encrypted)
+    assert derive_key.cache_info().misses == 0
+    assert enc_dict.decrypted == CREDENTIALS
+    assert derive_key.cache_info().misses == len(CREDENTIALS)
+    assert EncryptedDict(encrypted).decrypted == CREDENTIALS
+    assert derive_key.cache_info().misses == len(CREDENTIALS)
+    assert derive_key.cache_info().hits == len(CREDENTIALS)
+
+
+def test_load_credentials_key_cache(setup_private_key):
+    encrypted = EncryptedDict(CREDENTIALS).encrypted
+    derive_key.cache_clear()
+    iterations = 100
+    for _ in range(iterations):
+        assert EncryptedDict(encrypted).decrypted == CREDENTIALS
+    assert derive_key.cache_info().misses == len(CREDENTIALS)
+    assert derive_key.cache_info().hits == (iterations - 1) * len(CREDENTIALS)
+
+
+@pytest.mark.benchmark
+def test_load_credentials_benchmark(setup_private_key):
+    """
+    Cost of loading and decrypting poller credentials with cold (the same as without cache) and warm key cache
+    """
+    encrypted = EncryptedDict(CREDENTIALS).encrypted
+    derive_key.cache_clear()
+    start = time.perf_counter()
+    _ = EncryptedDict(encrypted).decrypted
+    cold_time = time.perf_counter() - start
+    iterations = 100
+    start = time.perf_counter()
+    for _ in range(iterations):
+        _ = EncryptedDict(encrypted).decrypted
+    warm_time = (time.perf_counter() - start) / iterations
+    assert warm_time * 10 < cold_time
@@ -32,7 +32,17 @@ class TestSerializerForm:
             ),
             (
                 {"name": "s", "extraction_method": "XML", "jq_expression": ".qwe", "drop_attributes": "true"},
-                {"extraction_method": "XML", "parameters": {"jq_expression": ".qwe", "drop_attributes": True}},
+                {
+                    "extraction_method": "XML",
+                    "parameters": {"jq_expression": ".qwe", "drop_attributes": True, "element_paths": None},
+                },
+            ),
+            (
+                {"name": "s", "extraction_method": "XML", "element_paths": '["rpc-reply/data"]'},
+                {
+                    "extraction_method": "XML",
+                    "parameters": {"jq_expression": "", "drop_attributes": False, "element_paths": ["rpc-reply/data"]},
+                },
             ),
         ],
     )
@@ -50,6 +60,8 @@ class TestSerializerForm:
             ({"name": "s", "extraction_method": "TTP"}, {"template"}),
             ({"name": "s", "extraction_method": "TTP", "template": "q", "data_source": "1"}, {"__all__"}),
             ({"name": "s", "extraction_method": "YAML", "jq_expression": "((("}, {"jq_expression"}),
+            ({"name": "s", "extraction_method": "XML", "element_paths": '"rpc-reply"'}, {"element_paths"}),
+            ({"name": "s", "extraction_method": "XML", "element_paths": '["a", 1]'}, {"element_paths"}),
         ],
     )
     @pytest.mark.django_db(transaction=True, reset_sequences=True)
@@ -67,7 +79,7 @@ class TestSerializerForm:
                 {
                     "template": "",
                     "extraction_method": "XML",
-                    "parameters": {"jq_expression": "", "drop_attributes": True},
+                    "parameters": {"jq_expression": "", "drop_attributes": True, "element_paths": None},
                 },
             ),
             (
@@ -0,0 +1,26 @@
+import pytest
+
+from validity.j2_env import TemplateCache
+
+
+@pytest.fixture
+def cache():
+    return TemplateCache(maxsize=2)
+
+
+def test_template_cache(cache):
+    assert cache.render("{{ a }}-{{ b }}", a=1, b=2) == "1-2"
+    assert cache.render("{{ a }}-{{ b }}", a=3, b=4) == "3-4"
+    assert cache.render("{{ a | slugify }}", a="Some Name") == "some-name"
+    assert cache.info == {"hits": 1, "misses": 2, "size": 2, "maxsize": 2}
+
+
+def test_template_cache_eviction(cache):
+    first = cache.get_template("1")
+    cache.get_template("2")
+    cache.get_template("1")
+    cache.get_template("3")
+    assert cache.get_template("1") is first
+    assert cache.info == {"hits": 2, "misses": 3, "size": 2, "maxsize": 2}
+    cache.clear()
+    assert cache.info == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
@@ -1,12 +1,24 @@
 import pytest
 from factories import PollerFactory
 
-from validity.pollers import NetmikoPoller, RequestsPoller, ScrapliNetconfPoller
+from validity.pollers import (
+    AsyncRequestsPoller,
+    AsyncScrapliNetconfPoller,
+    NetmikoPoller,
+    RequestsPoller,
+    ScrapliNetconfPoller,
+)
 
 
 @pytest.mark.parametrize(
     "connection_type, poller_class",
-    [("netmiko", NetmikoPoller), ("requests", RequestsPoller), ("scrapli_netconf", ScrapliNetconfPoller)],
+    [
+        ("netmiko", NetmikoPoller),
+        ("requests", RequestsPoller),
+        ("scrapli_netconf", ScrapliNetconfPoller),
+        ("requests_async", AsyncRequestsPoller),
+        ("scrapli_netconf_async", AsyncScrapliNetconfPoller),
+    ],
 )
 @pytest.mark.django_db
 def test_get_backend(connection_type, poller_class):
@@ -1,6 +1,10 @@
+import threading
+from functools import partial
 from unittest.mock import Mock
 
+import factory
 import pytest
+from django.core.management import call_command
 from django.db.models import Q
 from factories import (
     DeviceFactory,
@@ -14,7 +18,8 @@ from factories import (
     TagFactory,
 )
 
-from validity.models import VDevice, selector
+from validity import di, signals
+from validity.models import ComplianceSelector, SelectorMembership, VDevice, selector
 
 
 @pytest.mark.parametrize(
@@ -63,9 +68,9 @@ def test_multi_filter():
 
 @pytest.mark.django_db
 def test_devices(monkeypatch):
-    monkeypatch.setattr(VDevice.objects, "filter", filter_mock := Mock(name="filter"))
-    monkeypatch.setattr(selector.ComplianceSelector, "filter", "filter_value")
     model = SelectorFactory()
+    monkeypatch.setattr(VDevice.objects, "filter", filter_mock := Mock(name="filter"))
+    monkeypatch.setattr(selector.ComplianceSelector, "device_filter", "filter_value")
     assert model.devices._extract_mock_name() == "filter().set_selector()"
     filter_mock.assert_called_once_with("filter_value")
 
@@ -78,3 +83,92 @@ def test_dynamic_pairs(monkeypatch):
     dp_filter = selector_instance.dynamic_pair_filter(device)
     dpf_mock.assert_called_once_with(selector_instance, device)
     assert dp_filter == Q(dpf_filter=True) & ~Q(pk=device.pk)
+
+
+def membership(selector_instance):
+    return set(SelectorMembership.objects.filter(selector=selector_instance).values_list("device__name", flat=True))
+
+
+@pytest.fixture
+def index_queue(monkeypatch):
+    queue = Mock(enqueue=Mock(side_effect=lambda func, **kwargs: func(**kwargs)))
+    monkeypatch.setattr(di["launcher_factory"], "get_queue", Mock(return_value=queue))
+    # drop the changes left by the tests which did not commit
+    monkeypatch.setattr(signals, "_pending", threading.local())
+    return queue
+
+
+@pytest.mark.django_db
+def test_membership_index(index_queue, django_capture_on_commit_callbacks):
+    commit = partial(django_capture_on_commit_callbacks, execute=True)
+    with commit():
+        DeviceFactory(name="dev-1")
+        model = SelectorFactory(name_filter="dev-.*")
+    model.refresh_from_db()
+    assert model.membership_indexed
+    assert membership(model) == {"dev-1"}
+    with commit():
+        device = DeviceFactory(name="dev-2")
+        DeviceFactory(name="other")
+    assert membership(model) == {"dev-1", "dev-2"}
+    with commit():
+        device.name = "other-2"
+        device.save()
+    assert membership(model) == {"dev-1"}
+    with commit():
+        tag = TagFactory()
+        model.tag_filter.set([tag])
+    assert membership(model) == set()
+    with commit():
+        device.tags.add(tag)
+        device.name = "dev-2"
+        device.save()
+    assert {d.name for d in model.devices} == membership(model) == {"dev-2"}
+    with commit():
+        tag.delete()
+    assert membership(model) == {"dev-1", "dev-2"}
+
+
+@pytest.mark.django_db
+def test_membership_index_single_job(index_queue, django_capture_on_commit_callbacks):
+    tags = TagFactory.create_batch(2)
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        model = SelectorFactory(name_filter="dev-.*")
+        model.tag_filter.set(tags)
+        DeviceFactory(name="dev-1")
+    assert len(callbacks) == 1
+    index_queue.enqueue.assert_called_once()
+    assert index_queue.enqueue.call_args.kwargs["selector_ids"] == [model.pk]
+    other_tag = TagFactory()
+    index_queue.enqueue.reset_mock()
+    with django_capture_on_commit_callbacks(execute=True):
+        other_tag.delete()
+    index_queue.enqueue.assert_not_called()
+    with django_capture_on_commit_callbacks(execute=True):
+        tags[0].delete()
+    index_queue.enqueue.assert_called_once()
+    assert index_queue.enqueue.call_args.kwargs["selector_ids"] == [model.pk]
+
+
+@pytest.mark.django_db
+def test_membership_index_not_indexed(index_queue, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        device = DeviceFactory(name="dev-1")
+        device.tags.add(TagFactory())
+    assert len(callbacks) == 1
+    index_queue.enqueue.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_rebuild_selector_index():
+    model = SelectorFactory(name_filter="dev-.*")
+    ComplianceSelector.objects.filter(pk=model.pk).update(membership_indexed=False)
+    SelectorMembership.objects.all().delete()
+    DeviceFactory.create_batch(2, name=factory.Sequence("dev-{}".format))
+    model.refresh_from_db()
+    assert not model.membership_indexed
+    assert {d.name for d in model.devices} == {"dev-0", "dev-1"}
+    call_command("rebuild_selector_index", stdout=Mock())
+    model.refresh_from_db()
+    assert model.membership_indexed
+    assert membership(model) == {"dev-0", "dev-1"}
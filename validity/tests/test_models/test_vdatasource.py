@@ -1,3 +1,4 @@
+import hashlib
 from contextlib import suppress
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -53,13 +54,42 @@ def test_partial_sync(monkeypatch):
 def test_sync_with_param(monkeypatch):
     ds = DataSourceFactory(type="device_polling")
     monkeypatch.setattr(DataSource, "sync", Mock())
-    monkeypatch.setattr(VDataSource, "partial_sync", Mock())
+    monkeypatch.setattr(VDataSource, "polling_sync", Mock())
     ds.sync()
-    DataSource.sync.assert_called_once_with()
-    assert VDataSource.partial_sync.call_count == 0
+    VDataSource.polling_sync.assert_called_once_with(None)
     filtr = object()
     ds.sync(filtr)
-    VDataSource.partial_sync.assert_called_once_with(filtr)
+    VDataSource.polling_sync.assert_called_with(filtr)
+    assert DataSource.sync.call_count == 0
+    ds.type = "local"
+    ds.sync()
+    DataSource.sync.assert_called_once_with()
+
+
+@pytest.mark.parametrize("device_filter", [None, "device_filter"])
+@pytest.mark.django_db
+def test_polling_sync(monkeypatch, device_filter):
+    ds = DataSourceFactory(type="device_polling")
+    DataFileFactory(source=ds, data="some_contents".encode(), path="file-0.txt")
+    unchanged = DataFileFactory(
+        source=ds, data=b"unchanged", path="dev/unchanged.txt", hash=hashlib.sha256(b"unchanged").hexdigest()
+    )
+    DataFileFactory(source=ds, path="dev/file-1.txt")
+    polled_files = [("dev/file-1.txt", b"qwe"), ("dev/unchanged.txt", b"unchanged"), ("dev/file_new.txt", b"rty")]
+    backend_mock = Mock(**{"return_value.poll.return_value": iter(polled_files)})
+    monkeypatch.setattr(ds, "get_backend", backend_mock)
+    unchanged_updated = VDataFile.objects.get(pk=unchanged.pk).last_updated
+    assert ds.polling_sync(device_filter, batch_size=2) == {path for path, _ in polled_files}
+    backend_mock().poll.assert_called_once_with(device_filter)
+    expected_paths = {"dev/file-1.txt", "dev/unchanged.txt", "dev/file_new.txt"}
+    if device_filter:
+        expected_paths.add("file-0.txt")
+    assert {*ds.datafiles.values_list("path", flat=True)} == expected_paths
+    assert VDataFile.objects.get(path="dev/file-1.txt").data_as_string == "qwe"
+    assert VDataFile.objects.get(path="dev/file_new.txt").data_as_string == "rty"
+    assert VDataFile.objects.get(path="dev/file_new.txt").hash == hashlib.sha256(b"rty").hexdigest()
+    assert VDataFile.objects.get(pk=unchanged.pk).last_updated == unchanged_updated
+    assert VDataSource.objects.get(pk=ds.pk).status == DataSourceStatusChoices.COMPLETED
 
 
 @pytest.mark.django_db
@@ -3,9 +3,11 @@ from operator import attrgetter
 import pytest
 from dcim.models import Device
 from factories import (
+    CommandFactory,
     DataFileFactory,
     DataSourceFactory,
     DeviceFactory,
+    PollerFactory,
     SelectorFactory,
     SerializerDBFactory,
     TenantFactory,
@@ -91,3 +93,33 @@ def test_primary_ip():
     assert vdevice.primary_ip == vdevice.primary_ip4
     vdevice.prefer_ipv4 = False
     assert vdevice.primary_ip == vdevice.primary_ip6
+
+
+@pytest.mark.django_db
+def test_prefetch_state(create_custom_fields, django_assert_max_num_queries):
+    ds = DataSourceFactory(
+        custom_field_data={
+            "default": True,
+            "device_config_path": "{{device.name}}/config.txt",
+            "device_command_path": "{{device.name}}/{{command.label}}.txt",
+        }
+    )
+    serializer = SerializerDBFactory(extraction_method="YAML", template="")
+    poller = PollerFactory()
+    poller.commands.set([CommandFactory(label="cmd1", serializer=serializer), CommandFactory(label="cmd2")])
+    for name in ["d1", "d2", "d3"]:
+        DeviceFactory(name=name, custom_field_data={"serializer": serializer.pk, "poller": poller.pk})
+        DataFileFactory(source=ds, path=f"{name}/config.txt", data=f"hostname: {name}".encode())
+    DataFileFactory(source=ds, path="d1/cmd1.txt", data=b"key: value")
+    base_qs = VDevice.objects.prefetch_datasource().prefetch_serializer().prefetch_poller().order_by("name")
+    devices = list(base_qs.all().prefetch_state())
+    with django_assert_max_num_queries(0):
+        bulk_states = [device.state for device in devices]
+    single_states = [device.state for device in base_qs.all()]
+    for bulk_state, single_state in zip(bulk_states, single_states):
+        assert bulk_state.keys() == single_state.keys() == {"config", "cmd1", "cmd2"}
+        for key in bulk_state:
+            assert bulk_state.get(key, ignore_errors=True) == single_state.get(key, ignore_errors=True)
+            assert bulk_state.get_full_item(key).data_file == single_state.get_full_item(key).data_file
+    assert bulk_states[0].config == {"hostname": "d1"}
+    assert bulk_states[0].cmd1 == {"key": "value"}
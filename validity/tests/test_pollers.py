@@ -1,11 +1,23 @@
+import asyncio
+import threading
 import time
-from unittest.mock import MagicMock, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock, PropertyMock
 
 import pytest
+from django.core.cache.backends.locmem import LocMemCache
 
-from validity.pollers import NetmikoPoller, RequestsPoller
+from validity.pollers import (
+    AsyncRequestsPoller,
+    AsyncScrapliNetconfPoller,
+    CircuitBreaker,
+    NetmikoPoller,
+    RequestsPoller,
+    SessionPool,
+)
+from validity.pollers.exceptions import PollingError
 from validity.pollers.factory import PollerChoices
-from validity.pollers.http import HttpDriver
+from validity.pollers.http import AsyncHttpDriver, HttpDriver
+from validity.pollers.result import CommandResult, PollingStatsCollector
 from validity.settings import PollerInfo
 
 
@@ -86,6 +98,249 @@ def test_http_driver():
     assert result == requests.request.return_value.content.decode.return_value
 
 
+@pytest.mark.parametrize("concurrent_commands", [1, 3])
+def test_requests_poller_session(monkeypatch, concurrent_commands):
+    in_flight = []
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def request(url, **kwargs):
+        nonlocal max_in_flight
+        with lock:
+            in_flight.append(url)
+            max_in_flight = max(max_in_flight, len(in_flight))
+        time.sleep(0.1)
+        with lock:
+            in_flight.remove(url)
+        return Mock(content=url.encode())
+
+    session = Mock(**{"request.side_effect": request})
+    monkeypatch.setattr("validity.pollers.http.requests.Session", Mock(return_value=session))
+    commands = [Mock(parameters={"url_path": f"/path{i}", "method": "get", "body": {}}) for i in range(3)]
+    device = Mock(**{"primary_ip.address.ip": "1.1.1.1"})
+    poller = RequestsPoller({"pool_size": 5, "concurrent_commands": concurrent_commands}, commands)
+    results = list(poller.poll([device]))
+    assert [r.result for r in results] == [f"https://1.1.1.1/path{i}" for i in range(3)]
+    assert max_in_flight == concurrent_commands
+    assert session.request.call_count == 3
+    session.close.assert_called_once()
+    assert session.mount.call_args.args[1]._pool_maxsize == 5
+
+
+class TestAsyncPoller:
+    @staticmethod
+    def get_device(primary_ip):
+        return Mock(primary_ip=Mock(address=Mock(ip=primary_ip)))
+
+    @pytest.mark.parametrize("raise_exc", [True, False])
+    def test_poll(self, monkeypatch, raise_exc):
+        active_sessions = []
+        max_active_sessions = 0
+
+        async def rpc(rpc):
+            nonlocal max_active_sessions
+            active_sessions.append(rpc)
+            max_active_sessions = max(max_active_sessions, len(active_sessions))
+            await asyncio.sleep(0.1)
+            active_sessions.pop()
+            if raise_exc:
+                raise OSError
+            return Mock(result=rpc)
+
+        driver = AsyncMock(**{"rpc.side_effect": rpc})
+        monkeypatch.setattr(AsyncScrapliNetconfPoller, "driver_factory", Mock(return_value=driver))
+        commands = [Mock(parameters={"rpc": "a"}), Mock(parameters={"rpc": "b"})]
+        poller = AsyncScrapliNetconfPoller({"auth_username": "admin"}, commands, max_sessions=5)
+        devices = [self.get_device(f"1.1.1.{i}") for i in range(10)]
+        start = time.time()
+        results = list(poller.poll(devices))
+        assert time.time() - start < 1
+        assert max_active_sessions == 5
+        assert len(results) == len(commands) * len(devices)
+        if raise_exc:
+            assert all(res.error.message.startswith("OSError") for res in results)
+        else:
+            assert all(res.result in {"a", "b"} for res in results)
+        assert all(res.duration >= 0.1 for res in results)
+        AsyncScrapliNetconfPoller.driver_factory.assert_any_call(
+            auth_username="admin", host="1.1.1.0", transport="asyncssh"
+        )
+        assert driver.open.await_count == driver.close.await_count == len(devices)
+
+    def test_device_wide_error(self, monkeypatch):
+        monkeypatch.setattr(AsyncScrapliNetconfPoller, "driver_factory", Mock(side_effect=ValueError("conn error")))
+        commands = [Mock(parameters={"rpc": "a"}), Mock(parameters={"rpc": "b"})]
+        results = list(AsyncScrapliNetconfPoller({}, commands).poll([self.get_device("1.1.1.1")]))
+        assert len(results) == 2
+        assert all(res.error.device_wide and res.error.message == "ValueError: conn error" for res in results)
+
+    def test_http_poller(self, monkeypatch):
+        client = AsyncMock(**{"request.return_value.content": b"response"})
+        monkeypatch.setattr("validity.pollers.http.httpx.AsyncClient", Mock(return_value=client))
+        command = Mock(parameters={"url_path": "/path", "method": "get", "body": {}})
+        device = self.get_device("1.1.1.1")
+        render_threads = set()
+        type(device).name = PropertyMock(side_effect=lambda: render_threads.add(threading.current_thread()) or "d1")
+        command.parameters["body"] = {"device": "{{ device.name }}"}
+        [result] = AsyncRequestsPoller({"verify": True, "timeout": 5}, [command]).poll([device])
+        assert result.result == "response"
+        client.request.assert_awaited_once_with(
+            url="https://1.1.1.1/path", method="get", auth=None, timeout=5, json={"device": "d1"}
+        )
+        client.aclose.assert_awaited_once()
+        # templates may query the DB, so they are rendered outside of the event loop thread
+        assert render_threads == {threading.current_thread()}
+
+    def test_http_driver_close(self):
+        driver = AsyncHttpDriver(request_kwargs={}, client_kwargs={})
+        asyncio.run(driver.close())
+        assert driver.client is None
+
+
+def test_polling_stats():
+    pollers = [MagicMock(**{"__str__.return_value": name}) for name in ("p1", "p2")]
+    devices = [MagicMock(pk=i, poller=pollers[i % 2], **{"__str__.return_value": f"dev{i}"}) for i in range(4)]
+    commands = [Mock(label="cmd1"), Mock(label="cmd2")]
+    collector = PollingStatsCollector(slowest_devices=2)
+    for i, device in enumerate(devices):
+        collector.add(CommandResult(device, commands[0], result="x" * (i + 1), duration=i, connect_time=i / 10))
+        collector.add(CommandResult(device, commands[1], error=PollingError("err"), duration=1, connect_time=i / 10))
+    stats = collector.build()
+    assert stats.pollers["p1"].model_dump() == {
+        "devices": 2,
+        "connect_time": {"p50": 0, "p95": 0.2, "max": 0.2},
+        "device_time": {"p50": 1, "p95": 3.2, "max": 3.2},
+    }
+    assert stats.commands["cmd1"].model_dump() == {
+        "count": 4,
+        "duration": {"p50": 1, "p95": 3, "max": 3},
+        "output_size": {"p50": 2, "p95": 4, "max": 4},
+    }
+    assert stats.commands["cmd2"].output_size is None
+    slowest = [(timing.device, timing.poller, timing.duration) for timing in stats.slowest_devices]
+    assert slowest == [("dev3", "p2", 4.3), ("dev2", "p1", 3.2)]
+
+
+class TestCircuitBreaker:
+    def test_open_and_probe(self):
+        now = 0
+        breaker = CircuitBreaker(
+            LocMemCache("test_circuit", {}), failure_threshold=2, probe_interval=60, clock=lambda: now
+        )
+        devices = [Mock(pk=1), Mock(pk=2)]
+        for _ in range(2):
+            assert breaker.split(devices) == (devices, [])
+            breaker.update({1: True, 2: False})
+        assert breaker.split(devices) == ([devices[1]], [devices[0]])
+        now = 60
+        assert breaker.split(devices) == (devices, [])  # half-open probe
+        assert breaker.split(devices) == ([devices[1]], [devices[0]])  # the only probe per interval
+        breaker.update({1: True})
+        now = 100
+        assert breaker.split(devices) == ([devices[1]], [devices[0]])
+        now = 120
+        assert breaker.split(devices) == (devices, [])
+        breaker.update({1: False})
+        assert breaker.split(devices) == (devices, [])
+
+    def test_failures_are_consecutive(self):
+        breaker = CircuitBreaker(LocMemCache("test_consecutive", {}), failure_threshold=2)
+        device = Mock(pk=1)
+        for failed in (True, False, True):
+            breaker.update({device.pk: failed})
+        assert breaker.split([device]) == ([device], [])
+
+
+class TestSessionPool:
+    def test_acquire_release(self):
+        clock = Mock(return_value=0)
+        pool = SessionPool(max_size=2, idle_timeout=10, clock=clock)
+        close = Mock()
+        drivers = [pool.acquire(key, Mock(return_value=f"driver-{key}"), lambda _: True) for key in range(3)]
+        assert pool.stats.misses == 3
+        for key, driver in enumerate(drivers):
+            pool.release(key, driver, close)
+        assert len(pool) == 2
+        close.assert_called_once_with("driver-0")
+        assert pool.stats.evictions == 1
+        assert pool.acquire(1, Mock(), lambda _: True) == "driver-1"
+        assert pool.stats.hits == 1
+        new_connect = Mock(return_value="new-driver-2")
+        assert pool.acquire(2, new_connect, lambda _: False) == "new-driver-2"
+        assert pool.stats.reconnects == 1
+        close.assert_called_with("driver-2")
+
+    def test_idle_timeout(self):
+        clock = Mock(return_value=0)
+        pool = SessionPool(idle_timeout=10, clock=clock)
+        close = Mock()
+        pool.release("key1", "driver1", close)
+        clock.return_value = 5
+        pool.release("key2", "driver2", close)
+        clock.return_value = 12
+        assert pool.acquire("key2", Mock(), lambda _: True) == "driver2"
+        close.assert_called_once_with("driver1")
+        assert pool.stats.evictions == 1
+        assert len(pool) == 0
+
+    def test_reap(self):
+        clock = Mock(return_value=0)
+        pool = SessionPool(idle_timeout=10, clock=clock)
+        close = Mock()
+        pool.release("key1", "driver1", close)
+        clock.return_value = 12
+        pool.reap()
+        close.assert_called_once_with("driver1")
+        assert len(pool) == 0
+        assert pool.get_stats().evictions == 1
+
+    def test_reaper_timer(self):
+        pool = SessionPool(idle_timeout=0.01)
+        close = Mock()
+        pool.release("key1", "driver1", close)
+        deadline = time.monotonic() + 5
+        while len(pool) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        close.assert_called_once_with("driver1")
+
+    def test_failed_session_is_not_reused(self, monkeypatch):
+        def send_command(command):
+            if command == "fail":
+                raise OSError("broken pipe")
+            return command
+
+        drivers = []
+        driver_factory = Mock(
+            side_effect=lambda **_: drivers.append(Mock(**{"send_command.side_effect": send_command})) or drivers[-1]
+        )
+        monkeypatch.setattr(NetmikoPoller, "driver_factory", driver_factory)
+        device = Mock(primary_ip=Mock(address=Mock(ip="1.1.1.1")))
+        pool = SessionPool()
+        for commands in (["ok", "fail"], ["ok"], ["ok"]):
+            poller = NetmikoPoller({}, [Mock(parameters={"cli_command": cmd}) for cmd in commands])
+            poller.session_pool = pool
+            list(poller.poll([device]))
+        assert driver_factory.call_count == 2
+        drivers[0].disconnect.assert_called_once()
+        drivers[1].disconnect.assert_not_called()
+        assert pool.get_stats().as_dict() == {"hits": 1, "misses": 2, "evictions": 0, "reconnects": 0}
+
+    def test_netmiko_poller(self, monkeypatch):
+        driver_factory = Mock(side_effect=lambda **_: Mock(**{"is_alive.return_value": True, "send_command": str}))
+        monkeypatch.setattr(NetmikoPoller, "driver_factory", driver_factory)
+        commands = [Mock(parameters={"cli_command": "show ver"})]
+        devices = [Mock(primary_ip=Mock(address=Mock(ip=f"1.1.1.{i}"))) for i in range(3)]
+        pool = SessionPool()
+        for _ in range(3):
+            poller = NetmikoPoller({"username": "admin"}, commands)
+            poller.session_pool = pool
+            assert [res.result for res in poller.poll(devices)] == ["show ver"] * 3
+        assert driver_factory.call_count == 3
+        assert pool.stats.as_dict() == {"hits": 6, "misses": 3, "evictions": 0, "reconnects": 0}
+        pool.clear()
+        assert len(pool) == 0
+
+
 def test_poller_choices():
     poller_choices = PollerChoices(
         pollers_info=[
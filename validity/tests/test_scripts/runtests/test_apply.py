@@ -1,5 +1,7 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from factories import (
@@ -9,17 +11,20 @@ from factories import (
     DataSourceFactory,
     DeviceFactory,
     NameSetDBFactory,
+    ReportFactory,
     SelectorFactory,
     SerializerDBFactory,
 )
+from pydantic import ValidationError
 
 from validity.compliance.eval.eval_defaults import DEFAULT_NAMESET
 from validity.compliance.exceptions import EvalError
-from validity.models import ComplianceTest
+from validity.models import ComplianceTest, ComplianceTestResult, Serializer
 from validity.scripts.data_models import ExecutionResult
 from validity.scripts.data_models import TestResultRatio as ResultRatio
-from validity.scripts.runtests.apply import ApplyWorker, DeviceTestIterator
+from validity.scripts.runtests.apply import ApplyWorker, DeviceMajorTestIterator, DeviceTestIterator
 from validity.scripts.runtests.apply import TestExecutor as TExecutor
+from validity.settings import ValiditySettings
 from validity.utils.logger import Logger
 
 
@@ -148,6 +153,46 @@ def test_run_tests_for_device_with_dynamic_pair_config(create_custom_fields):
     assert executor.results_count == 1
 
 
+@pytest.mark.django_db
+def test_incremental_run(create_custom_fields, monkeypatch):
+    data_source = DataSourceFactory(
+        custom_field_data={"default": True, "device_config_path": "configs/{{ device.name }}.yaml"}
+    )
+    serializer = SerializerDBFactory(extraction_method="YAML", template="")
+    device = DeviceFactory(name="dev1", custom_field_data={"serializer": serializer.pk})
+    data_file = DataFileFactory(source=data_source, path="configs/dev1.yaml", data=b"a: 1\n")
+    selector = SelectorFactory(name_filter="dev1")
+    test = CompTestDBFactory(expression="device.config['a'] == 1")
+    test.selectors.set([selector])
+
+    def run(report_id):
+        executor = TExecutor(Logger(), explanation_verbosity=2, report_id=report_id, incremental=True)
+        results = ComplianceTestResult.objects.bulk_create(
+            executor(*next(DeviceTestIterator({selector.pk: [device.pk]}, [], None)))
+        )
+        return executor, results
+
+    executor, [result] = run(ReportFactory().pk)
+    assert result.passed is True
+    assert len(result.fingerprint) == 64
+    assert executor.results_reused == 0
+
+    monkeypatch.setattr(ComplianceTest, "run", Mock(return_value=(False, [])))
+    with patch.object(Serializer, "serialize", autospec=True, side_effect=Serializer.serialize) as serialize:
+        executor, [reused_result] = run(ReportFactory().pk)
+    serialize.assert_not_called()
+    assert executor.results_reused == 1
+    assert reused_result.passed is True
+    assert reused_result.fingerprint == result.fingerprint
+    ComplianceTest.run.assert_not_called()
+
+    type(data_file).objects.filter(pk=data_file.pk).update(hash="2" * 64)
+    executor, [new_result] = run(ReportFactory().pk)
+    assert executor.results_reused == 0
+    assert new_result.passed is False
+    assert new_result.fingerprint != result.fingerprint
+
+
 @pytest.mark.django_db
 def test_devicetest_iterator():
     devices = [DeviceFactory() for _ in range(3)]
@@ -184,6 +229,7 @@ def apply_worker():
     device_test_gen = Mock(return_value=[(["device1"], ["test1"]), (["device2"], ["test2"])])
     job_extractor_factory = Mock()
     job_extractor_factory.return_value.parent.job.result.slices = [None, {1: [1, 2, 3]}]
+    job_extractor_factory.return_value.parent.job.result.use_work_queue = False
     return ApplyWorker(
         logger=Logger(),
         testresult_queryset=Mock(),
@@ -191,6 +237,8 @@ def apply_worker():
         result_batch_size=100,
         job_extractor_factory=job_extractor_factory,
         device_test_gen=device_test_gen,
+        processes=1,
+        chunk_size=100,
     )
 
 
@@ -227,3 +275,159 @@ def test_applyworker_exception(full_runtests_params, apply_worker):
     apply_worker.logger = MockLogger()
     result = apply_worker(params=full_runtests_params, worker_id=1)
     assert result == ExecutionResult(test_stat=ResultRatio(passed=0, total=0), log=["some error"], errored=True)
+
+
+class FakeExecutor:
+    def __init__(self, logger, explanation_verbosity, report_id, incremental=False):
+        self.log = logger
+        self.report_id = report_id
+        self.results_passed = 0
+        self.results_count = 0
+        self.results_reused = 0
+
+    def __call__(self, devices, tests):
+        for device_id in devices:
+            self.results_passed += 1
+            self.results_count += 1
+            self.log.info(f"device {device_id}")
+            yield ComplianceTestResult(
+                test_id=10, device_id=device_id, passed=True, explanation=[], report_id=self.report_id
+            )
+
+
+@pytest.mark.django_db
+def test_applyworker_process_pool(full_runtests_params, apply_worker):
+    apply_worker.processes = 2
+    apply_worker.chunk_size = 2
+    apply_worker.process_pool_factory = ThreadPoolExecutor
+    apply_worker.test_executor_factory = FakeExecutor
+    apply_worker.device_test_gen = Mock(
+        side_effect=lambda selector_devices, *_: [(device_ids, ["test"]) for device_ids in selector_devices.values()]
+    )
+    result = apply_worker(params=full_runtests_params, worker_id=1)
+    assert result.test_stat == ResultRatio(passed=3, total=3)
+    assert [(msg.message, msg.script_id) for msg in result.log] == [
+        ("device 1", "Worker #1"),
+        ("device 2", "Worker #1"),
+        ("device 3", "Worker #1"),
+    ]
+    assert [call.args[0] for call in apply_worker.device_test_gen.call_args_list] == [{1: [1, 2]}, {1: [3]}]
+    saved_results = list(apply_worker.testresult_queryset.bulk_create.call_args.args[0])
+    assert [(r.device_id, r.test_id, r.report_id) for r in saved_results] == [
+        (1, 10, full_runtests_params.object_id),
+        (2, 10, full_runtests_params.object_id),
+        (3, 10, full_runtests_params.object_id),
+    ]
+
+
+class DictViewsExecutor(FakeExecutor):
+    def __call__(self, devices, tests):
+        for result in super().__call__(devices, tests):
+            result.explanation = [("interfaces.values()", {"eth0": 1500}.values()), ("keys", {"a": 1}.keys())]
+            yield result
+
+
+@pytest.mark.django_db
+def test_applyworker_real_process_pool(full_runtests_params, apply_worker):
+    apply_worker.processes = 2
+    apply_worker.chunk_size = 2
+    apply_worker.test_executor_factory = DictViewsExecutor
+    apply_worker.device_test_gen = lambda selector_devices, *_: [
+        (device_ids, ["test"]) for device_ids in selector_devices.values()
+    ]
+    result = apply_worker(params=full_runtests_params, worker_id=1)
+    assert not result.errored
+    assert result.test_stat == ResultRatio(passed=3, total=3)
+    saved_results = list(apply_worker.testresult_queryset.bulk_create.call_args.args[0])
+    assert [r.device_id for r in saved_results] == [1, 2, 3]
+    assert all(r.explanation == [["interfaces.values()", [1500]], ["keys", ["a"]]] for r in saved_results)
+
+
+@pytest.mark.django_db
+def test_applyworker_background_writer(full_runtests_params, apply_worker):
+    apply_worker.background_writer = True
+    apply_worker.result_batch_size = 2
+    executor = apply_worker.test_executor_factory.return_value
+    result = apply_worker(params=full_runtests_params, worker_id=1)
+    assert result == ExecutionResult(test_stat=ResultRatio(passed=5, total=10), log=["log1", "log2"])
+    batches = [call.args[0] for call in apply_worker.testresult_queryset.bulk_create.call_args_list]
+    assert [len(batch) for batch in batches] == [2, 2, 2]
+    assert sum(batches, []) == executor.return_value * 2
+
+    apply_worker.testresult_queryset.bulk_create.side_effect = ValueError("db error")
+    apply_worker.logger = MockLogger()
+    result = apply_worker(params=full_runtests_params, worker_id=1)
+    assert result.errored
+    assert result.log == ["db error"]
+
+
+def test_background_writer_with_processes():
+    with pytest.raises(ValidationError, match="background_result_writer"):
+        ValiditySettings(background_result_writer=True, apply_processes=2)
+    assert ValiditySettings(background_result_writer=True, apply_processes=1).background_result_writer
+
+
+@pytest.mark.django_db
+def test_applyworker_work_queue(full_runtests_params, apply_worker):
+    events = []
+    units = [{1: [1, 2]}, {1: [3], 2: [4]}]
+    acks = [Mock(side_effect=lambda i=i: events.append(("ack", i))) for i in range(len(units))]
+    apply_worker.job_extractor_factory.return_value.parent.job.result.use_work_queue = True
+    apply_worker.work_queue = Mock(**{"consume.return_value": iter(zip(units, acks))})
+    apply_worker.testresult_queryset.bulk_create.side_effect = lambda results, **_: events.append(
+        ("write", len(list(results)))
+    )
+    device_test_gen = apply_worker.device_test_gen
+    executor = apply_worker.test_executor_factory.return_value
+    apply_worker.background_writer = True  # unit results are always written within one transaction
+    apply_worker(params=full_runtests_params, worker_id=1)
+    apply_worker.work_queue.consume.assert_called_once_with(full_runtests_params.job_id, 1)
+    assert [call.args[0] for call in device_test_gen.call_args_list] == units
+    unit_results = len(executor.return_value) * len(device_test_gen.return_value)
+    assert events == [("write", unit_results), ("ack", 0), ("write", unit_results), ("ack", 1)]
+
+
+def test_applyworker_work_queue_write_error(full_runtests_params, apply_worker):
+    ack = Mock()
+    apply_worker.job_extractor_factory.return_value.parent.job.result.use_work_queue = True
+    apply_worker.work_queue = Mock(**{"consume.return_value": iter([({1: [1]}, ack)])})
+    apply_worker.testresult_queryset.bulk_create.side_effect = ValueError("db error")
+    apply_worker.logger = MockLogger()
+    result = apply_worker(params=full_runtests_params, worker_id=1)
+    assert result.errored
+    ack.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_device_major_iterator(create_custom_fields):
+    DataSourceFactory(custom_field_data={"default": True, "device_config_path": "configs/{{ device.name }}.yaml"})
+    devices = [DeviceFactory(name=name) for name in ["sw1-a", "sw1-b", "sw2-a"]]
+    selectors = [SelectorFactory(name_filter="sw([0-9]+)-.*", dynamic_pairs="NAME"), SelectorFactory(name_filter=".*")]
+    tests = [CompTestDBFactory() for _ in range(3)]
+    selectors[0].tests.set(tests[:2])
+    selectors[1].tests.set(tests[1:])
+    selector_devices = {selectors[0].pk: [d.pk for d in devices], selectors[1].pk: [d.pk for d in devices[1:]]}
+
+    def iter_values(iterator_cls):
+        return {
+            (device.pk, getattr(device.dynamic_pair, "pk", None), test.pk)
+            for device_list, test_qs in iterator_cls(copy.deepcopy(selector_devices), [], None)
+            for device in device_list
+            for test in test_qs
+        }
+
+    assert iter_values(DeviceMajorTestIterator) == iter_values(DeviceTestIterator)
+    states = {}
+    for device_list, _ in DeviceMajorTestIterator(copy.deepcopy(selector_devices), [], None):
+        for device in device_list:
+            assert states.setdefault(device.pk, device.state) is device.state
+    assert states.keys() == {d.pk for d in devices}
+
+
+@pytest.mark.django_db
+def test_split_into_chunks(apply_worker):
+    apply_worker.chunk_size = 2
+    selector_devices = {1: [1, 2, 3], 2: [2, 3]}
+    assert list(apply_worker.split_into_chunks(selector_devices)) == [{1: [1, 2]}, {1: [3]}, {2: [2, 3]}]
+    apply_worker.device_major = True
+    assert list(apply_worker.split_into_chunks(selector_devices)) == [{1: [1, 2], 2: [2]}, {1: [3], 2: [3]}]
@@ -29,6 +29,7 @@ def job_extractor(messages):
     extractor = Mock()
     extractor.parents = [Mock(), Mock()]
     extractor.parent.parent.job.result.log = messages[:1]
+    extractor.parent.parent.job.result.use_work_queue = False
     extractor.parents[0].job.result = ExecutionResult(test_stat=ResultRatio(2, 2), log=messages[1:3])
     extractor.parents[1].job.result = ExecutionResult(test_stat=ResultRatio(1, 5), log=messages[3:])
     return extractor
@@ -67,6 +68,19 @@ def test_call_abort(worker, full_runtests_params, job_extractor, monkeypatch):
     assert job.error == "AbortScript('ApplyWorkerError')"
 
 
+@pytest.mark.django_db
+def test_call_work_pending(worker, full_runtests_params, job_extractor):
+    job_extractor.parent.parent.job.result.use_work_queue = True
+    worker.job_extractor_factory = lambda: job_extractor
+    worker.work_queue = Mock(**{"pending.return_value": 2})
+    worker(full_runtests_params)
+    job = full_runtests_params.get_job()
+    assert job.status == "errored"
+    assert job.error == "AbortScript('2 work unit(s) have not been processed, test results are incomplete')"
+    worker.work_queue.pending.assert_called_once_with(full_runtests_params.job_id, full_runtests_params.workers_num)
+    worker.work_queue.clear.assert_called_once_with(full_runtests_params.job_id, full_runtests_params.workers_num)
+
+
 @pytest.mark.django_db(transaction=True, reset_sequences=True)
 def test_successful_call(worker, full_runtests_params, job_extractor, monkeypatch, messages):
     monkeypatch.setattr(timezone, "now", lambda: datetime.datetime(2020, 1, 1))
@@ -0,0 +1,100 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from factories import CompTestDBFactory, DeviceFactory, ReportFactory
+
+from validity.models import ComplianceTestResult
+from validity.scripts.runtests.result_writer import BackgroundWriter, CopyResultWriter
+
+
+def make_results(report, tests, devices, count):
+    explanation = [("some.path", {"key": ["value", 1, None]}), ("other", "value")]
+    return [
+        ComplianceTestResult(
+            test=tests[i % len(tests)],
+            device=devices[i % len(devices)],
+            dynamic_pair=devices[(i + 1) % len(devices)] if i % 2 else None,
+            passed=bool(i % 3),
+            explanation=explanation,
+            report=report,
+            fingerprint=str(i),
+        )
+        for i in range(count)
+    ]
+
+
+def stored_rows(report):
+    return list(
+        ComplianceTestResult.objects.filter(report=report)
+        .order_by("fingerprint")
+        .values_list("test", "device", "dynamic_pair", "passed", "explanation", "fingerprint", "custom_field_data")
+    )
+
+
+@pytest.mark.django_db
+def test_copy_writer():
+    tests = CompTestDBFactory.create_batch(2)
+    devices = DeviceFactory.create_batch(3)
+    writer = CopyResultWriter(ComplianceTestResult, batch_size=4)
+    assert writer.supported
+    copy_report, orm_report = ReportFactory(), ReportFactory()
+    assert writer(make_results(copy_report, tests, devices, 10)) == 10
+    ComplianceTestResult.objects.bulk_create(make_results(orm_report, tests, devices, 10))
+    assert stored_rows(copy_report) == stored_rows(orm_report)
+    assert not ComplianceTestResult.objects.filter(report=copy_report, created__isnull=True).exists()
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_copy_writer_benchmark():
+    """
+    Time of writing the same amount of Test Results via COPY and via bulk_create
+    """
+    tests = CompTestDBFactory.create_batch(5)
+    devices = DeviceFactory.create_batch(20)
+    count = 5000
+    copy_report, orm_report = ReportFactory(), ReportFactory()
+
+    results = make_results(orm_report, tests, devices, count)
+    start = time.perf_counter()
+    ComplianceTestResult.objects.bulk_create(results, batch_size=500)
+    bulk_create_time = time.perf_counter() - start
+
+    results = make_results(copy_report, tests, devices, count)
+    start = time.perf_counter()
+    written = CopyResultWriter(ComplianceTestResult, batch_size=500)(results)
+    copy_time = time.perf_counter() - start
+
+    assert written == ComplianceTestResult.objects.filter(report=copy_report).count() == count
+    assert stored_rows(copy_report) == stored_rows(orm_report)
+    assert copy_time < bulk_create_time
+
+
+def test_background_writer():
+    written = []
+    writer_threads = set()
+
+    def write(batch):
+        writer_threads.add(threading.current_thread())
+        written.append(batch)
+
+    BackgroundWriter(write, batch_size=3)(iter(range(8)))
+    assert written == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    assert threading.current_thread() not in writer_threads
+
+
+def test_background_writer_error():
+    write = Mock(side_effect=ValueError("db error"))
+    produced = []
+
+    def objs():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    with pytest.raises(ValueError, match="db error"):
+        BackgroundWriter(write, batch_size=1, max_pending_batches=1)(objs())
+    write.assert_called_once_with([0])
+    assert len(produced) < 100
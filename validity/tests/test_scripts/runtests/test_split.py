@@ -21,6 +21,7 @@ from validity.integrations.errors import IntegrationError
 from validity.models import VDataSource
 from validity.scripts.data_models import Message, SplitResult
 from validity.scripts.runtests.split import SplitWorker
+from validity.settings import WorkStealingSettings
 from validity.utils.logger import Logger
 
 
@@ -175,3 +176,20 @@ def test_call(selectors, devices, runtests_params, monkeypatch):
     assert worker.datasource_sync_fn.call_count == 0
     job.refresh_from_db()
     assert job.status == "running"
+
+
+@pytest.mark.parametrize("device_num", [5])
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+def test_work_queue(selectors, devices, runtests_params):
+    job = RunTestsJobFactory()
+    runtests_params = runtests_params.with_job_info(job)
+    runtests_params.workers_num = 2
+    runtests_params.selectors = [s.pk for s in selectors]
+    work_queue = Mock(**{"push.side_effect": lambda job_id, units: len(list(units))})
+    worker = SplitWorker(work_stealing=WorkStealingSettings(enabled=True, unit_size=2), work_queue=work_queue)
+    result = worker(runtests_params)
+    assert result.use_work_queue is True
+    assert result.slices == []
+    work_queue.push.assert_called_once()
+    assert work_queue.push.call_args.args[0] == job.pk
+    assert result.log[-1].message == "3 work unit(s) of up to 2 devices have been queued"
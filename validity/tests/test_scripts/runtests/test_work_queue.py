@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+from django.conf import settings
+
+from validity.scripts.launch import LauncherFactory
+from validity.scripts.runtests.work_queue import WorkQueue
+
+
+@pytest.fixture
+def work_queue():
+    queue = WorkQueue(LauncherFactory(settings.RQ_PARAMS).get_connection(), key_prefix=f"validity-test:{uuid.uuid4()}")
+    yield queue
+    queue.clear(job_id=1, workers_num=2)
+
+
+def consume_all(work_queue: WorkQueue, worker_id: int) -> list[dict[int, list[int]]]:
+    units = []
+    for unit, ack in work_queue.consume(1, worker_id):
+        units.append(unit)
+        ack()
+    return units
+
+
+def test_consume(work_queue):
+    assert work_queue.push(1, [{1: [1, 2]}, {1: [3]}, {2: [4]}]) == 3
+    worker0 = work_queue.consume(1, worker_id=0)
+    unit, _ = next(worker0)
+    assert unit == {1: [1, 2]}
+    assert work_queue.pending(1, workers_num=2) == 3
+
+    # worker 0 crashes before saving the results, its unit is re-queued after restart
+    restarted_worker0 = work_queue.consume(1, worker_id=0)
+    unit, ack = next(restarted_worker0)
+    assert unit == {1: [1, 2]}
+    ack()
+    unit, ack = next(restarted_worker0)
+    assert unit == {1: [3]}
+    assert work_queue.pending(1, workers_num=2) == 2
+
+    # the unit which is not acknowledged is not lost when the next one is taken
+    assert consume_all(work_queue, worker_id=1) == [{2: [4]}]
+    assert list(restarted_worker0) == []
+    assert work_queue.pending(1, workers_num=2) == 1
+    ack()
+    assert work_queue.pending(1, workers_num=2) == 0
+
+
+def test_pending_after_crash(work_queue):
+    work_queue.push(1, [{1: [1]}])
+    next(work_queue.consume(1, worker_id=1))
+    assert work_queue.pending(1, workers_num=2) == 1
+    work_queue.clear(1, workers_num=2)
+    assert work_queue.pending(1, workers_num=2) == 0
@@ -1,6 +1,6 @@
 import pytest
 
-from validity.utils.json import jq, transform_json
+from validity.utils.json import JqProgramCache, jq, transform_json
 
 
 class TestTransformJson:
@@ -46,3 +46,32 @@ class TestTransformJson:
 )
 def test_jq(data, expression, result):
     assert jq.first(expression, data) == result
+
+
+class TestJqProgramCache:
+    def test_lru(self):
+        cache = JqProgramCache(compile_fn=lambda expr: expr.upper(), max_programs=2)
+        assert cache.get("a") == "A"
+        cache.get("b")
+        assert cache.get("a") == "A"
+        cache.get("c")  # "b" is the least recently used one
+        assert list(cache._programs) == ["a", "c"]
+        assert cache.stats == {"hits": 1, "misses": 3, "evictions": 1, "programs": 2, "total_length": 2}
+
+    def test_total_length(self):
+        cache = JqProgramCache(compile_fn=str, max_total_length=10)
+        cache.get("x" * 6)
+        cache.get("y" * 6)
+        assert list(cache._programs) == ["y" * 6]
+        cache.get("z" * 11)  # too long to be cached
+        assert list(cache._programs) == ["y" * 6]
+        assert cache.stats["total_length"] == 6
+
+    def test_jq_uses_cache(self, monkeypatch):
+        monkeypatch.setattr(jq, "program_cache", JqProgramCache(jq.compile))
+        for i in range(3):
+            assert jq.first(".a", {"a": i}) == i
+            assert jq.all(".[]", [i, i]) == [i, i]
+        assert (jq.program_cache.hits, jq.program_cache.misses) == (4, 2)
+        with pytest.raises(ValueError):
+            jq.first(".a | ", {})
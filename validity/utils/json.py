@@ -1,5 +1,7 @@
 import copy
-from typing import Callable, Collection, Protocol
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Collection, Protocol
 
 import jq as pyjq
 
@@ -46,6 +48,66 @@ def transform_json(data: Json, match_fn: Callable[[int | str, Json], bool], tran
     return data_copy
 
 
+class JqProgramCache:
+    """
+    LRU cache of compiled jq programs keyed by expression.
+    Size is bounded by the number of programs and by the total length of their expressions
+    (compiled program size is proportional to the expression length)
+    """
+
+    def __init__(self, compile_fn: Callable[[str], Any], max_programs: int = 1024, max_total_length: int = 1024**2):
+        self.compile_fn = compile_fn
+        self.max_programs = max_programs
+        self.max_total_length = max_total_length
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._programs: OrderedDict[str, Any] = OrderedDict()
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "programs": len(self._programs),
+            "total_length": self._total_length,
+        }
+
+    def get(self, expression: str) -> Any:
+        with self._lock:
+            if (program := self._programs.get(expression)) is not None:
+                self._programs.move_to_end(expression)
+                self.hits += 1
+                return program
+            self.misses += 1
+        program = self.compile_fn(expression)
+        if len(expression) <= self.max_total_length:
+            with self._lock:
+                self._put(expression, program)
+        return program
+
+    def _put(self, expression: str, program: Any) -> None:
+        if expression in self._programs:  # compiled by another thread in the meantime
+            return
+        self._programs[expression] = program
+        self._total_length += len(expression)
+        while len(self._programs) > self.max_programs or self._total_length > self.max_total_length:
+            evicted_expression, _ = self._programs.popitem(last=False)
+            self._total_length -= len(evicted_expression)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._programs.clear()
+            self._total_length = 0
+
+
 class jq:
     _extra_functions = [
         # ensures that expression at "pth" is an array
@@ -56,6 +118,8 @@ class jq:
         'def mknum: walk(if type == "string" and test("[+-]?([0-9]*[.])?[0-9]+") then . | tonumber else . end)',
     ]
 
+    program_cache = JqProgramCache(lambda expression: jq.compile(expression))
+
     @classmethod
     def _add_extra_functions(cls, expression):
         extra_funcs = ";".join(cls._extra_functions)
@@ -63,11 +127,11 @@ class jq:
 
     @classmethod
     def first(cls, expression, data):
-        return pyjq.first(cls._add_extra_functions(expression), data)
+        return cls.program_cache.get(expression).input_value(data).first()
 
     @classmethod
     def all(cls, expression, data):
-        return pyjq.all(cls._add_extra_functions(expression), data)
+        return cls.program_cache.get(expression).input_value(data).all()
 
     @classmethod
     def compile(cls, expression):